@@ -1,9 +1,63 @@
+import time
+
+_APP_IMPORT_START = time.perf_counter()
+
+import functools
+import json
 import math
-import pandas as pd
+import multiprocessing
+import os
+import statistics
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
 import streamlit as st
 import numpy as np
-import matplotlib.pyplot as plt
-from mpl_toolkits.mplot3d import Axes3D
+import streamlit.components.v1 as components
+
+from tot_calculator import perf
+from tot_calculator.crossover import (
+    adaptive_samples,
+    break_even,
+    efficiency_asymptote,
+    efficiency_extrema,
+    weapon_terms,
+)
+from tot_calculator.damage import compute_z, damage_batch, efficiency_percent, weak_multiplier
+from tot_calculator.imports import import_report, lazy_import, record_import
+from tot_calculator.memo import MEMO_TOP_K, SearchMemo
+from tot_calculator.montecarlo import DEFAULT_SEED, MAX_FIGHTS, hit_profile, simulate_fights
+from tot_calculator.optimize import (
+    STAT_LABELS,
+    STATS,
+    apply_allocation,
+    base_from_common,
+    equivalence_table,
+    optimize_allocation,
+)
+from tot_calculator.parallel import merge_top
+from tot_calculator.planner import make_deadline, plan_search, run_search
+from tot_calculator.rotation import BUFF_KINDS, MAX_TURNS, Buff, Skill, Timeline, rotation_damage, weapon_loadouts
+from tot_calculator.results import (
+    EXPORT_MAX_ROWS,
+    INTERVAL_COLUMNS,
+    POINT_COLUMNS,
+    SERIES_COLUMNS,
+    TRAJECTORY_COLUMNS,
+    ResultColumns,
+    search_top_columns,
+)
+from tot_calculator.score import N_MAX, N_MIN, SearchCancelled, search_best_intervals, search_series, series_trajectory
+from tot_calculator.score_index import INDEX_K_MAX, ScoreIndexCache
+from tot_calculator.weapons import (
+    DOLL_POSITIONS,
+    WEAPON_OPTIONS,
+    comparison_matrix,
+    final_atk,
+    rank_weapons,
+)
+
+# pandas / matplotlib(tot_calculator.plots) / tot_calculator.bulk 은 처음 쓰는 곳에서 lazy_import 로 불러옴
+record_import("app.py 시작 import", time.perf_counter() - _APP_IMPORT_START)
 
 # ---------------------
 # 페이지 기본 설정 (한 번만)
@@ -140,63 +194,183 @@ st.markdown(
 
 
 # =========================================================
-# 계산기 1 : 무기 효율 계산기
+# 렌더링된 그래프 캐시
 # =========================================================
-def calculator_one():
-    # 최종 데미지 계산 함수
-    def compute_z(buff_x, buff_y, atk, E_def, def_coef, Weak_coef, sk_coef):
-        numer = atk ** 2
-        denomi = atk + E_def * (1 - def_coef * 0.01)
-        return (
-            (numer / denomi)
-            * (1 + buff_x * 0.01)
-            * (1 + Weak_coef * 0.1)
-            * (sk_coef * 0.01)
-            * (buff_y * 0.01)
+# 같은 입력으로 다시 그리면 래스터화를 건너뛰고 PNG 바이트를 그대로 재사용.
+# 항목 수 상한이 있어 메모리는 (그래프 하나 수백 KB) × PLOT_CACHE_ENTRIES 이내로 유지됨.
+PLOT_CACHE_ENTRIES = int(os.environ.get("TOT_PLOT_CACHE_ENTRIES", "64"))
+
+
+@st.cache_data(max_entries=PLOT_CACHE_ENTRIES, show_spinner=False)
+def efficiency_plot_png(
+    atk_range, damage_curve_A, damage_curve_B, efficiency_curve, final_atk_A, final_atk_B, crossovers=()
+) -> bytes:
+    plots = lazy_import("tot_calculator.plots")
+    with perf.phase("figure"):
+        fig = plots.efficiency_figure(
+            atk_range, damage_curve_A, damage_curve_B, efficiency_curve, final_atk_A, final_atk_B, crossovers
         )
+    with perf.phase("serialize"):
+        return plots.figure_to_png(fig)
 
-    st.markdown("<div class='calculator-card'>", unsafe_allow_html=True)
 
-    st.markdown("### 🔧 무기 효율 계산기")
-    st.caption("무기 A / B 옵션에 따른 최종 데미지와 효율 비교")
+@st.cache_data(max_entries=PLOT_CACHE_ENTRIES, show_spinner=False)
+def damage_distribution_png(bin_edges, counts, summaries) -> bytes:
+    plots = lazy_import("tot_calculator.plots")
+    with perf.phase("figure"):
+        fig = plots.damage_distribution_figure(bin_edges, counts, summaries)
+    with perf.phase("serialize"):
+        return plots.figure_to_png(fig)
 
-    # 사이드바 공통 변수
+
+@st.cache_data(max_entries=PLOT_CACHE_ENTRIES, show_spinner=False)
+def rotation_plot_png(per_turn, labels) -> bytes:
+    plots = lazy_import("tot_calculator.plots")
+    with perf.phase("figure"):
+        fig = plots.rotation_figure(per_turn, labels)
+    with perf.phase("serialize"):
+        return plots.figure_to_png(fig)
+
+
+@st.cache_data(max_entries=PLOT_CACHE_ENTRIES, show_spinner=False)
+def weapon_heatmap_png(values, weapon_names, E_def_values, title) -> bytes:
+    plots = lazy_import("tot_calculator.plots")
+    with perf.phase("figure"):
+        fig = plots.weapon_heatmap_figure(values, weapon_names, E_def_values, title)
+    with perf.phase("serialize"):
+        return plots.figure_to_png(fig)
+
+
+@st.cache_data(max_entries=PLOT_CACHE_ENTRIES, show_spinner=False)
+def surface_plot_png(X, Y, Z, x, y, z_val, atk, defense, w) -> bytes:
+    plots = lazy_import("tot_calculator.plots")
+    with perf.phase("figure"):
+        fig = plots.surface_figure(X, Y, Z, x, y, z_val, atk, defense, w)
+    with perf.phase("serialize"):
+        return plots.figure_to_png(fig)
+
+
+@st.cache_data(max_entries=PLOT_CACHE_ENTRIES, show_spinner=False)
+def surface_preview_png(X, Y, Z, x, y, z_val, atk, defense, w) -> bytes:
+    plots = lazy_import("tot_calculator.plots")
+    with perf.phase("figure"):
+        fig = plots.surface_preview_figure(X, Y, Z, x, y, z_val, atk, defense, w)
+    with perf.phase("serialize"):
+        return plots.figure_to_png(fig, dpi=SURFACE_PREVIEW_DPI)
+
+
+# =========================================================
+# 성능 계측
+# =========================================================
+# 세션별로 남겨둘 최근 재실행 기록 수 (사이드바 성능 계측 패널 / JSON Lines 내려받기)
+PERF_HISTORY = 50
+
+CALCULATOR_LABELS = {
+    "calc1": "무기 효율 계산기",
+    "calc2": "3D 데미지 그래프",
+    "calc3": "특수 점수 계산기",
+}
+
+
+def traced(calculator: str):
+    """
+    계산기 실행 한 번을 perf trace 로 계측하는 데코레이터. (st.fragment 아래에 붙임)
+    기록은 세션의 perf_traces 에 최근 PERF_HISTORY 개까지 남김.
+    """
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            trace = None
+            try:
+                with perf.profile_once(), perf.trace_rerun(calculator) as trace:
+                    return func(*args, **kwargs)
+            finally:
+                if trace is not None:
+                    history = st.session_state.setdefault("perf_traces", [])
+                    history.append(trace.to_record())
+                    del history[:-PERF_HISTORY]
+        return wrapper
+    return decorate
+
+
+# =========================================================
+# 계산기 1 : 무기 효율 계산기
+# =========================================================
+def common_inputs() -> dict:
+    """
+    사이드바 공통 변수. 프래그먼트는 사이드바에 위젯을 그릴 수 없어서
+    메인 스크립트에서 읽고 calculator_one 에 넘겨줌.
+    """
     st.sidebar.markdown(
         "<p style='text-align: center; font-size: 12px; color: gray;'>Made by Caleo01</p>",
         unsafe_allow_html=True
     )
     st.sidebar.markdown("---")
     st.sidebar.header("공통 변수 설정")
-    E_def = st.sidebar.number_input("적 방어력", min_value=0.0, value=5000.0, max_value=20000.0, step=100.0, format="%.0f")
-    atk_origin = st.sidebar.number_input("기초 공격력 (공% 제외 약 1600)", min_value=500.0, max_value=3000.0, value=1661.0, step=1.0, format="%.0f")
-    atk_bonus = st.sidebar.number_input("기초 공격 보너스(%) (수정 X)", min_value=0.0, max_value=200.0, value=65.6, step=10.0, format="%.1f")
-    def_coef = st.sidebar.number_input("방어 무시(%)", min_value=0.0, max_value=100.0, value=30.0, step=10.0, format="%.0f")
-    Weak_coef = st.sidebar.number_input("약점 (개)", min_value=0.0, max_value=2.0, value=0.0, step=1.0, format="%.0f")
-    sk_coef = st.sidebar.number_input("스킬 계수(%)", min_value=0.0, max_value=1500.0, value=100.0, step=10.0, format="%.0f")
+    common = {
+        "E_def": st.sidebar.number_input("적 방어력", min_value=0.0, value=5000.0, max_value=20000.0, step=100.0, format="%.0f"),
+        "atk_origin": st.sidebar.number_input("기초 공격력 (공% 제외 약 1600)", min_value=500.0, max_value=3000.0, value=1661.0, step=1.0, format="%.0f"),
+        "atk_bonus": st.sidebar.number_input("기초 공격 보너스(%) (수정 X)", min_value=0.0, max_value=200.0, value=65.6, step=10.0, format="%.1f"),
+        "def_coef": st.sidebar.number_input("방어 무시(%)", min_value=0.0, max_value=100.0, value=30.0, step=10.0, format="%.0f"),
+        "Weak_coef": st.sidebar.number_input("약점 (개)", min_value=0.0, max_value=2.0, value=0.0, step=1.0, format="%.0f"),
+        "sk_coef": st.sidebar.number_input("스킬 계수(%)", min_value=0.0, max_value=1500.0, value=100.0, step=10.0, format="%.0f"),
+    }
     st.sidebar.markdown("---")
-    buff_x = st.sidebar.number_input("피해 증가(%)", min_value=0.0, max_value=800.0, value=0.0, step=10.0, format="%.0f")
-    buff_y = st.sidebar.number_input("치명 피해(%)", min_value=0.0, max_value=500.0, value=120.0, step=10.0, format="%.0f")
+    common["buff_x"] = st.sidebar.number_input("피해 증가(%)", min_value=0.0, max_value=800.0, value=0.0, step=10.0, format="%.0f")
+    common["buff_y"] = st.sidebar.number_input("치명 피해(%)", min_value=0.0, max_value=500.0, value=120.0, step=10.0, format="%.0f")
+    return common
+
+
+@st.fragment
+@traced("calc1")
+def calculator_one(common: dict):
+    st.markdown("<div class='calculator-card'>", unsafe_allow_html=True)
+
+    st.markdown("### 🔧 무기 효율 계산기")
+    st.caption("무기 옵션에 따른 최종 데미지와 효율 비교")
+
+    mode = st.radio(
+        "계산 모드",
+        options=["무기 A/B 비교", "다중 무기 비교", "스킬 로테이션", "스탯 배분 최적화", "파일 일괄 평가"],
+        horizontal=True,
+        key="calc1_mode",
+    )
+    st.markdown("---")
+
+    if mode == "다중 무기 비교":
+        weapon_matrix_view(common)
+    elif mode == "스킬 로테이션":
+        rotation_view(common)
+    elif mode == "스탯 배분 최적화":
+        stat_optimizer_view(common)
+    elif mode == "파일 일괄 평가":
+        bulk_view(common)
+    else:
+        weapon_ab_view(common)
+
+    st.markdown("</div>", unsafe_allow_html=True)
+
+
+def weapon_ab_view(common: dict):
+    # 사이드바 공통 변수
+    E_def = common["E_def"]
+    atk_origin = common["atk_origin"]
+    atk_bonus = common["atk_bonus"]
+    def_coef = common["def_coef"]
+    Weak_coef = common["Weak_coef"]
+    sk_coef = common["sk_coef"]
+    buff_x = common["buff_x"]
+    buff_y = common["buff_y"]
 
     # 인형 포지션
     st.subheader("인형 포지션")
     choice_doll = st.radio(
         "무기 옵션",
-        options=["센티널", "뱅가드", "서포트", "불워크"],
+        options=list(DOLL_POSITIONS),
         horizontal=True,
         key="Doll_option"
     )
-    if choice_doll == "센티널":
-        atk_per = 22.0
-        ct_per = 0.0
-    elif choice_doll == "뱅가드":
-        atk_per = 17.0
-        ct_per = 10.0
-    elif choice_doll == "서포트":
-        atk_per = 17.0
-        ct_per = 0.0
-    else:  # 불워크
-        atk_per = 0.0
-        ct_per = 0.0
+    atk_per, ct_per = DOLL_POSITIONS[choice_doll]
     st.markdown("---")
 
     # 무기 A
@@ -208,18 +382,13 @@ def calculator_one():
         wep_atk_A_input = st.number_input("직접 입력 (적용 값)", min_value=200.0, max_value=390.0, value=wep_atk_A_slider, step=1.0, format="%.0f", key="wep_atk_A_w")
     wep_atk_A = wep_atk_A_input
 
-    wepA_ak = 0.0
-    wepA_ct = 0.0
     choice_A = st.radio(
         "무기 옵션",
-        options=["공격 보너스 15%", "치명타 피해 25%"],
+        options=list(WEAPON_OPTIONS),
         horizontal=True,
         key="weaponA_option"
     )
-    if choice_A == "공격 보너스 15%":
-        wepA_ak = 15.0
-    else:
-        wepA_ct = 25.0
+    wepA_ak, wepA_ct = WEAPON_OPTIONS[choice_A]
 
     def_A = st.number_input("방어 무시(%)", min_value=0.0, max_value=20.0, value=0.0, step=10.0, format="%.0f", key="def_ignore_A")
     total_def_A = min(def_A + def_coef, 100.0)
@@ -231,7 +400,7 @@ def calculator_one():
         dmg_A_input = st.number_input("직접 입력 (적용 값)", min_value=0.0, max_value=100.0, value=dmg_A_slider, step=1.0, format="%.0f", key="dmg_buff_A_w")
     dmg_A = dmg_A_input
 
-    st.write(f"관리실 공격력: {(atk_origin+wep_atk_A)*(1+(atk_bonus+atk_per+wepA_ak)*0.01):.0f}")
+    st.write(f"관리실 공격력: {final_atk(atk_origin, wep_atk_A, atk_bonus, atk_per, wepA_ak):.0f}")
     st.markdown("---")
 
     # 무기 B
@@ -243,18 +412,13 @@ def calculator_one():
         wep_atk_B_input = st.number_input("직접 입력 (적용 값)", min_value=200.0, max_value=390.0, value=wep_atk_B_slider, step=1.0, format="%.0f", key="wep_atk_B_w")
     wep_atk_B = wep_atk_B_input
 
-    wepB_ak = 0.0
-    wepB_ct = 0.0
     choice_B = st.radio(
         "무기 옵션",
-        options=["공격 보너스 15%", "치명타 피해 25%"],
+        options=list(WEAPON_OPTIONS),
         horizontal=True,
         key="weaponB_option"
     )
-    if choice_B == "공격 보너스 15%":
-        wepB_ak = 15.0
-    else:
-        wepB_ct = 25.0
+    wepB_ak, wepB_ct = WEAPON_OPTIONS[choice_B]
 
     def_B = st.number_input("방어 무시(%)", min_value=0.0, max_value=20.0, value=0.0, step=10.0, format="%.0f", key="def_ignore_B")
     total_def_B = min(def_B + def_coef, 100.0)
@@ -266,16 +430,17 @@ def calculator_one():
         dmg_B_input = st.number_input("직접 입력 (적용 값)", min_value=0.0, max_value=100.0, value=dmg_B_slider, step=1.0, format="%.0f", key="dmg_buff_B_w")
     dmg_B = dmg_B_input
 
-    st.write(f"관리실 공격력: {(atk_origin+wep_atk_B)*(1+(atk_bonus+atk_per+wepB_ak)*0.01):.0f}")
+    st.write(f"관리실 공격력: {final_atk(atk_origin, wep_atk_B, atk_bonus, atk_per, wepB_ak):.0f}")
     st.markdown("---")
+    perf.lap("widgets")
 
     # 결과 계산
     final_dmg_A = buff_x + dmg_A
     final_dmg_B = buff_x + dmg_B
     final_ct_A = buff_y + wepA_ct + ct_per
     final_ct_B = buff_y + wepB_ct + ct_per
-    final_atk_A = (atk_origin+wep_atk_A)*(1+(atk_bonus+atk_per+wepA_ak)*0.01)
-    final_atk_B = (atk_origin+wep_atk_B)*(1+(atk_bonus+atk_per+wepB_ak)*0.01)
+    final_atk_A = final_atk(atk_origin, wep_atk_A, atk_bonus, atk_per, wepA_ak)
+    final_atk_B = final_atk(atk_origin, wep_atk_B, atk_bonus, atk_per, wepB_ak)
     damage_A = compute_z(final_dmg_A, final_ct_A, final_atk_A, E_def, total_def_A, Weak_coef, sk_coef)
     damage_B = compute_z(final_dmg_B, final_ct_B, final_atk_B, E_def, total_def_B, Weak_coef, sk_coef)
 
@@ -289,54 +454,620 @@ def calculator_one():
     else:
         st.info("무기 A와 B의 최종 데미지가 동일합니다.")
 
+    weak = weak_multiplier(Weak_coef)
+    terms_A = weapon_terms(final_atk_A, def_A, final_dmg_A, final_ct_A, sk_coef, weak)
+    terms_B = weapon_terms(final_atk_B, def_B, final_dmg_B, final_ct_B, sk_coef, weak)
+    atk_crossings = break_even_view(terms_A, terms_B, E_def, def_coef)
+
     st.write("피증 변화만을 고려한 데미지 변화 (세로선 - 무기 포함 최종 데미지)")
     st.markdown(f"""
     **참고:**  
     - 파란 점선 = 무기 A 현재 공격력 ({final_atk_A:.0f})  
     - 빨간 점선 = 무기 B 현재 공격력 ({final_atk_B:.0f})  
+    - 초록 일점쇄선 = 손익분기 공격력  
     """)
 
-    atk_range = np.linspace(0, 8000, 200)
-    damage_curve_A = [
-        compute_z(final_dmg_A, final_ct_A, atk, E_def, total_def_A, Weak_coef, sk_coef)
-        for atk in atk_range
-    ]
-    damage_curve_B = [
-        compute_z(final_dmg_B, final_ct_B, atk, E_def, total_def_B, Weak_coef, sk_coef)
-        for atk in atk_range
-    ]
-    efficiency_curve = [(b/a - 1) * 100 if a != 0 else 0 for a, b in zip(damage_curve_A, damage_curve_B)]
-
-    fig, ax1 = plt.subplots(figsize=(9, 6))
-    ax1.plot(atk_range, damage_curve_A, label="Weapon A", color="blue")
-    ax1.plot(atk_range, damage_curve_B, label="Weapon B", color="red")
-    ax1.axvline(final_atk_A, color="blue", linestyle=":")
-    ax1.axvline(final_atk_B, color="red", linestyle=":")
-    ax1.set_xlabel("ATK")
-    ax1.set_ylabel("Final Damage")
-    ax1.legend(loc="upper left")
-    ax1.grid(True)
-
-    ax2 = ax1.twinx()
-    ax2.plot(atk_range, efficiency_curve, label="Efficiency (B vs A, %)", color="green", linestyle="--")
-    ax2.set_ylabel("Efficiency (%)")
-    ax2.axhline(0, color="black", linestyle=":")
-    ax2.legend(loc="upper right")
-
-    st.pyplot(fig)
+    sampling = st.radio(
+        "그래프 샘플링",
+        options=["균등 (200점)", "적응형 (교차점 주변 집중)"],
+        horizontal=True,
+        key="efficiency_sampling",
+    )
+    if sampling == "균등 (200점)":
+        atk_range = np.linspace(0, 8000, 200)
+    else:
+        atk_range = adaptive_samples(0, 8000, [*atk_crossings, final_atk_A, final_atk_B], n=200)
+    damage_curve_A = damage_batch(atk_range, E_def, total_def_A, final_dmg_A, final_ct_A, sk_coef, weak)
+    damage_curve_B = damage_batch(atk_range, E_def, total_def_B, final_dmg_B, final_ct_B, sk_coef, weak)
+    efficiency_curve = efficiency_percent(damage_curve_A, damage_curve_B)
+    perf.lap("compute")
+
+    with perf.phase("serialize"):
+        st.image(
+            efficiency_plot_png(
+                atk_range, damage_curve_A, damage_curve_B, efficiency_curve, final_atk_A, final_atk_B,
+                crossovers=tuple(atk_crossings),
+            ),
+            width="stretch",
+        )
+
+    crit_simulation_view({
+        "A": hit_profile(final_atk_A, E_def, total_def_A, final_dmg_A, final_ct_A, sk_coef, weak),
+        "B": hit_profile(final_atk_B, E_def, total_def_B, final_dmg_B, final_ct_B, sk_coef, weak),
+    })
 
-    st.markdown("</div>", unsafe_allow_html=True)
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def simulate_fights_cached(profiles, fights, hits, crit_rate, weak_rate, seed):
+    return simulate_fights(profiles, fights, hits, crit_rate, weak_rate, seed=seed)
+
+
+def crit_simulation_view(profiles: dict):
+    """
+    무기 A / B 의 전투 한 번 총 데미지 분포. 켰을 때만 계산하며, 두 무기는 같은 타격 결과(난수)를 공유함.
+    """
+    st.markdown("---")
+    st.subheader("전투 데미지 분포 (몬테카를로)")
+    enabled = st.toggle(
+        "시뮬레이션 켜기",
+        key="mc_enabled",
+        help="위 데미지는 모든 타격이 치명타이고 약점에 맞는다고 가정한 값입니다. "
+             "치명타 확률과 약점 적중률을 주면 전투 한 번의 총 데미지 분포를 구합니다.",
+    )
+    if not enabled:
+        return
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        crit_rate = st.number_input("치명타 확률(%)", min_value=0.0, max_value=100.0, value=50.0, step=5.0, format="%.1f", key="mc_crit_rate")
+        weak_rate = st.number_input("약점 적중률(%)", min_value=0.0, max_value=100.0, value=100.0, step=10.0, format="%.1f", key="mc_weak_rate")
+    with col2:
+        hits = st.number_input("전투당 타격 수", min_value=1, max_value=1_000_000, value=100, step=10, key="mc_hits")
+        fights = st.number_input("전투 횟수", min_value=100, max_value=MAX_FIGHTS, value=100_000, step=10_000, key="mc_fights")
+    with col3:
+        seed = st.number_input("시드", min_value=0, max_value=2**32 - 1, value=DEFAULT_SEED, step=1, key="mc_seed")
+    if profiles["A"].weak_mult == 1.0:
+        st.caption("사이드바 약점 개수가 0이라 약점 적중률은 결과에 영향이 없습니다.")
+    perf.lap("widgets")
+
+    try:
+        result = simulate_fights_cached(profiles, int(fights), int(hits), crit_rate, weak_rate, int(seed))
+    except ValueError as e:
+        st.info(f"시뮬레이션할 수 없습니다: {e}")
+        return
+    perf.lap("compute")
+    perf.count("montecarlo.hits", result.fights * result.hits)
+
+    pd = lazy_import("pandas")
+    with perf.phase("table"):
+        st.dataframe(
+            pd.DataFrame(
+                {
+                    "무기": list(result.summaries),
+                    "평균": [s.mean for s in result.summaries.values()],
+                    "표준편차": [s.std for s in result.summaries.values()],
+                    "p5": [s.p5 for s in result.summaries.values()],
+                    "p50": [s.p50 for s in result.summaries.values()],
+                    "p95": [s.p95 for s in result.summaries.values()],
+                    "전부 치명+약점 가정": [p.total(result.hits, result.hits, result.hits, result.hits) for p in profiles.values()],
+                }
+            ).round(0),
+            width="stretch",
+            hide_index=True,
+        )
+    st.caption(
+        f"{result.fights:,}번 × {result.hits:,}타 = {result.fights * result.hits:,}번 타격을 "
+        f"{result.seconds:.2f}초에 시뮬레이션했습니다 ({result.hits_per_sec / 1e6:,.0f}M 타격/초). "
+        f"무기 B가 더 강한 전투 비율: {result.win_rate * 100:.1f}%"
+    )
+    with perf.phase("serialize"):
+        st.image(damage_distribution_png(result.bin_edges, result.counts, result.summaries), width="stretch")
+
+
+def _format_crossings(crossings, unit: str) -> str:
+    if not crossings:
+        return "없음 (범위 전체에서 한 무기가 항상 우세)"
+    parts = []
+    for lo, hi in crossings:
+        if lo == hi:
+            parts.append(f"{lo:,.1f}{unit}")
+        elif math.isinf(hi):
+            parts.append(f"{lo:,.1f}{unit} 이상 전체에서 동일")
+        else:
+            parts.append(f"{lo:,.1f} ~ {hi:,.1f}{unit} 전체에서 동일")
+    return ", ".join(parts)
+
+
+def break_even_view(terms_A, terms_B, E_def, def_coef) -> list[float]:
+    """
+    손익분기점(공격력 / 적 방어력 / 방어 무시)과 효율 극값을 닫힌 식으로 계산해 표시.
+    그래프에 표시할 공격력 교차점 목록을 반환.
+    """
+    st.subheader("손익분기점")
+    try:
+        atk_cross = break_even(terms_A, terms_B, "atk", E_def, def_coef)
+        def_cross = break_even(terms_A, terms_B, "E_def", E_def, def_coef)
+        ignore_cross = break_even(terms_A, terms_B, "def_coef", E_def, def_coef, 0.0, 100.0)
+        (atk_min_at, eff_min), (atk_max_at, eff_max) = efficiency_extrema(
+            terms_A, terms_B, "atk", E_def, def_coef, 0.0, 8000.0
+        )
+        eff_inf = efficiency_asymptote(terms_A, terms_B, "atk", E_def, def_coef)
+    except ValueError as e:
+        st.info(f"손익분기점을 계산할 수 없습니다: {e}")
+        return []
+
+    st.markdown(f"""
+    - 같은 공격력일 때 B가 A를 역전하는 공격력: **{_format_crossings(atk_cross, "")}**
+    - 현재 공격력에서 적 방어력 손익분기점: **{_format_crossings(def_cross, "")}**
+    - 현재 조건에서 공통 방어 무시 손익분기점: **{_format_crossings(ignore_cross, "%")}**
+    - 그래프 범위(공격력 0 ~ 8000) 효율: 최소 {eff_min:.2f}% (공격력 {atk_min_at:,.0f}),
+      최대 {eff_max:.2f}% (공격력 {atk_max_at:,.0f}) / 공격력 → ∞ 극한 {eff_inf:.2f}%
+    """)
+    return [lo for lo, hi in atk_cross if lo == hi]
+
+
+DEFAULT_WEAPONS = {
+    "이름": ["무기 1", "무기 2", "무기 3", "무기 4"],
+    "무기 공격력": [390.0, 390.0, 360.0, 340.0],
+    "옵션": ["공격 보너스 15%", "치명타 피해 25%", "공격 보너스 15%", "치명타 피해 25%"],
+    "방어 무시(%)": [0.0, 0.0, 10.0, 20.0],
+    "피증 계수(%)": [10.0, 10.0, 20.0, 15.0],
+}
+
+
+def weapon_matrix_view(common: dict):
+    pd = lazy_import("pandas")
+
+    st.subheader("무기 목록")
+    st.caption("행을 추가/삭제해서 비교할 무기를 입력하세요. (공통 변수 중 적 방어력 / 방어 무시는 아래 범위로 대체됩니다)")
+    weapons_df = st.data_editor(
+        pd.DataFrame(DEFAULT_WEAPONS),
+        num_rows="dynamic",
+        key="weapon_matrix_table",
+        column_config={
+            "무기 공격력": st.column_config.NumberColumn(min_value=0.0, max_value=1000.0, step=1.0, required=True),
+            "옵션": st.column_config.SelectboxColumn(options=list(WEAPON_OPTIONS), required=True),
+            "방어 무시(%)": st.column_config.NumberColumn(min_value=0.0, max_value=100.0, step=1.0, required=True),
+            "피증 계수(%)": st.column_config.NumberColumn(min_value=0.0, max_value=500.0, step=1.0, required=True),
+        },
+        width="stretch",
+    ).dropna()
+
+    positions = st.multiselect("인형 포지션", options=list(DOLL_POSITIONS), default=list(DOLL_POSITIONS), key="matrix_positions")
+
+    st.subheader("적 조건 범위")
+    col1, col2 = st.columns(2)
+    with col1:
+        E_def_range = st.slider("적 방어력", 0.0, 20000.0, (0.0, 10000.0), step=100.0, format="%.0f", key="matrix_E_def_range")
+        E_def_count = st.number_input("적 방어력 구간 수", min_value=1, max_value=1000, value=50, step=10, key="matrix_E_def_count")
+    with col2:
+        def_range = st.slider("방어 무시(%)", 0.0, 100.0, (0.0, 60.0), step=5.0, format="%.0f", key="matrix_def_range")
+        def_count = st.number_input("방어 무시 구간 수", min_value=1, max_value=100, value=20, step=5, key="matrix_def_count")
+    perf.lap("widgets")
+
+    if weapons_df.empty or not positions:
+        st.info("무기와 포지션을 하나 이상 선택해 주세요.")
+        return
+
+    names = weapons_df["이름"].astype(str).to_numpy()
+    weapons = {
+        "wep_atk": weapons_df["무기 공격력"].to_numpy(dtype=float),
+        "option": weapons_df["옵션"].to_numpy(),
+        "def_ignore": weapons_df["방어 무시(%)"].to_numpy(dtype=float),
+        "dmg_buff": weapons_df["피증 계수(%)"].to_numpy(dtype=float),
+    }
+    E_def_values = np.linspace(E_def_range[0], E_def_range[1], int(E_def_count))
+    def_values = np.linspace(def_range[0], def_range[1], int(def_count))
+
+    start = time.perf_counter()
+    matrix = comparison_matrix(common, weapons, positions, E_def_values, def_values)
+    mean_damage, relative, wins, rank = rank_weapons(matrix)
+    elapsed = time.perf_counter() - start
+    perf.lap("compute")
+
+    n_weapons, n_positions = rank.shape
+    st.caption(
+        f"무기 {n_weapons}개 × 포지션 {n_positions}개 × 적 조건 {E_def_values.size * def_values.size:,}개 "
+        f"= {matrix.size:,}개 조합을 {elapsed * 1000:.1f} ms 만에 계산했습니다."
+    )
+
+    st.subheader("포지션별 무기 순위")
+    table = pd.DataFrame(
+        {
+            "포지션": np.repeat(np.asarray(positions), n_weapons),
+            "순위": rank.T.ravel(),
+            "무기": np.tile(names, n_positions),
+            "평균 데미지": mean_damage.T.ravel().round(0),
+            "최고 대비 평균(%)": relative.T.ravel().round(2),
+            "1위 조건 수": wins.T.ravel(),
+        }
+    ).sort_values(["포지션", "순위"], key=lambda col: col.map(positions.index) if col.name == "포지션" else col)
+    st.dataframe(table, width="stretch", hide_index=True)
+    perf.lap("table")
+
+    st.subheader("히트맵 (적 방어력별 최고 무기 대비 %)")
+    heat_position = st.selectbox("포지션", options=positions, key="weapon_heatmap_position")
+    p = positions.index(heat_position)
+    order = np.argsort(rank[:, p], kind="stable")
+    per_condition = matrix[:, p]
+    best = per_condition.max(axis=0, keepdims=True)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        heat = np.where(best > 0, per_condition / best * 100, 0.0).mean(axis=2)
+    # 그래프 폰트에 한글이 없으므로 축에는 순위만 표시하고 무기 이름은 캡션으로 안내
+    labels = [f"#{r}" for r in rank[order, p].tolist()]
+    perf.lap("compute")
+    with perf.phase("serialize"):
+        st.image(
+            weapon_heatmap_png(heat[order], labels, E_def_values, "Relative damage (avg over DEF ignore)"),
+            width="stretch",
+        )
+    st.caption(" / ".join(f"#{r} {name}" for r, name in zip(rank[order, p].tolist(), names[order])))
+
+
+DEFAULT_ROTATION_TURNS = 12
+# 매 턴 일반 스킬, 4턴마다 궁극기
+DEFAULT_SKILLS = {
+    "턴": [*range(1, 13), 4, 8, 12],
+    "스킬 계수(%)": [100.0] * 12 + [350.0] * 3,
+}
+DEFAULT_BUFFS = {
+    "종류": ["방어 무시(%)", "피해 증가(%)", "치명 피해(%)", "공격력(%)", "피해 증가(%)"],
+    "시작 턴": [1, 3, 4, 7, 8],
+    "지속 턴": [6, 3, 2, 4, 3],
+    "수치(%)": [20.0, 20.0, 30.0, 15.0, 25.0],
+}
+
+
+def parse_timeline(turns: int, skills_df, buffs_df) -> Timeline:
+    """
+    스킬 / 버프 표(data_editor) → Timeline. 범위를 벗어난 값은 ValueError.
+    """
+    kinds = {label: kind for kind, label in BUFF_KINDS.items()}
+    return Timeline(
+        turns=turns,
+        skills=tuple(Skill(int(t), float(c)) for t, c in zip(skills_df["턴"], skills_df["스킬 계수(%)"])),
+        buffs=tuple(
+            Buff(kinds[k], int(s), int(d), float(v))
+            for k, s, d, v in zip(buffs_df["종류"], buffs_df["시작 턴"], buffs_df["지속 턴"], buffs_df["수치(%)"])
+        ),
+    )
+
+
+def rotation_view(common: dict):
+    pd = lazy_import("pandas")
+
+    st.subheader("무기 목록")
+    st.caption("사이드바 공통 변수에 무기 / 포지션을 더한 상태로 아래 로테이션 전체의 데미지를 비교합니다.")
+    weapons_df = st.data_editor(
+        pd.DataFrame(DEFAULT_WEAPONS),
+        num_rows="dynamic",
+        key="rotation_weapons",
+        column_config={
+            "무기 공격력": st.column_config.NumberColumn(min_value=0.0, max_value=1000.0, step=1.0, required=True),
+            "옵션": st.column_config.SelectboxColumn(options=list(WEAPON_OPTIONS), required=True),
+            "방어 무시(%)": st.column_config.NumberColumn(min_value=0.0, max_value=100.0, step=1.0, required=True),
+            "피증 계수(%)": st.column_config.NumberColumn(min_value=0.0, max_value=500.0, step=1.0, required=True),
+        },
+        width="stretch",
+    ).dropna()
+    position = st.radio("인형 포지션", options=list(DOLL_POSITIONS), horizontal=True, key="rotation_position")
+
+    st.subheader("로테이션")
+    st.caption(
+        "스킬 계수는 아래 표의 값을 씁니다 (사이드바 스킬 계수는 쓰지 않음). "
+        "버프는 시작 턴부터 지속 턴 동안 적용되고, 같은 종류끼리 겹치면 더해집니다."
+    )
+    turns = st.number_input("턴 수", min_value=1, max_value=MAX_TURNS, value=DEFAULT_ROTATION_TURNS, step=1, key="rotation_turns")
+    col1, col2 = st.columns(2)
+    with col1:
+        skills_df = st.data_editor(
+            pd.DataFrame(DEFAULT_SKILLS),
+            num_rows="dynamic",
+            key="rotation_skills",
+            column_config={
+                "턴": st.column_config.NumberColumn(min_value=1, max_value=MAX_TURNS, step=1, required=True),
+                "스킬 계수(%)": st.column_config.NumberColumn(min_value=0.0, max_value=5000.0, step=10.0, required=True),
+            },
+            width="stretch",
+        ).dropna()
+    with col2:
+        buffs_df = st.data_editor(
+            pd.DataFrame(DEFAULT_BUFFS),
+            num_rows="dynamic",
+            key="rotation_buffs",
+            column_config={
+                "종류": st.column_config.SelectboxColumn(options=list(BUFF_KINDS.values()), required=True),
+                "시작 턴": st.column_config.NumberColumn(min_value=1, max_value=MAX_TURNS, step=1, required=True),
+                "지속 턴": st.column_config.NumberColumn(min_value=1, max_value=MAX_TURNS, step=1, required=True),
+                "수치(%)": st.column_config.NumberColumn(min_value=-100.0, max_value=1000.0, step=5.0, required=True),
+            },
+            width="stretch",
+        ).dropna()
+    perf.lap("widgets")
+
+    if weapons_df.empty or skills_df.empty:
+        st.info("무기와 스킬을 하나 이상 입력해 주세요.")
+        return
+    try:
+        timeline = parse_timeline(int(turns), skills_df, buffs_df)
+    except ValueError as e:
+        st.error(str(e))
+        return
+
+    names = weapons_df["이름"].astype(str).to_numpy()
+    weapons = {
+        "wep_atk": weapons_df["무기 공격력"].to_numpy(dtype=float),
+        "option": weapons_df["옵션"].to_numpy(),
+        "def_ignore": weapons_df["방어 무시(%)"].to_numpy(dtype=float),
+        "dmg_buff": weapons_df["피증 계수(%)"].to_numpy(dtype=float),
+    }
+    start = time.perf_counter()
+    per_turn = rotation_damage(weapon_loadouts(common, weapons, position), timeline)
+    elapsed = time.perf_counter() - start
+    total = per_turn.sum(axis=1)
+    perf.lap("compute")
+    perf.count("rotation.cells", per_turn.size)
+
+    st.caption(f"무기 {len(names)}개 × {timeline.turns}턴을 {elapsed * 1000:.1f} ms 만에 계산했습니다.")
+    order = np.argsort(-total, kind="stable")
+    best = total[order[0]]
+    with perf.phase("table"):
+        st.dataframe(
+            pd.DataFrame(
+                {
+                    "순위": np.arange(1, len(names) + 1),
+                    "무기": names[order],
+                    "총 데미지": total[order].round(0),
+                    "최고 대비(%)": (total[order] / best * 100 if best > 0 else np.zeros(len(names))).round(2),
+                    "턴당 평균": (total[order] / timeline.turns).round(0),
+                    "최대 턴 데미지": per_turn[order].max(axis=1).round(0),
+                }
+            ),
+            width="stretch",
+            hide_index=True,
+        )
+
+    # 그래프 폰트에 한글이 없으므로 범례에는 순위만 표시
+    shown = order[:4]
+    with perf.phase("serialize"):
+        st.image(rotation_plot_png(per_turn[shown], [f"#{r}" for r in range(1, len(shown) + 1)]), width="stretch")
+    st.caption(" / ".join(f"#{r} {name}" for r, name in enumerate(names[shown], start=1)) + " (상위 4개까지 표시)")
+
+
+def stat_optimizer_view(common: dict):
+    pd = lazy_import("pandas")
+
+    st.subheader("기준 장비")
+    st.caption("사이드바 공통 변수에 아래 무기 / 포지션을 더한 상태에서 부가 스탯 포인트를 배분합니다.")
+    col1, col2 = st.columns(2)
+    with col1:
+        wep_atk = st.number_input("무기 공격력", min_value=0.0, max_value=1000.0, value=390.0, step=1.0, format="%.0f", key="opt_wep_atk")
+    with col2:
+        position = st.radio("인형 포지션", options=list(DOLL_POSITIONS), horizontal=True, key="opt_position")
+    atk_per, ct_per = DOLL_POSITIONS[position]
+    base = base_from_common(common, wep_atk, atk_per, ct_per)
+
+    st.subheader("포인트 예산")
+    budget = st.number_input("배분할 포인트", min_value=0, max_value=5000, value=50, step=5, key="opt_budget")
+    st.caption("포인트 1개당 오르는 스탯(%)")
+    rate_cols = st.columns(len(STATS))
+    rates = {}
+    for col, stat in zip(rate_cols, STATS):
+        with col:
+            rates[stat] = st.number_input(
+                STAT_LABELS[stat], min_value=0.0, max_value=100.0, value=1.0, step=0.1, format="%.2f", key=f"opt_rate_{stat}"
+            )
+    perf.lap("widgets")
+
+    start = time.perf_counter()
+    result = optimize_allocation(base, int(budget), rates)
+    elapsed = time.perf_counter() - start
+    best = apply_allocation(base, rates, result.points)
+    perf.lap("compute")
+
+    st.subheader("최적 배분")
+    st.success(
+        f"최종 데미지 {result.base_damage:,.0f} → {result.damage:,.0f} "
+        f"(+{result.gain_percent:.2f}%)"
+    )
+    st.dataframe(
+        pd.DataFrame(
+            {
+                "스탯": [STAT_LABELS[stat] for stat in STATS],
+                "포인트": [result.points[stat] for stat in STATS],
+                "증가량(%)": [result.points[stat] * rates[stat] for stat in STATS],
+                "최종 값(%)": [best[stat] for stat in STATS],
+            }
+        ),
+        width="stretch",
+        hide_index=True,
+    )
+    st.caption(f"{elapsed * 1000:.1f} ms 만에 계산했습니다.")
+    perf.lap("table")
+
+    st.subheader("스탯 환산표")
+    st.caption("현재 상태에서 각 스탯 +1% 가 피해 증가 몇 %와 같은지 (해석적 미분 기준)")
+    tables = {"현재": equivalence_table(base, rates), "최적 배분 후": equivalence_table(best, rates)}
+    perf.lap("compute")
+    st.dataframe(
+        pd.DataFrame(
+            {
+                "스탯": [STAT_LABELS[stat] for stat in STATS],
+                **{
+                    f"{label} · 피해 증가 환산(%)": [row["buff_x_equiv"] for row in rows]
+                    for label, rows in tables.items()
+                },
+                **{
+                    f"{label} · 포인트당 데미지(%)": [row["per_point_percent"] for row in rows]
+                    for label, rows in tables.items()
+                },
+            }
+        ).round(3),
+        width="stretch",
+        hide_index=True,
+    )
+    perf.lap("table")
+
+
+BULK_MIME = {"csv": "text/csv", "parquet": "application/octet-stream"}
+
+
+def bulk_view(common: dict):
+    bulk = lazy_import("tot_calculator.bulk")
+
+    st.subheader("로드아웃 파일 일괄 평가")
+    st.caption(
+        "CSV / Parquet 파일을 청크 단위로 읽어 무기 A / B 데미지를 계산하고 결과 열을 붙인 파일을 만듭니다. "
+        "파일에 없는 열은 사이드바 공통 변수(무기 열은 기본값)로 채웁니다."
+    )
+    with st.expander("인식하는 열"):
+        st.code(", ".join(bulk.input_columns()))
+        st.caption(
+            f"position: {' / '.join(DOLL_POSITIONS)}, option_A / option_B: {' / '.join(WEAPON_OPTIONS)}. "
+            f"결과 열: {', '.join(bulk.OUTPUT_COLUMNS)}"
+        )
+
+    uploaded = st.file_uploader("로드아웃 파일", type=list(bulk.FORMATS), key="bulk_upload")
+    col1, col2 = st.columns(2)
+    with col1:
+        out_format = st.radio("결과 형식", options=list(bulk.FORMATS), horizontal=True, key="bulk_out_format")
+    with col2:
+        chunk_rows = st.number_input(
+            "청크 크기 (행)", min_value=1_000, max_value=1_000_000, value=bulk.DEFAULT_CHUNK_ROWS, step=10_000, key="bulk_chunk_rows"
+        )
+    perf.lap("widgets")
+
+    if uploaded is not None and st.button("평가 실행", key="bulk_run"):
+        in_format = uploaded.name.rsplit(".", 1)[-1].lower()
+        previous = st.session_state.pop("bulk_result", None)
+        if previous is not None and os.path.exists(previous["path"]):
+            os.remove(previous["path"])
+
+        status = st.empty()
+        fd, path = tempfile.mkstemp(suffix=f".{out_format}", prefix="tot_bulk_")
+        try:
+            with os.fdopen(fd, "wb") as sink:
+                report = bulk.evaluate_file(
+                    uploaded, sink, common,
+                    in_format=in_format, out_format=out_format, chunk_rows=int(chunk_rows),
+                    progress=lambda rows: status.caption(f"{rows:,}행 처리 중..."),
+                )
+        except (ValueError, TypeError, ImportError) as e:
+            os.remove(path)
+            status.error(f"평가하지 못했습니다: {e}")
+            return
+        status.empty()
+        perf.lap("compute")
+        perf.count("bulk.rows", report.rows)
+        st.session_state["bulk_result"] = {
+            "path": path,
+            "name": f"{uploaded.name.rsplit('.', 1)[0]}_result.{out_format}",
+            "format": out_format,
+            "report": report,
+        }
+
+    result = st.session_state.get("bulk_result")
+    if result is None or not os.path.exists(result["path"]):
+        return
+    report = result["report"]
+    st.success(
+        f"{report.rows:,}행을 {report.chunks}개 청크로 {report.seconds:.2f}초 만에 평가했습니다 "
+        f"({report.rows_per_sec:,.0f} 행/초)."
+    )
+    with open(result["path"], "rb") as f:
+        st.download_button(
+            "결과 다운로드",
+            data=f,
+            file_name=result["name"],
+            mime=BULK_MIME[result["format"]],
+            on_click="ignore",
+            key="bulk_download",
+        )
 
 
 # =========================================================
 # 계산기 2 : 실시간 데미지 3D 그래프
 # =========================================================
-def calculator_two():
-    def compute_z(x, y, atk, defense, w, skill, multiplier):
-        numerator = atk ** 2
-        denominator = atk + defense * (1 - w * 0.01)
-        return (numerator / denominator) * (1 + x * 0.01) * multiplier * (skill * 0.01) * (y * 0.01)
+SURFACE_RESOLUTIONS = [20, 30, 50, 80, 120]
+SURFACE_PREVIEW_RESOLUTION = 15
+SURFACE_PREVIEW_DPI = 80
+
+
+# 브라우저(WebGL) 렌더링용 컴포넌트: 이미지 대신 z 격자와 현재 위치만 전송
+damage_surface_chart = components.declare_component(
+    "damage_surface",
+    path=os.path.join(os.path.dirname(os.path.abspath(__file__)), "components", "surface"),
+)
 
+
+@st.cache_resource
+def surface_grid(resolution: int):
+    """
+    피해증가(0 ~ 400) × 치명피해(0 ~ 500) 격자. 해상도별로 한 번만 만들어 재사용하며
+    여러 세션이 공유하므로 읽기 전용으로 둠.
+    """
+    X, Y = np.meshgrid(np.linspace(0, 400, resolution), np.linspace(0, 500, resolution))
+    X.setflags(write=False)
+    Y.setflags(write=False)
+    return X, Y
+
+
+# 컴포넌트가 알려 온 "그릴 수 없는 이유" → 안내 문구
+SURFACE_WEBGL_UNAVAILABLE = {
+    "plotly": "브라우저에서 plotly.js 를 불러오지 못했습니다",
+    "webgl": "이 브라우저에서 WebGL 을 사용할 수 없습니다",
+}
+
+
+def surface_webgl_unavailable() -> str | None:
+    """
+    브라우저(WebGL) 컴포넌트가 곡면을 그릴 수 없다고 알려 왔으면 그 이유. 세션 동안 기억해서
+    이후에는 컴포넌트를 만들지 않고 바로 서버 이미지로 그림.
+    """
+    state = st.session_state
+    request = state.get("surface_chart")
+    if isinstance(request, dict) and request.get("unavailable") in SURFACE_WEBGL_UNAVAILABLE:
+        state["surface_webgl_unavailable"] = request["unavailable"]
+    return state.get("surface_webgl_unavailable")
+
+
+def render_surface_webgl(X, Y, Z, x, y, z_val, atk, defense, w, surface_key):
+    """
+    곡면을 브라우저에서 그림. z 격자는 곡면이 바뀌었을 때(또는 브라우저가 다시 요청할 때)만 보내고,
+    피해증가/치명피해만 바뀌면 현재 위치 점만 보내서 브라우저가 그 점만 옮기게 함.
+    """
+    state = st.session_state
+    surface_key = "-".join(str(v) for v in surface_key)
+
+    # iframe 이 새로 만들어져 곡면 데이터가 없으면 컴포넌트가 재전송을 요청함
+    request = state.get("surface_chart")
+    resend = isinstance(request, dict) and request.get("request_id") != state.get("surface_request_handled")
+    if resend:
+        state["surface_request_handled"] = request.get("request_id")
+
+    surface = None
+    if resend or state.get("surface_sent_key") != surface_key:
+        surface = {
+            "key": surface_key,
+            "x": X[0].tolist(),
+            "y": Y[:, 0].tolist(),
+            "z": np.round(np.nan_to_num(Z), 3).tolist(),
+            "title": f"3D Dmg Graph (atk={atk}, def={defense}, w={w}%)",
+        }
+        state["surface_sent_key"] = surface_key
+
+    damage_surface_chart(
+        surface=surface,
+        surface_key=surface_key,
+        point={"x": float(x), "y": float(y), "z": float(np.nan_to_num(z_val))},
+        key="surface_chart",
+        default=None,
+    )
+
+
+@st.fragment
+@traced("calc2")
+def calculator_two():
     st.markdown("<div class='calculator-card'>", unsafe_allow_html=True)
 
     st.markdown("### 📈 실시간 데미지 계산 3D 그래프")
@@ -361,28 +1092,69 @@ z = \left( \frac{\text{공격력}^2}{\text{공격력} + \text{적 방어력} \cd
     x = st.slider("피해증가 %", 0, 500, 100, step=10)
     y = st.slider("치명피해 %", 0, 400, 100, step=10)
 
-    z_val = compute_z(x, y, atk, defense, w, skill, multiplier)
+    z_val = float(damage_batch(atk, defense, w, x, y, skill, multiplier))
     st.write(f"약점 계수 값: {multiplier}")
     st.write(f"스킬 계수 값: {skill}")
     st.markdown("---")
     st.markdown(f"### 실제 데미지 (z): `{z_val:.2f}`")
 
-    x_vals = np.linspace(0, 400, 50)
-    y_vals = np.linspace(0, 500, 50)
-    X, Y = np.meshgrid(x_vals, y_vals)
-    Z = compute_z(X, Y, atk, defense, w, skill, multiplier)
-
-    fig = plt.figure(figsize=(10, 7))
-    ax = fig.add_subplot(111, projection='3d')
-    surf = ax.plot_surface(X, Y, Z, cmap='plasma', edgecolor='none', alpha=0.8)
-    ax.scatter(x, y, z_val, color='red', s=50, label='Current')
-    ax.set_xlabel('Dmg Increase (%)')
-    ax.set_ylabel('Crit (%)')
-    ax.set_zlabel('Actual Dmg')
-    ax.set_title(f'3D Dmg Graph (atk={atk}, def={defense}, w={w}%)')
-    ax.legend()
-
-    st.pyplot(fig)
+    col_res, col_adaptive = st.columns([2, 1])
+    with col_res:
+        resolution = st.select_slider(
+            "그래프 해상도 (격자 크기)",
+            options=SURFACE_RESOLUTIONS,
+            value=50,
+            key="surface_resolution",
+        )
+    with col_adaptive:
+        backend = st.radio(
+            "렌더링 방식",
+            options=["서버 (이미지)", "브라우저 (WebGL)"],
+            key="surface_backend",
+            help="브라우저 방식은 곡면 데이터만 보내서 브라우저에서 그리므로, 서버 재실행 없이 돌려 볼 수 있습니다.",
+        )
+        adaptive = st.checkbox(
+            "조작 중 미리보기",
+            value=True,
+            key="surface_adaptive",
+            help="값을 바꾸는 동안 먼저 거친 와이어프레임을 보여주고, 입력이 멈추면 고해상도 곡면으로 바꿉니다.",
+        )
+    perf.lap("widgets")
+
+    unavailable = surface_webgl_unavailable() if backend == "브라우저 (WebGL)" else None
+    if unavailable:
+        st.warning(f"{SURFACE_WEBGL_UNAVAILABLE[unavailable]}. 서버에서 그린 이미지로 표시합니다.")
+    elif backend == "브라우저 (WebGL)":
+        X, Y = surface_grid(resolution)
+        Z = damage_batch(atk, defense, w, X, Y, skill, multiplier)
+        perf.lap("compute")
+        with perf.phase("serialize"):
+            render_surface_webgl(X, Y, Z, x, y, z_val, atk, defense, w, surface_key=(atk, defense, w, skill, multiplier, resolution))
+        st.markdown("</div>", unsafe_allow_html=True)
+        return
+
+    plot_slot = st.empty()
+    params = (x, y, atk, defense, w, skill, multiplier, resolution)
+    rendered = st.session_state.setdefault("surface_rendered", [])
+
+    # 처음 보는 입력이면 저해상도 미리보기를 먼저 그림.
+    # 고해상도 렌더링 중에 입력이 또 바뀌면 Streamlit이 이 실행을 중단하고 다시 시작하므로,
+    # 입력이 멈췄을 때만 고해상도 곡면까지 그려짐.
+    if adaptive and resolution > SURFACE_PREVIEW_RESOLUTION and params not in rendered:
+        X, Y = surface_grid(SURFACE_PREVIEW_RESOLUTION)
+        Z = damage_batch(atk, defense, w, X, Y, skill, multiplier)
+        perf.lap("compute")
+        with perf.phase("serialize"):
+            plot_slot.image(surface_preview_png(X, Y, Z, x, y, z_val, atk, defense, w), width="stretch")
+
+    X, Y = surface_grid(resolution)
+    Z = damage_batch(atk, defense, w, X, Y, skill, multiplier)
+    perf.lap("compute")
+    with perf.phase("serialize"):
+        plot_slot.image(surface_plot_png(X, Y, Z, x, y, z_val, atk, defense, w), width="stretch")
+
+    rendered.append(params)
+    del rendered[:-PLOT_CACHE_ENTRIES]
 
     st.markdown("</div>", unsafe_allow_html=True)
 
@@ -390,91 +1162,238 @@ z = \left( \frac{\text{공격력}^2}{\text{공격력} + \text{적 방어력} \cd
 # =========================================================
 # 계산기 3 : 특수 점수 계산기 (평균 k, n 추론) - 최신 로직 반영
 # =========================================================
-def calculator_three():
-    # -----------------------------
-    # 점수 계산 로직
-    # -----------------------------
-    def compute_a(P: int) -> int:
-        """
-        누적 활동치 P에 따른 추가 평가점수 a(P)를 계산.
-        각 마일스톤을 넘을 때마다 보너스를 누적해서 더함.
-        """
-        bonus_table = [
-            ([900, 1800, 2700], 40),
-            ([4500, 9000, 15000, 24000, 36000], 100),
-            ([45000, 60000, 72000, 90000], 160),
-            ([126000, 180000, 240000, 330000], 2000),
-            (
-                [
-                    375000, 420000, 480000, 540000, 600000,
-                    675000, 788000, 900000, 1050000, 1200000, 1350000
-                ],
-                300,
-            ),
-        ]
+SEARCH_ENGINE_LABELS = {
+    "python": "순수 파이썬",
+    "vectorized": "벡터화 (NumPy 청크)",
+    "parallel": "병렬 샤드",
+    "index": "사전 계산 색인",
+    "interval": "구간 해석",
+}
 
-        a = 0
-        for thresholds, bonus in bonus_table:
-            for t in thresholds:
-                if P >= t:
-                    a += bonus
-        return a
 
-    def compute_m(k: int) -> int:
-        """
-        활동치 k에 따른 보너스 m(k) 계산.
-        - k < 3800: 0점
-        - 3800 ~ 4800: 27점
-        - 4800 초과: 27 + floor((k - 4800) / 80)
-        """
-        if k < 3800:
-            return 0
-        if k <= 4800:
-            return 27
-        extra = (k - 4800) // 80
-        return 27 + extra
-
-    def compute_P(k: int, n: int, days: int) -> int:
-        """
-        days일 동안의 누적 활동치 P = days * k * n
-        """
-        return days * k * n
+def search_workers() -> int:
+    """
+    병렬 샤드 탐색 워커 수. TOT_SEARCH_WORKERS 로 지정할 수 있고, 기본값은 CPU 코어 수.
+    """
+    return int(os.environ.get("TOT_SEARCH_WORKERS", os.cpu_count() or 1))
+
+
+# 결과 열 → 표 / 내보내기 열 이름 (표시 순서)
+INTERVAL_LABELS = {
+    "diff": "차이 |x - 모델|",
+    "k_lo": "k 최소",
+    "k_hi": "k 최대",
+    "n": "n (1일 평균 횟수)",
+    "a": "a(P)",
+    "m": "m(k)",
+    "x_hat": "모델 총 점수 (590+m+a)",
+}
+SERIES_LABELS = {"max_diff": "최대 오차", "k_lo": "k 최소", "k_hi": "k 최대", "n": "n (1일 평균 횟수)"}
+TRAJECTORY_LABELS = {"day": "일차", "x": "입력 총 점수", "x_hat": "모델 총 점수", "diff": "차이 (모델 - 입력)"}
+
+
+def point_labels(days: int) -> dict:
+    return {
+        "diff": "차이 |x - 모델|",
+        "k": "k (평균 활동 점수)",
+        "n": "n (1일 평균 횟수)",
+        "P": f"P = {days}×k×n",
+        "a": "a(P)",
+        "m": "m(k)",
+        "x_hat": "모델 총 점수 (590+m+a)",
+    }
+
+
+def result_table(columns: ResultColumns, labels: dict):
+    """
+    열 배열을 Arrow 표로 감싸서 그대로 표시 (행 dict / DataFrame 을 만들지 않음).
+    """
+    with perf.phase("table"):
+        st.dataframe(columns.to_arrow(labels), width="stretch", hide_index=True)
+
+
+def export_view(target_x: int, days: int, k_min: int, k_max: int, k_step: int, exact: bool, time_budget: float):
+    """
+    상위 후보를 화면 표시 개수보다 많이 (최대 EXPORT_MAX_ROWS개) CSV / Parquet 파일로 내보냄.
+    """
+    with st.expander("📥 후보 목록 내보내기"):
+        col1, col2 = st.columns(2)
+        with col1:
+            export_rows = st.number_input(
+                "내보낼 후보 수", min_value=1, max_value=EXPORT_MAX_ROWS, value=1000, step=1000, key="score_export_rows"
+            )
+        with col2:
+            export_format = st.radio("파일 형식", options=list(BULK_MIME), horizontal=True, key="score_export_format")
+        perf.lap("widgets")
+
+        export_key = (target_x, days, k_min, k_max, k_step, exact, int(export_rows), export_format)
+        if st.button("파일 만들기", key="score_export_build"):
+            start = time.perf_counter()
+            should_stop = make_deadline(time_budget)
+            try:
+                if exact:
+                    found = search_best_intervals(
+                        target_x=target_x, k_min=k_min, k_max=k_max, k_step=k_step, days=days,
+                        top_k=int(export_rows), should_stop=should_stop,
+                    )
+                    columns, labels = ResultColumns.from_rows(found, INTERVAL_COLUMNS), INTERVAL_LABELS
+                else:
+                    columns = search_top_columns(
+                        target_x, k_min, k_max, k_step, days, int(export_rows), should_stop=should_stop
+                    )
+                    labels = point_labels(days)
+            except SearchCancelled:
+                st.error(f"탐색이 {time_budget:.0f}초 예산을 넘어 중단되었습니다. k 범위나 step을 조정해 주세요.")
+                return
+            perf.lap("compute")
+            with perf.phase("serialize"):
+                data = columns.to_parquet(labels) if export_format == "parquet" else columns.to_csv(labels)
+            perf.count("export.rows", len(columns))
+            st.session_state["score_export"] = {
+                "key": export_key,
+                "data": data,
+                "rows": len(columns),
+                "nbytes": columns.nbytes,
+                "seconds": time.perf_counter() - start,
+            }
+
+        export = st.session_state.get("score_export")
+        if export is None or export["key"] != export_key:
+            return
+        st.caption(
+            f"후보 {export['rows']:,}개 · 열 배열 {export['nbytes'] / 1024:.1f}KB → "
+            f"파일 {len(export['data']) / 1024:.1f}KB ({export['seconds'] * 1000:.0f} ms)"
+        )
+        st.download_button(
+            "파일 내려받기",
+            data=export["data"],
+            file_name=f"tot_score_{target_x}_{days}d.{export_format}",
+            mime=BULK_MIME[export_format],
+            on_click="ignore",
+            key="score_export_download",
+        )
+
+
+DEFAULT_SERIES = "1939\n5939\n9939\n10539\n11139\n11739\n12039"
+# 입력할 수 있는 가장 늦은 일차 / 가장 큰 총점 (계산기 3 의 진행 일수 / 총 점수 상한과 같음)
+SERIES_MAX_DAY = 365
+SERIES_MAX_SCORE = 5_000_000
+
+
+def parse_series(text: str, first_day: int) -> list[tuple[int, int]]:
+    """
+    한 줄에 '총점' 또는 '일차, 총점'. 일차가 없으면 first_day 부터 하루씩 늘려 붙임.
+    """
+    series = []
+    day = first_day
+    for line_no, line in enumerate(text.splitlines(), start=1):
+        parts = line.replace(",", " ").replace(":", " ").split()
+        if not parts:
+            continue
+        if len(parts) > 2 or not all(p.isdigit() for p in parts):
+            raise ValueError(f"{line_no}번째 줄을 읽을 수 없습니다: {line.strip()}")
+        if len(parts) == 2:
+            day = int(parts[0])
+        if not 1 <= day <= SERIES_MAX_DAY:
+            raise ValueError(f"{line_no}번째 줄의 일차는 1 ~ {SERIES_MAX_DAY} 사이여야 합니다: {line.strip()}")
+        if int(parts[-1]) > SERIES_MAX_SCORE:
+            raise ValueError(f"{line_no}번째 줄의 총 점수는 {SERIES_MAX_SCORE:,} 이하여야 합니다: {line.strip()}")
+        series.append((day, int(parts[-1])))
+        day += 1
+    days = [d for d, _ in series]
+    if len(set(days)) != len(days):
+        raise ValueError("같은 일차가 두 번 이상 들어 있습니다.")
+    return series
+
+
+def series_view():
+    """
+    일차별 총점을 모두 받아 모든 날을 함께 설명하는 (k, n) 을 추론 (score.search_series).
+    """
+    st.subheader("1. 일차별 총 점수 입력")
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        text = st.text_area(
+            "한 줄에 하루씩 총 점수 (또는 '일차, 총 점수')",
+            value=DEFAULT_SERIES,
+            height=180,
+            key="series_text",
+        )
+    with col2:
+        first_day = st.number_input("첫 줄의 일차", min_value=1, max_value=SERIES_MAX_DAY, value=1, step=1, key="series_first_day")
+
+    st.subheader("2. 활동치 k 탐색 범위 설정")
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        k_min = st.number_input("활동치 k 최소값", min_value=0, max_value=2_000_000, value=3800, step=100, key="series_k_min")
+    with col2:
+        k_max = st.number_input("활동치 k 최대값", min_value=k_min + 1, max_value=2_000_000, value=50000, step=100, key="series_k_max")
+    with col3:
+        k_step = st.number_input("활동치 k 탐색 간격", min_value=1, max_value=10000, value=1, step=1, key="series_k_step")
+    top_k = st.slider("상위 몇 개 조합을 볼까요?", min_value=1, max_value=N_MAX - N_MIN + 1, value=5, key="series_top_k")
+    perf.lap("widgets")
+
+    try:
+        series = parse_series(text, int(first_day))
+    except ValueError as e:
+        st.error(str(e))
+        return
+    if not series:
+        st.info("일차별 총 점수를 한 줄 이상 입력해 주세요.")
+        return
+
+    start = time.perf_counter()
+    try:
+        rows = search_series(series, k_min, k_max, k_step, top_k)
+    except ValueError as e:
+        st.error(str(e))
+        return
+    elapsed = time.perf_counter() - start
+    perf.lap("compute")
+
+    best_diff, best_k_lo, best_k_hi, best_n = rows[0]
+    st.markdown("---")
+    st.subheader("📌 모든 날을 가장 잘 설명하는 조합 (1위)")
+    col_a, col_b, col_c = st.columns(3)
+    col_a.metric("평균 활동치 k 범위", f"{best_k_lo} ~ {best_k_hi}")
+    col_b.metric("평균 활동 횟수 n (1일 기준)", f"{best_n}")
+    col_c.metric("최대 오차 (모든 날 중)", f"{best_diff}")
+    st.caption(
+        f"{len(series)}일치 점수를 함께 풀었습니다 ({elapsed * 1000:.1f} ms). "
+        f"k 범위 안의 모든 값은 최대 오차가 같습니다."
+    )
+
+    st.markdown(f"**일차별 비교 (k = {best_k_lo}, n = {best_n})**")
+    result_table(ResultColumns.from_rows(series_trajectory(series, best_k_lo, best_n), TRAJECTORY_COLUMNS), TRAJECTORY_LABELS)
+    if len(rows) > 1:
+        st.markdown(f"**상위 {len(rows)}개 조합**")
+        result_table(ResultColumns.from_rows(rows, SERIES_COLUMNS), SERIES_LABELS)
 
-    def model_total_score(k: int, n: int, days: int) -> tuple[int, int, int, int]:
-        """
-        (k, n, days)에 따른 모델 총점과 구성요소 계산.
-        x_hat = 590 + m(k) + a(P)
-        """
-        P = compute_P(k, n, days=days)
-        a = compute_a(P)
-        m = compute_m(k)
-        total = 590 + m + a
-        return total, P, a, m
-
-    def search_best_k_n(
-        target_x: int,
-        k_min: int,
-        k_max: int,
-        k_step: int,
-        days: int,
-        top_k: int = 5,
-    ):
-        """
-        n은 항상 1 ~ 30 전체 탐색.
-        k 범위 내에서 (k, n)을 브루트포스로 탐색해
-        x_hat이 target_x에 가장 근접한 상위 top_k개 반환.
-        """
-        best_list = []
 
-        for k in range(k_min, k_max + 1, k_step):
-            for n in range(1, 31):  # 하루 평균 횟수: 1 ~ 30
-                x_hat, P, a, m = model_total_score(k, n, days=days)
-                diff = abs(x_hat - target_x)
-                best_list.append((diff, k, n, x_hat, P, a, m))
+@st.cache_resource
+def get_search_executor():
+    """
+    병렬 샤드 탐색에 쓰는 프로세스 풀 (모든 세션이 공유).
+    """
+    return ProcessPoolExecutor(max_workers=search_workers(), mp_context=multiprocessing.get_context("spawn"))
 
-        best_list.sort(key=lambda x: x[0])
-        return best_list[:top_k]
 
+@st.cache_resource
+def get_score_index_cache():
+    """
+    모든 세션이 함께 쓰는 days별 점수 역색인 캐시.
+    - TOT_INDEX_CACHE_MB: 메모리에 올려둘 색인 크기 상한 (기본 128MB)
+    - TOT_INDEX_DIR: 지정하면 색인을 .npy 로 저장하고 메모리 매핑으로 재사용
+    """
+    return ScoreIndexCache(
+        max_bytes=int(os.environ.get("TOT_INDEX_CACHE_MB", "128")) * 1024 * 1024,
+        cache_dir=os.environ.get("TOT_INDEX_DIR") or None,
+    )
+
+
+@st.fragment
+@traced("calc3")
+def calculator_three():
     # -----------------------------
     # Streamlit UI (카드 래핑)
     # -----------------------------
@@ -508,6 +1427,18 @@ def calculator_three():
         unsafe_allow_html=True,
     )
 
+    input_mode = st.radio(
+        "입력 방식",
+        options=["총 점수 하나", "일차별 점수 (함께 추론)"],
+        horizontal=True,
+        key="score_input_mode",
+        help="일차별 점수를 모두 넣으면 모든 날을 함께 설명하는 k, n 을 한 번에 찾습니다.",
+    )
+    if input_mode == "일차별 점수 (함께 추론)":
+        series_view()
+        st.markdown("</div>", unsafe_allow_html=True)
+        return
+
     st.subheader("1. 총 점수 x 및 진행 일수 입력")
 
     colx1, colx2 = st.columns(2)
@@ -556,25 +1487,186 @@ def calculator_three():
         step=1,
     )
 
-    top_k = st.slider("상위 몇 개 조합을 볼까요?", min_value=1, max_value=20, value=5)
+    top_k = st.slider("상위 몇 개 조합을 볼까요?", min_value=1, max_value=MEMO_TOP_K, value=5)
+
+    search_mode = st.radio(
+        "탐색 방식",
+        options=["자동 (추천)", "브루트포스 (격자 전체)", "브루트포스 (병렬 샤드)", "정확 (구간 해석)"],
+        horizontal=True,
+        key="score_search_mode",
+        help="자동은 탐색 범위에 맞춰 가장 빠른 방법을 고릅니다 (결과는 브루트포스와 동일). "
+             "정확 모드는 m(k), a(P)가 바뀌는 경계만 따라가서 k 범위 크기와 상관없이 바로 계산하고, "
+             "점수가 같은 k를 범위로 묶어서 보여줍니다. "
+             "병렬 샤드는 k 범위를 나눠 모든 격자점을 CPU 코어 여러 개로 직접 계산합니다.",
+    )
+
+    with st.expander("⚙️ 탐색 예산"):
+        time_budget = st.number_input(
+            "최대 탐색 시간 (초)",
+            min_value=1.0,
+            max_value=600.0,
+            value=float(os.environ.get("TOT_SEARCH_TIME_BUDGET", "20")),
+            step=1.0,
+        )
+        memory_budget_mb = st.number_input(
+            "최대 메모리 (MB)",
+            min_value=16,
+            max_value=4096,
+            value=int(os.environ.get("TOT_SEARCH_MEMORY_MB", "256")),
+            step=16,
+        )
+
+    # 같은 입력의 결과는 세션에 저장해 두고 재사용 (top_k 만 바뀌면 잘라서 표시, k 범위를 넓히면 새 구간만 탐색)
+    exact = search_mode == "정확 (구간 해석)"
+    memo_key = (target_x, days, k_min, k_max, k_step)
+    memo = st.session_state.setdefault("score_memo_intervals" if exact else "score_memo_points", SearchMemo())
+    depth = max(top_k, MEMO_TOP_K)
+    stored = memo.lookup(*memo_key, top_k)
+
+    reused, plans = [], []
+    if stored is not None:
+        st.caption("같은 입력으로 탐색한 결과를 표시합니다. (상위 개수만 바꿀 때는 다시 탐색하지 않음)")
+    elif not exact:
+        reused, missing = memo.extension(*memo_key, depth)
+        for lo, hi in missing:
+            plan = plan_search(
+                lo,
+                hi,
+                k_step,
+                workers=search_workers(),
+                allow_analytic=search_mode == "자동 (추천)",
+                index_ready=days in get_score_index_cache(),
+                time_budget=time_budget,
+                memory_budget=memory_budget_mb * 1024 * 1024,
+                engine="parallel" if search_mode == "브루트포스 (병렬 샤드)" else None,
+            )
+            plans.append((lo, hi, plan))
+        engines = dict.fromkeys(SEARCH_ENGINE_LABELS[plan.engine] for _, _, plan in plans)
+        st.caption(
+            f"탐색 격자점 {sum(plan.grid_points for _, _, plan in plans):,}개 · 실행 방식: {' + '.join(engines)} · "
+            f"예상 시간 약 {sum(plan.est_seconds for _, _, plan in plans):.2f}초 · "
+            f"예상 메모리 약 {max(plan.est_bytes for _, _, plan in plans) / 1024 / 1024:.1f}MB"
+        )
+        if reused:
+            st.caption(
+                "이전 탐색 결과를 재사용하고 넓어진 k 구간 "
+                f"{', '.join(f'{lo:,} ~ {hi:,}' for lo, hi in missing)} 만 새로 탐색합니다."
+            )
 
     st.markdown("---")
 
-    if st.button("🔍 평균 k, n 추론하기"):
-        with st.spinner("k, n 조합 탐색 중..."):
-            results = search_best_k_n(
+    clicked = st.button("🔍 평균 k, n 추론하기")
+    results = intervals = None
+    perf.lap("widgets")
+
+    if stored is not None:
+        perf.count("search.memo_hit")
+        if exact:
+            intervals = stored
+        else:
+            results = stored
+
+    elif clicked and exact:
+        if k_max <= INDEX_K_MAX:
+            index = get_score_index_cache().get(days)
+            found = index.lookup_intervals(target_x, k_min, k_max, k_step, top_k=depth)
+        else:
+            found = search_best_intervals(
                 target_x=target_x,
                 k_min=k_min,
                 k_max=k_max,
                 k_step=k_step,
                 days=days,
-                top_k=top_k,
+                top_k=depth,
             )
+        memo.store(*memo_key, depth, found)
+        intervals = found[:top_k]
+        perf.lap("compute")
+
+    elif clicked and not all(plan.within_budget for _, _, plan in plans):
+        st.error(
+            "예상 탐색 비용이 예산을 넘습니다. k 범위를 줄이거나 step을 키우거나, "
+            "'자동' 또는 '정확 (구간 해석)' 방식을 사용해 주세요."
+        )
+
+    elif clicked:
+        progress_bar = st.progress(0.0, text="k, n 조합 탐색 중...")
+
+        def on_shard_done(done, total):
+            progress_bar.progress(done / total, text=f"k, n 조합 탐색 중... ({done}/{total} 구간 완료)")
+
+        # 새 구간이 둘(양쪽으로 넓힌 경우)이어도 시간 예산은 합쳐서 적용
+        deadline = time.perf_counter() + time_budget
+        try:
+            parts = [
+                run_search(
+                    plan,
+                    target_x=target_x,
+                    k_min=lo,
+                    k_max=hi,
+                    k_step=k_step,
+                    days=days,
+                    top_k=depth,
+                    executor=get_search_executor(),
+                    index_cache=get_score_index_cache(),
+                    time_budget=max(deadline - time.perf_counter(), 0.0),
+                    progress=on_shard_done,
+                )
+                for lo, hi, plan in plans
+            ]
+        except SearchCancelled:
+            st.error(f"탐색이 {time_budget:.0f}초 예산을 넘어 중단되었습니다. k 범위나 step을 조정해 주세요.")
+        else:
+            found = merge_top([reused, *parts], depth)
+            memo.store(*memo_key, depth, found)
+            results = found[:top_k]
+        progress_bar.empty()
+        perf.lap("compute")
+
+    if intervals is not None:
+        if not intervals:
+            st.warning("결과가 없습니다. k 범위와 step 값을 다시 확인해 주세요.")
+        else:
+            if clicked:
+                st.success("탐색 완료!")
+
+            best_diff, best_k_lo, best_k_hi, best_n, best_x_hat, best_a, best_m = intervals[0]
 
+            st.subheader("📌 가장 근접한 조합 (1위)")
+
+            col_a, col_b = st.columns(2)
+            with col_a:
+                st.metric("평균 활동치 k 범위", f"{best_k_lo} ~ {best_k_hi}")
+                st.metric("평균 활동 횟수 n (1일 기준)", f"{best_n}")
+                st.metric(
+                    f"누적 활동치 P = {days} × k × n",
+                    f"{days * best_k_lo * best_n} ~ {days * best_k_hi * best_n}",
+                )
+            with col_b:
+                st.metric("누적 보너스 a(P)", f"{best_a}")
+                st.metric("활동 보너스 m(k)", f"{best_m}")
+                st.metric("모델 총 점수 590 + m + a", f"{best_x_hat}")
+
+            st.markdown(
+                f"""
+**입력한 총 점수 x**: `{target_x}`  
+**모델 총 점수**: `{best_x_hat}`  
+**차이 (|x - 모델|)**: `{best_diff}`  
+**k ∈ [{best_k_lo}, {best_k_hi}], n = {best_n}** 이면 모두 같은 점수입니다.
+"""
+            )
+
+            if len(intervals) > 1:
+                st.subheader(f"상위 {len(intervals)}개 구간")
+
+                result_table(ResultColumns.from_rows(intervals, INTERVAL_COLUMNS), INTERVAL_LABELS)
+
+    if results is not None:
         if not results:
             st.warning("결과가 없습니다. k 범위와 step 값을 다시 확인해 주세요.")
         else:
-            st.success("탐색 완료!")
+            if clicked:
+                st.success("탐색 완료!")
 
             best_diff, best_k, best_n, best_x_hat, best_P, best_a, best_m = results[0]
 
@@ -602,22 +1694,10 @@ def calculator_three():
             if len(results) > 1:
                 st.subheader(f"상위 {len(results)}개 후보")
 
-                rows = []
-                for diff, k, n, x_hat, P, a, m in results:
-                    rows.append(
-                        {
-                            "차이 |x - 모델|": diff,
-                            "k (평균 활동 점수)": k,
-                            "n (1일 평균 횟수)": n,
-                            f"P = {days}×k×n": P,
-                            "a(P)": a,
-                            "m(k)": m,
-                            "모델 총 점수 (590+m+a)": x_hat,
-                        }
-                    )
+                result_table(ResultColumns.from_rows(results, POINT_COLUMNS), point_labels(days))
 
-                df = pd.DataFrame(rows)
-                st.dataframe(df, use_container_width=True)
+    if intervals is not None or results is not None:
+        export_view(target_x, days, k_min, k_max, k_step, exact, time_budget)
 
     st.markdown(
         """
@@ -636,6 +1716,54 @@ def calculator_three():
 # =========================================================
 # 메인 앱
 # =========================================================
+def import_time_panel():
+    """
+    이 프로세스에서 모듈을 처음 불러오는 데 걸린 시간 (배포/재시작 직후 첫 화면 지연 확인용).
+    프래그먼트만 다시 실행될 때는 갱신되지 않고, 전체 재실행 때 갱신됨.
+    """
+    report = import_report()
+    with st.sidebar.expander("⏱️ 모듈 로딩 시간"):
+        for name, seconds in report:
+            st.caption(f"{name}: {seconds * 1000:,.0f} ms" if seconds else f"{name}: 이미 로드됨")
+        st.caption(f"합계: {sum(seconds for _, seconds in report) * 1000:,.0f} ms")
+
+
+def perf_panel():
+    """
+    계산기별 마지막 재실행의 단계별 시간과 카운터. 사이드바에서 켰을 때만 표시.
+    import_time_panel 과 같이 전체 재실행 때 갱신됨 (프래그먼트만 다시 실행되면 다음 전체 재실행에 반영).
+    """
+    if not st.sidebar.toggle("성능 계측 보기", key="perf_panel"):
+        return
+    records = st.session_state.get("perf_traces", [])
+    with st.sidebar.expander("🩺 성능 계측", expanded=True):
+        if not records:
+            st.caption("아직 기록이 없습니다.")
+            return
+        pd = lazy_import("pandas")
+        for calculator, label in CALCULATOR_LABELS.items():
+            history = [r for r in records if r["calculator"] == calculator]
+            if not history:
+                continue
+            last = history[-1]
+            median_ms = statistics.median(r["total_ms"] for r in history)
+            st.markdown(f"**{label}**")
+            st.caption(f"마지막 {last['total_ms']:,.1f} ms · 최근 {len(history)}회 중앙값 {median_ms:,.1f} ms")
+            rows = [(perf.PHASES[name], last["phases_ms"][name]) for name in perf.PHASES if name in last["phases_ms"]]
+            rows.append(("기타", last["other_ms"]))
+            st.dataframe(pd.DataFrame(rows, columns=["단계", "ms"]).round(1), width="stretch", hide_index=True)
+            for name, value in last["counters"].items():
+                st.caption(f"{name}: {value:,}")
+        st.download_button(
+            "기록 내려받기 (JSON Lines)",
+            data="\n".join(json.dumps(r, ensure_ascii=False) for r in records) + "\n",
+            file_name="tot_perf.jsonl",
+            mime="application/x-ndjson",
+            on_click="ignore",
+            key="perf_download",
+        )
+
+
 def main():
     st.markdown(
         """
@@ -649,15 +1777,32 @@ def main():
         unsafe_allow_html=True,
     )
 
-    tab1, tab2, tab3 = st.tabs(["무기 효율 계산기", "3D 데미지 그래프", "특수 점수 계산기"])
+    # 선택된 탭의 계산기만 실행 (on_change="rerun" → tab.open 으로 활성 탭 확인)
+    tab1, tab2, tab3 = st.tabs(
+        ["무기 효율 계산기", "3D 데미지 그래프", "특수 점수 계산기"],
+        key="active_calculator",
+        on_change="rerun",
+    )
+
+    # 사이드바 값은 탭을 오가도 유지되도록 항상 그림
+    common = common_inputs()
+
+    # 각 계산기는 프래그먼트라서 자기 위젯이 바뀌면 그 계산기만 다시 실행됨
+    if tab1.open:
+        with tab1:
+            calculator_one(common)
+    if tab2.open:
+        with tab2:
+            calculator_two()
+    if tab3.open:
+        with tab3:
+            calculator_three()
 
-    with tab1:
-        calculator_one()
-    with tab2:
-        calculator_two()
-    with tab3:
-        calculator_three()
+    import_time_panel()
+    perf_panel()
 
 
 if __name__ == "__main__":
-    main()
+    # TOT_PROFILE 가 있으면 재실행 한 번을 cProfile 로 저장 (tot_calculator/perf.py 참고)
+    with perf.profile_once():
+        main()
@@ -0,0 +1,497 @@
+"""
+계산기 핫 패스 벤치마크.
+
+    python benchmarks/bench.py                          # 전체 실행, 표 출력
+    python benchmarks/bench.py --out before.json        # 결과를 JSON 으로 저장
+    python benchmarks/bench.py --compare before.json    # 이전 결과와 비교 (느려지면 종료 코드 1)
+    python benchmarks/bench.py --filter search --quick  # 이름에 search 가 들어간 것만, 반복 적게
+
+입력은 모두 고정값이라 실행마다 같은 계산을 함. 시간은 호출 1회당 초(반복 중 중앙값)로 기록.
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import time
+import timeit
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import numpy as np  # noqa: E402
+
+from tot_calculator import score  # noqa: E402
+from tot_calculator.damage import damage_batch, efficiency_percent, weak_multiplier  # noqa: E402
+from tot_calculator.score_index import ScoreIndex  # noqa: E402
+from tot_calculator.vectorized import compute_a_vec, compute_m_vec, search_best_k_n_vec  # noqa: E402
+
+BENCHMARKS = {}
+
+# 이전 결과 대비 이 비율 이상 느려지면 회귀로 판단
+DEFAULT_THRESHOLD = 0.15
+# 그래프를 반복해서 그릴 때 허용하는 RSS 증가량 (MB)
+DEFAULT_RENDER_GROWTH_MB = 10.0
+
+# 탐색 범위: (k_min, k_max, k_step)
+SEARCH_RANGES = {
+    "small": (3800, 50_000, 20),
+    "medium": (3800, 500_000, 10),
+    "2m": (0, 2_000_000, 1),
+}
+SEARCH_TARGET_X = 5000
+SEARCH_DAYS = 8
+
+
+def benchmark(name: str):
+    """
+    벤치마크 등록. 함수는 준비 작업을 하고 시간을 잴 인자 없는 함수를 반환해야 함.
+    """
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+# -----------------------------
+# 특수 점수 계산기 (k, n 탐색)
+# -----------------------------
+def _search_args(size: str, step: int | None = None):
+    k_min, k_max, k_step = SEARCH_RANGES[size]
+    return SEARCH_TARGET_X, k_min, k_max, step or k_step, SEARCH_DAYS
+
+
+@benchmark("search.python.small")
+def _():
+    return lambda: score.search_best_k_n(*_search_args("small"))
+
+
+@benchmark("search.python.medium")
+def _():
+    return lambda: score.search_best_k_n(*_search_args("medium", step=200))
+
+
+@benchmark("search.python.2m")
+def _():
+    # 2M 범위를 step 1로 순수 파이썬으로 돌리면 수 분이 걸려 step 1000 으로 측정
+    return lambda: score.search_best_k_n(*_search_args("2m", step=1000))
+
+
+@benchmark("search.vectorized.small")
+def _():
+    return lambda: search_best_k_n_vec(*_search_args("small"))
+
+
+@benchmark("search.vectorized.medium")
+def _():
+    return lambda: search_best_k_n_vec(*_search_args("medium"))
+
+
+@benchmark("search.vectorized.2m")
+def _():
+    return lambda: search_best_k_n_vec(*_search_args("2m"))
+
+
+@benchmark("search.interval.small")
+def _():
+    return lambda: score.search_best_k_n_exact(*_search_args("small"))
+
+
+@benchmark("search.interval.2m")
+def _():
+    return lambda: score.search_best_k_n_exact(*_search_args("2m"))
+
+
+@benchmark("search.index.build")
+def _():
+    return lambda: ScoreIndex.build(SEARCH_DAYS)
+
+
+@benchmark("search.index.lookup_2m")
+def _():
+    index = ScoreIndex.build(SEARCH_DAYS)
+    _, k_min, k_max, k_step, _ = _search_args("2m")
+    return lambda: index.lookup_points(SEARCH_TARGET_X, k_min, k_max, k_step)
+
+
+# -----------------------------
+# 점수 모델 a(P), m(k)
+# -----------------------------
+SCALAR_CALLS = 100_000
+
+
+@benchmark("model.compute_a.scalar_100k")
+def _():
+    values = range(0, SCALAR_CALLS * 15, 15)
+    return lambda: [score.compute_a(P) for P in values]
+
+
+@benchmark("model.compute_m.scalar_100k")
+def _():
+    values = range(0, SCALAR_CALLS * 10, 10)
+    return lambda: [score.compute_m(k) for k in values]
+
+
+@benchmark("model.compute_a.vec_1m")
+def _():
+    values = np.arange(0, 1_000_000 * 15, 15, dtype=np.int64)
+    return lambda: compute_a_vec(values)
+
+
+@benchmark("model.compute_m.vec_1m")
+def _():
+    values = np.arange(0, 1_000_000 * 10, 10, dtype=np.int64)
+    return lambda: compute_m_vec(values)
+
+
+# -----------------------------
+# 무기 효율 계산기 / 3D 그래프 계산
+# -----------------------------
+@benchmark("calc1.curve_200")
+def _():
+    atk_range = np.linspace(0, 8000, 200)
+    weak = weak_multiplier(1)
+
+    def run():
+        curve_A = damage_batch(atk_range, 5000.0, 30.0, 10.0, 120.0, 100.0, weak)
+        curve_B = damage_batch(atk_range, 5000.0, 50.0, 20.0, 145.0, 100.0, weak)
+        return efficiency_percent(curve_A, curve_B)
+    return run
+
+
+@benchmark("calc2.mesh_50x50")
+def _():
+    X, Y = np.meshgrid(np.linspace(0, 400, 50), np.linspace(0, 500, 50))
+    return lambda: damage_batch(1000, 1000, 50, X, Y, 100, 1.0)
+
+
+@benchmark("calc1.montecarlo_10m_hits")
+def _():
+    from tot_calculator.montecarlo import hit_profile, simulate_fights
+
+    profiles = {
+        "A": hit_profile(4155.0, 5000.0, 30.0, 10.0, 120.0, 100.0, 1.1),
+        "B": hit_profile(3900.0, 5000.0, 30.0, 10.0, 145.0, 100.0, 1.1),
+    }
+    return lambda: simulate_fights(profiles, 100_000, 100, 50.0, 30.0)
+
+
+@benchmark("calc1.rotation_10k_x_50")
+def _():
+    from tot_calculator.rotation import BUFF_KINDS, Buff, Skill, Timeline, rotation_damage
+
+    rng = np.random.default_rng(0)
+    turns, loadouts = 50, 10_000
+    timeline = Timeline(
+        turns,
+        skills=tuple(Skill(t, 100.0) for t in range(1, turns + 1)) + tuple(Skill(t, 350.0) for t in range(4, turns + 1, 4)),
+        buffs=tuple(
+            Buff(kind, start % turns + 1, 3, 20.0)
+            for start, kind in enumerate(list(BUFF_KINDS) * 5)
+        ),
+    )
+    columns = {
+        "atk_base": rng.uniform(1800, 2200, loadouts),
+        "atk_bonus": rng.uniform(60, 100, loadouts),
+        "E_def": rng.uniform(3000, 8000, loadouts),
+        "def_coef": rng.uniform(0, 60, loadouts),
+        "buff_x": rng.uniform(0, 50, loadouts),
+        "buff_y": rng.uniform(120, 180, loadouts),
+        "multiplier": rng.choice([1.0, 1.1, 1.2], loadouts),
+    }
+    return lambda: rotation_damage(columns, timeline)
+
+
+# -----------------------------
+# 그래프 렌더링 (matplotlib → PNG)
+# -----------------------------
+def _efficiency_png():
+    from tot_calculator import plots
+
+    atk_range = np.linspace(0, 8000, 200)
+    curve_A = damage_batch(atk_range, 5000.0, 30.0, 10.0, 120.0, 100.0)
+    curve_B = damage_batch(atk_range, 5000.0, 50.0, 20.0, 145.0, 100.0)
+    eff = efficiency_percent(curve_A, curve_B)
+    return lambda: plots.figure_to_png(plots.efficiency_figure(atk_range, curve_A, curve_B, eff, 4155.0, 3848.0))
+
+
+def _surface_args(resolution: int):
+    X, Y = np.meshgrid(np.linspace(0, 400, resolution), np.linspace(0, 500, resolution))
+    Z = damage_batch(1000, 1000, 50, X, Y, 100, 1.0)
+    z_val = float(damage_batch(1000, 1000, 50, 100, 100, 100, 1.0))
+    return X, Y, Z, 100, 100, z_val, 1000, 1000, 50
+
+
+@benchmark("render.efficiency")
+def _():
+    return _efficiency_png()
+
+
+@benchmark("render.surface_50")
+def _():
+    from tot_calculator import plots
+
+    args = _surface_args(50)
+    return lambda: plots.figure_to_png(plots.surface_figure(*args))
+
+
+@benchmark("render.surface_preview_15")
+def _():
+    from tot_calculator import plots
+
+    args = _surface_args(15)
+    return lambda: plots.figure_to_png(plots.surface_preview_figure(*args), dpi=80)
+
+
+@benchmark("render.weapon_heatmap")
+def _():
+    from tot_calculator import plots
+
+    values = np.random.default_rng(0).uniform(80, 100, (20, 50))
+    names = [f"#{i}" for i in range(1, 21)]
+    E_def = np.linspace(0, 10000, 50)
+    return lambda: plots.figure_to_png(plots.weapon_heatmap_figure(values, names, E_def, "bench"))
+
+
+# -----------------------------
+# 결과 표 (계산기 3 후보 10,000개)
+# -----------------------------
+TABLE_ROWS = 10_000
+TABLE_LABELS = {
+    "diff": "차이 |x - 모델|",
+    "k": "k (평균 활동 점수)",
+    "n": "n (1일 평균 횟수)",
+    "P": f"P = {SEARCH_DAYS}×k×n",
+    "a": "a(P)",
+    "m": "m(k)",
+    "x_hat": "모델 총 점수 (590+m+a)",
+}
+
+
+def _table_rows():
+    return search_best_k_n_vec(*_search_args("medium"), top_k=TABLE_ROWS)
+
+
+def _rows_to_pandas(rows):
+    # 이전 방식: 튜플 → 행 dict 목록 → DataFrame
+    import pandas as pd
+
+    return pd.DataFrame([
+        {
+            TABLE_LABELS["diff"]: diff,
+            TABLE_LABELS["k"]: k,
+            TABLE_LABELS["n"]: n,
+            TABLE_LABELS["P"]: P,
+            TABLE_LABELS["a"]: a,
+            TABLE_LABELS["m"]: m,
+            TABLE_LABELS["x_hat"]: x_hat,
+        }
+        for diff, k, n, x_hat, P, a, m in rows
+    ])
+
+
+def _rows_to_arrow(rows):
+    from tot_calculator.results import POINT_COLUMNS, ResultColumns
+
+    return ResultColumns.from_rows(rows, POINT_COLUMNS).to_arrow(TABLE_LABELS)
+
+
+@benchmark("table.rows_pandas_10k")
+def _():
+    rows = _table_rows()
+    return lambda: _rows_to_pandas(rows)
+
+
+@benchmark("table.columnar_arrow_10k")
+def _():
+    rows = _table_rows()
+    return lambda: _rows_to_arrow(rows)
+
+
+@benchmark("table.columnar_export_csv_10k")
+def _():
+    from tot_calculator.results import search_top_columns
+
+    args = _search_args("medium")
+    return lambda: search_top_columns(*args, top_k=TABLE_ROWS).to_csv(TABLE_LABELS)
+
+
+def table_peak_memory() -> dict:
+    """
+    후보 TABLE_ROWS개를 표로 만드는 동안 새로 할당한 메모리 최대값 (KB, tracemalloc 기준).
+    """
+    rows = _table_rows()
+    _rows_to_pandas(rows[:10])
+    _rows_to_arrow(rows[:10])
+    peaks = {}
+    for name, build in (("rows_pandas", _rows_to_pandas), ("columnar_arrow", _rows_to_arrow)):
+        gc.collect()
+        tracemalloc.start()
+        table = build(rows)
+        peaks[name] = tracemalloc.get_traced_memory()[1] / 1024
+        tracemalloc.stop()
+        del table
+    return peaks
+
+
+# -----------------------------
+# 실행 / 저장 / 비교
+# -----------------------------
+def _rss_mb() -> float:
+    """
+    현재 RSS (MB). /proc 이 없으면 최대 RSS 로 대신함.
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024 / 1024
+    except OSError:
+        scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024 / scale / 1024
+
+
+def render_memory_growth(renders: int = 50) -> float:
+    """
+    같은 그래프를 renders 번 그렸을 때 RSS 증가량 (MB). figure 가 해제되지 않으면 계속 늘어남.
+    앞선 벤치마크가 남긴 힙 상태에 영향받지 않도록 새 프로세스에서 측정함.
+    matplotlib 내부 캐시가 차는 동안(처음 수십 번)은 RSS 가 늘어나므로 같은 횟수만큼 먼저 그려 둠.
+    """
+    probe = subprocess.run(
+        [sys.executable, __file__, "--memory-probe", str(renders)], capture_output=True, text=True, check=True
+    )
+    return float(probe.stdout.strip())
+
+
+def _memory_probe(renders: int) -> None:
+    run = _efficiency_png()
+    for _ in range(renders):
+        run()
+    gc.collect()
+    before = _rss_mb()
+    for _ in range(renders):
+        run()
+    gc.collect()
+    print(_rss_mb() - before)
+
+
+def time_benchmark(setup, repeat: int) -> dict:
+    call = setup()
+    call()  # 캐시 / 지연 import 등 첫 호출 비용 제외
+    timer = timeit.Timer(call)
+    number, _ = timer.autorange()
+    samples = [t / number for t in timer.repeat(repeat=repeat, number=number)]
+    return {
+        "seconds": statistics.median(samples),
+        "min": min(samples),
+        "repeat": repeat,
+        "number": number,
+    }
+
+
+def _meta() -> dict:
+    import matplotlib
+
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "matplotlib": matplotlib.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def run_suite(names, repeat: int) -> dict:
+    results = {}
+    for name in names:
+        results[name] = time_benchmark(BENCHMARKS[name], repeat)
+        print(f"{name:32s} {results[name]['seconds'] * 1000:12.3f} ms", file=sys.stderr)
+    return results
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list[str]:
+    """
+    이전 결과 대비 (1 + threshold) 배 넘게 느려진 벤치마크 이름 목록. 표도 함께 출력함.
+    """
+    regressions = []
+    print(f"\n{'benchmark':32s} {'baseline ms':>12s} {'current ms':>12s} {'ratio':>7s}")
+    for name, result in current.items():
+        if name not in baseline:
+            continue
+        old, new = baseline[name]["seconds"], result["seconds"]
+        ratio = new / old if old else float("inf")
+        flag = ""
+        if ratio > 1 + threshold:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        print(f"{name:32s} {old * 1000:12.3f} {new * 1000:12.3f} {ratio:7.2f}{flag}")
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--filter", default="", help="이름에 이 문자열이 들어간 벤치마크만 실행")
+    parser.add_argument("--repeat", type=int, default=5, help="반복 횟수 (기본 5)")
+    parser.add_argument("--quick", action="store_true", help="반복 3회")
+    parser.add_argument("--out", help="결과 JSON 저장 경로")
+    parser.add_argument("--compare", help="비교할 이전 결과 JSON")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"회귀 판단 기준 (기본 {DEFAULT_THRESHOLD * 100:.0f}%% 느려짐)")
+    parser.add_argument("--max-render-growth-mb", type=float, default=DEFAULT_RENDER_GROWTH_MB,
+                        help="그래프 반복 렌더링 시 허용 RSS 증가량 (MB)")
+    parser.add_argument("--list", action="store_true", help="벤치마크 이름만 출력")
+    parser.add_argument("--memory-probe", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.memory_probe:
+        _memory_probe(args.memory_probe)
+        return 0
+
+    names = [name for name in BENCHMARKS if args.filter in name]
+    if args.list:
+        print("\n".join(names))
+        return 0
+
+    report = {"meta": _meta(), "results": run_suite(names, 3 if args.quick else args.repeat)}
+    failed = False
+    if "render" in args.filter or not args.filter:
+        growth = render_memory_growth()
+        report["memory"] = {"render_rss_growth_mb": growth}
+        print(f"{'render RSS growth':32s} {growth:12.1f} MB (limit {args.max_render_growth_mb:.0f} MB)", file=sys.stderr)
+        failed |= growth > args.max_render_growth_mb
+
+    if "table" in args.filter or not args.filter:
+        peaks = table_peak_memory()
+        report.setdefault("memory", {})["table_peak_kb"] = peaks
+        for name, kb in peaks.items():
+            print(f"{'table peak ' + name:32s} {kb:12.1f} KB", file=sys.stderr)
+
+    if args.out:
+        Path(args.out).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.out).write_text(json.dumps(report, indent=2, ensure_ascii=False))
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())
+        regressions = compare(report["results"], baseline["results"], args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)}개 벤치마크가 {args.threshold:.0%} 넘게 느려졌습니다: {', '.join(regressions)}")
+        failed |= bool(regressions)
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,224 @@
+"""
+배치 API 부하 테스트.
+
+    python benchmarks/loadtest.py                          # 서버를 새 프로세스로 띄워서 10초 측정
+    python benchmarks/loadtest.py --no-coalesce            # 모으기 창 0, 캐시 끔 (비교용)
+    python benchmarks/loadtest.py --url http://127.0.0.1:8765 --duration 30 --concurrency 32
+    python benchmarks/loadtest.py --out load.json          # 결과를 JSON 으로 저장
+
+클라이언트 스레드마다 keep-alive 연결 하나로 요청을 계속 보내고, 요청별 지연 시간으로
+초당 요청 수와 p50 / p90 / p99 를 계산함. 요청은 고정 seed 로 만든 작은 빌드 / 점수 풀에서
+뽑아서 요청끼리 항목이 겹치게 함 (봇 여러 개가 비슷한 조합을 묻는 상황).
+"""
+
+import argparse
+import http.client
+import json
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from urllib.parse import urlsplit
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# 요청 종류별 비율
+SCENARIOS = {"damage": 0.6, "compare": 0.25, "search": 0.15}
+BUILD_POOL = 2_000
+SCORE_POOL = 200
+
+
+def _build(rng: random.Random) -> dict:
+    return {
+        "atk": rng.randrange(2000, 8000, 5),
+        "E_def": rng.choice((3000, 5000, 8000)),
+        "def_coef": rng.choice((0, 30, 50)),
+        "buff_x": rng.choice((0, 10, 20)),
+        "buff_y": rng.choice((120, 145)),
+        "Weak_coef": rng.choice((0, 1, 2)),
+    }
+
+
+def _pair(rng: random.Random) -> dict:
+    def weapon():
+        return {
+            "wep_atk": rng.randrange(300, 420, 10),
+            "option": rng.choice(("공격 보너스 15%", "치명타 피해 25%")),
+            "def_ignore": rng.choice((0, 10, 20)),
+        }
+    return {"position": rng.choice(("센티널", "뱅가드", "서포트")), "A": weapon(), "B": weapon()}
+
+
+class Workload:
+    """
+    고정 seed 풀에서 요청 본문을 뽑음. 스레드마다 하나씩 만들어 씀.
+    """
+
+    def __init__(self, seed: int, batch: int):
+        pool = random.Random(0)
+        self.builds = [_build(pool) for _ in range(BUILD_POOL)]
+        self.pairs = [_pair(pool) for _ in range(BUILD_POOL)]
+        self.scores = [pool.randrange(1000, 20000) for _ in range(SCORE_POOL)]
+        self.rng = random.Random(seed)
+        self.batch = batch
+
+    def next(self) -> tuple[str, dict]:
+        kind = self.rng.choices(list(SCENARIOS), weights=list(SCENARIOS.values()))[0]
+        if kind == "damage":
+            return "/damage", {"builds": self.rng.sample(self.builds, self.batch)}
+        if kind == "compare":
+            return "/compare", {"pairs": self.rng.sample(self.pairs, self.batch)}
+        return "/search", {"queries": [{"x": self.rng.choice(self.scores), "days": self.rng.choice((7, 8)), "top": 5}]}
+
+
+def _client(host: str, port: int, seed: int, batch: int, deadline: float, samples: list, errors: list) -> None:
+    workload = Workload(seed, batch)
+    conn = http.client.HTTPConnection(host, port, timeout=60)
+    local = []
+    while time.perf_counter() < deadline:
+        path, body = workload.next()
+        # bytes 로 보내야 헤더와 본문이 한 번에 전송됨 (str 이면 따로 보내서 Nagle 지연이 생김)
+        data = json.dumps(body).encode("utf-8")
+        start = time.perf_counter()
+        try:
+            conn.request("POST", path, data, {"Content-Type": "application/json"})
+            response = conn.getresponse()
+            response.read()
+            if response.status != 200:
+                errors.append(f"{path}: HTTP {response.status}")
+        except (OSError, http.client.HTTPException) as e:
+            errors.append(f"{path}: {e}")
+            conn.close()
+            conn = http.client.HTTPConnection(host, port, timeout=60)
+            continue
+        local.append((path, time.perf_counter() - start))
+    conn.close()
+    samples.extend(local)
+
+
+def _percentile(values: list, q: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q / 100 * len(values)))]
+
+
+def summarize(samples: list, seconds: float) -> dict:
+    def stats(latencies):
+        return {
+            "requests": len(latencies),
+            "rps": len(latencies) / seconds,
+            "p50_ms": statistics.median(latencies) * 1000,
+            "p90_ms": _percentile(latencies, 90) * 1000,
+            "p99_ms": _percentile(latencies, 99) * 1000,
+        }
+    by_path = {}
+    for path, latency in samples:
+        by_path.setdefault(path, []).append(latency)
+    return {
+        "total": stats([latency for _, latency in samples]),
+        "endpoints": {path: stats(latencies) for path, latencies in sorted(by_path.items())},
+    }
+
+
+def _get_json(host: str, port: int, path: str) -> dict:
+    conn = http.client.HTTPConnection(host, port, timeout=5)
+    try:
+        conn.request("GET", path)
+        return json.loads(conn.getresponse().read())
+    finally:
+        conn.close()
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(port: int, window_ms: float, cache_entries: int) -> subprocess.Popen:
+    """
+    새 프로세스에서 serve 를 띄우고 /health 가 응답할 때까지 기다림.
+    (같은 프로세스면 클라이언트 스레드와 GIL 을 나눠 써서 서버 처리량이 낮게 나옴)
+    """
+    server = subprocess.Popen(
+        [sys.executable, "-m", "tot_calculator", "serve", "--port", str(port),
+         "--window-ms", str(window_ms), "--cache-entries", str(cache_entries)],
+        cwd=ROOT, stderr=subprocess.DEVNULL,
+    )
+    for _ in range(100):
+        try:
+            _get_json("127.0.0.1", port, "/health")
+            return server
+        except OSError:
+            time.sleep(0.1)
+    server.kill()
+    raise RuntimeError("서버가 시작되지 않았습니다.")
+
+
+def run(host: str, port: int, concurrency: int, duration: float, batch: int) -> dict:
+    samples, errors = [], []
+    deadline = time.perf_counter() + duration
+    threads = [
+        threading.Thread(target=_client, args=(host, port, seed, batch, deadline, samples, errors))
+        for seed in range(concurrency)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    seconds = time.perf_counter() - start
+    report = summarize(samples, seconds)
+    report["errors"] = len(errors)
+    report["error_samples"] = errors[:5]
+    report["server"] = _get_json(host, port, "/stats")
+    return report
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="이미 실행 중인 서버 주소 (없으면 새로 띄움)")
+    parser.add_argument("--concurrency", type=int, default=16, help="동시 클라이언트 수 (기본 16)")
+    parser.add_argument("--duration", type=float, default=10.0, help="측정 시간 (초, 기본 10)")
+    parser.add_argument("--batch", type=int, default=32, help="damage / compare 요청 하나의 항목 수 (기본 32)")
+    parser.add_argument("--window-ms", type=float, default=1.0, help="새로 띄우는 서버의 모으기 창 (ms)")
+    parser.add_argument("--no-coalesce", action="store_true", help="새로 띄우는 서버의 모으기 창 0, 캐시 끔")
+    parser.add_argument("--out", help="결과 JSON 저장 경로")
+    args = parser.parse_args(argv)
+
+    server = None
+    if args.url:
+        parts = urlsplit(args.url)
+        host, port = parts.hostname, parts.port or 80
+    else:
+        host, port = "127.0.0.1", _free_port()
+        window_ms, cache_entries = (0.0, 0) if args.no_coalesce else (args.window_ms, 100_000)
+        server = start_server(port, window_ms, cache_entries)
+    try:
+        report = run(host, port, args.concurrency, args.duration, args.batch)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    print(f"{'endpoint':10s} {'requests':>9s} {'req/s':>9s} {'p50 ms':>8s} {'p90 ms':>8s} {'p99 ms':>8s}")
+    for name, stats in [("total", report["total"]), *report["endpoints"].items()]:
+        print(f"{name:10s} {stats['requests']:9d} {stats['rps']:9.1f} "
+              f"{stats['p50_ms']:8.2f} {stats['p90_ms']:8.2f} {stats['p99_ms']:8.2f}")
+    for name, stats in report["server"]["endpoints"].items():
+        print(f"{name:10s} items {stats['items']:,} · cache hits {stats['cache_hits']:,} · "
+              f"coalesced {stats['coalesced']:,} · evaluated {stats['evaluated']:,} in {stats['batches']:,} batches")
+    if report["errors"]:
+        print(f"errors: {report['errors']} ({'; '.join(report['error_samples'])})")
+
+    if args.out:
+        Path(args.out).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.out).write_text(json.dumps(report, indent=2, ensure_ascii=False))
+    return 1 if report["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+"""
+app.py 를 AppTest 로 실행해서 입력 오류가 예외 대신 화면의 오류 메시지로 나오는지 확인.
+"""
+
+import re
+import time
+from pathlib import Path
+
+import pytest
+
+APP_PATH = Path(__file__).resolve().parent.parent / "app.py"
+
+AppTest = pytest.importorskip("streamlit.testing.v1").AppTest
+
+
+@pytest.fixture
+def series_app():
+    at = AppTest.from_file(str(APP_PATH), default_timeout=120)
+    at.session_state["active_calculator"] = "특수 점수 계산기"
+    at.run()
+    at.radio(key="score_input_mode").set_value("일차별 점수 (함께 추론)").run()
+    assert not at.exception
+    return at
+
+
+@pytest.mark.parametrize(
+    "text, message",
+    [
+        ("0, 1939\n1, 5939", "1번째 줄의 일차는 1 ~ 365 사이여야 합니다"),
+        ("1939\n366, 5939", "2번째 줄의 일차는 1 ~ 365 사이여야 합니다"),
+        ("3, 9939\nabc", "2번째 줄을 읽을 수 없습니다"),
+        ("1939\n99999999999", "2번째 줄의 총 점수는 5,000,000 이하여야 합니다"),
+    ],
+)
+def test_series_rejects_bad_lines(series_app, text, message):
+    series_app.text_area(key="series_text").set_value(text).run()
+    assert not series_app.exception
+    assert any(message in e.value for e in series_app.error)
+
+
+def test_series_accepts_explicit_days(series_app):
+    series_app.text_area(key="series_text").set_value("3, 9939\n4: 10539\n11200").run()
+    assert not series_app.exception
+    assert not series_app.error
+    assert series_app.dataframe
+
+
+def number_input(at, label: str):
+    return next(widget for widget in at.number_input if widget.label == label)
+
+
+def test_exact_export_respects_time_budget():
+    """
+    정확 모드 내보내기도 탐색 예산 안에서 멈춰야 함. (k 0 ~ 2,000,000 에서 100,000개는 예산 없이 수 초 걸림)
+    """
+    at = AppTest.from_file(str(APP_PATH), default_timeout=120)
+    at.session_state["active_calculator"] = "특수 점수 계산기"
+    at.run()
+    at.radio(key="score_search_mode").set_value("정확 (구간 해석)").run()
+    # k 최대값 입력은 최소값에 따라 다시 만들어지므로 최소값을 먼저 바꿈
+    number_input(at, "활동치 k 최소값").set_value(0).run()
+    number_input(at, "활동치 k 최대값").set_value(2_000_000)
+    number_input(at, "활동치 k 탐색 간격 (step, 너무 작게 하면 계산량 증가)").set_value(1)
+    number_input(at, "최대 탐색 시간 (초)").set_value(1.0).run()
+    at.button[0].click().run()
+    at.number_input(key="score_export_rows").set_value(100_000).run()
+    assert not at.exception
+
+    start = time.perf_counter()
+    at.button(key="score_export_build").click().run()
+    elapsed = time.perf_counter() - start
+    assert not at.exception
+    assert any("예산을 넘어 중단" in e.value for e in at.error)
+    assert elapsed < 4.0
+
+
+SURFACE_COMPONENT = APP_PATH.parent / "components" / "surface"
+
+
+def test_surface_component_has_no_remote_scripts():
+    """
+    오프라인 / CSP 배포에서도 그려지도록 컴포넌트는 외부 주소에서 스크립트를 불러오지 않아야 함.
+    """
+    html = (SURFACE_COMPONENT / "index.html").read_text(encoding="utf-8")
+    sources = re.findall(r'<script[^>]*\bsrc="([^"]+)"', html)
+    assert sources
+    for src in sources:
+        assert "://" not in src and not src.startswith("//")
+        assert (SURFACE_COMPONENT / src).is_file()
+
+
+@pytest.fixture
+def surface_app():
+    at = AppTest.from_file(str(APP_PATH), default_timeout=120)
+    at.session_state["active_calculator"] = "3D 데미지 그래프"
+    at.run()
+    at.radio(key="surface_backend").set_value("브라우저 (WebGL)").run()
+    assert not at.exception
+    return at
+
+
+def test_webgl_backend_renders_component(surface_app):
+    assert len(surface_app.get("component_instance")) == 1
+    assert not surface_app.get("image")
+    assert not surface_app.warning
+
+
+@pytest.mark.parametrize("reason", ["plotly", "webgl"])
+def test_webgl_unavailable_falls_back_to_png(surface_app, reason):
+    # 컴포넌트가 plotly.js / WebGL 을 쓸 수 없다고 알려 온 경우
+    surface_app.session_state["surface_chart"] = {"unavailable": reason}
+    surface_app.run()
+    for _ in range(2):  # 컴포넌트가 사라진 뒤의 재실행에서도 계속 이미지로 그림
+        assert not surface_app.exception
+        assert surface_app.warning and "서버에서 그린 이미지로 표시합니다" in surface_app.warning[0].value
+        assert surface_app.get("image")
+        assert not surface_app.get("component_instance")
+        next(s for s in surface_app.slider if s.label == "공격력").set_value(2000).run()
@@ -0,0 +1,150 @@
+"""
+로드아웃 파일 일괄 평가 테스트. 청크 단위 배열 계산 결과가 행마다 스칼라 compute_z 로 계산한 값과 같은지 확인.
+"""
+
+import io
+import math
+import random
+
+import pandas as pd
+import pytest
+
+from tot_calculator.bulk import OUTPUT_COLUMNS, WEAPON_COLUMNS, evaluate_file
+from tot_calculator.damage import compute_z
+from tot_calculator.defaults import DEFAULT_COMMON
+from tot_calculator.weapons import DOLL_POSITIONS, WEAPON_OPTIONS
+
+
+def scalar_damage(common: dict, position: str, weapon: dict) -> float:
+    """
+    행 하나, 무기 하나의 데미지를 예전 계산기 1 처럼 스칼라로 계산.
+    """
+    atk_per, ct_per = DOLL_POSITIONS[position]
+    wep_ak, wep_ct = WEAPON_OPTIONS[weapon["option"]]
+    atk = (common["atk_origin"] + weapon["wep_atk"]) * (1 + (common["atk_bonus"] + atk_per + wep_ak) * 0.01)
+    total_def = min(weapon["def_ignore"] + common["def_coef"], 100.0)
+    return compute_z(
+        common["buff_x"] + weapon["dmg_buff"],
+        common["buff_y"] + wep_ct + ct_per,
+        atk,
+        common["E_def"],
+        total_def,
+        common["Weak_coef"],
+        common["sk_coef"],
+    )
+
+
+def random_roster(seed: int, count: int) -> pd.DataFrame:
+    """
+    모든 입력 열과 그대로 옮겨 쓰는 name 열. 일부 칸은 비워서 기본값으로 채워지게 함.
+    """
+    rng = random.Random(seed)
+    rows = []
+    for i in range(count):
+        row = {
+            "name": f"build-{i}",
+            "E_def": rng.uniform(0, 15_000),
+            "atk_origin": rng.uniform(800, 3_000),
+            "atk_bonus": rng.uniform(0, 100),
+            "def_coef": rng.uniform(0, 80),
+            "Weak_coef": rng.choice((0, 1, 2)),
+            "sk_coef": rng.uniform(50, 500),
+            "buff_x": rng.uniform(0, 150),
+            "buff_y": rng.uniform(100, 300),
+            "position": rng.choice(list(DOLL_POSITIONS)),
+        }
+        for side in ("A", "B"):
+            row[f"wep_atk_{side}"] = rng.uniform(200, 600)
+            row[f"option_{side}"] = rng.choice(list(WEAPON_OPTIONS))
+            row[f"def_ignore_{side}"] = rng.uniform(0, 40)
+            row[f"dmg_buff_{side}"] = rng.uniform(0, 30)
+        for name in rng.sample(sorted(row), 2):
+            if name != "name":
+                row[name] = None
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+ROSTER = random_roster(seed=5, count=300)
+
+
+def expected_row(row: dict, defaults: dict) -> dict:
+    def value(name, default):
+        v = row.get(name)
+        return default if v is None or (isinstance(v, float) and math.isnan(v)) else v
+
+    common = {name: value(name, default) for name, default in defaults.items()}
+    position = value("position", "센티널")
+    out = {}
+    for side in ("A", "B"):
+        weapon = {name: value(f"{name}_{side}", default) for name, default in WEAPON_COLUMNS.items()}
+        out[f"damage_{side}"] = scalar_damage(common, position, weapon)
+    return out
+
+
+def run_csv(frame: pd.DataFrame, defaults: dict, chunk_rows: int):
+    source = io.BytesIO(frame.to_csv(index=False).encode("utf-8"))
+    sink = io.BytesIO()
+    report = evaluate_file(source, sink, defaults, chunk_rows=chunk_rows)
+    return report, pd.read_csv(io.BytesIO(sink.getvalue()))
+
+
+def test_csv_round_trip_matches_scalar_rows():
+    report, out = run_csv(ROSTER, DEFAULT_COMMON, chunk_rows=37)
+    assert (report.rows, report.chunks) == (len(ROSTER), math.ceil(len(ROSTER) / 37))
+    assert list(out.columns) == [*ROSTER.columns, *OUTPUT_COLUMNS]
+    assert out["name"].tolist() == ROSTER["name"].tolist()
+    for row, got in zip(ROSTER.to_dict("records"), out.to_dict("records")):
+        expected = expected_row(row, DEFAULT_COMMON)
+        assert got["damage_A"] == pytest.approx(expected["damage_A"], rel=1e-12)
+        assert got["damage_B"] == pytest.approx(expected["damage_B"], rel=1e-12)
+        assert got["diff"] == pytest.approx(got["damage_B"] - got["damage_A"], rel=1e-9, abs=1e-9)
+        assert got["better"] == ("B" if got["diff"] > 0 else "A" if got["diff"] < 0 else "=")
+
+
+@pytest.mark.parametrize("chunk_rows", [1, 7, 64])
+def test_result_does_not_depend_on_chunk_rows(chunk_rows):
+    # 1행 청크는 청크마다 pandas / pyarrow 변환 비용이 있어서 앞 60행만 비교
+    frame = ROSTER.head(60) if chunk_rows == 1 else ROSTER
+    _, whole = run_csv(frame, DEFAULT_COMMON, chunk_rows=10_000)
+    _, chunked = run_csv(frame, DEFAULT_COMMON, chunk_rows=chunk_rows)
+    pd.testing.assert_frame_equal(chunked, whole)
+
+
+def test_missing_columns_use_defaults():
+    defaults = dict(DEFAULT_COMMON, E_def=8000.0, buff_x=25.0)
+    frame = pd.DataFrame({"atk_origin": [1661.0, 2000.0, None]})
+    _, out = run_csv(frame, defaults, chunk_rows=2)
+    for atk_origin, got in zip((1661.0, 2000.0, defaults["atk_origin"]), out.to_dict("records")):
+        expected = expected_row({"atk_origin": atk_origin}, defaults)
+        assert got["damage_A"] == pytest.approx(expected["damage_A"], rel=1e-12)
+        # 무기 열이 모두 기본값이라 A / B 가 같음
+        assert got["damage_B"] == got["damage_A"]
+        assert got["better"] == "="
+
+
+@pytest.mark.parametrize(
+    "column, value, message",
+    [
+        ("position", "없는 포지션", "알 수 없는 포지션"),
+        ("option_A", "없는 옵션", "알 수 없는 무기 옵션"),
+        ("option_B", "없는 옵션", "알 수 없는 무기 옵션"),
+    ],
+)
+def test_unknown_names_raise(column, value, message):
+    frame = ROSTER.head(20).copy()
+    frame.loc[15, column] = value
+    with pytest.raises(ValueError, match=message):
+        run_csv(frame, DEFAULT_COMMON, chunk_rows=8)
+
+
+def test_parquet_round_trip():
+    pq = pytest.importorskip("pyarrow.parquet")
+    source, sink = io.BytesIO(), io.BytesIO()
+    ROSTER.to_parquet(source, index=False)
+    source.seek(0)
+    evaluate_file(source, sink, DEFAULT_COMMON, in_format="parquet", out_format="parquet", chunk_rows=50)
+    out = pq.read_table(io.BytesIO(sink.getvalue())).to_pandas()
+    _, csv_out = run_csv(ROSTER, DEFAULT_COMMON, chunk_rows=50)
+    pd.testing.assert_series_equal(out["damage_A"], csv_out["damage_A"], rtol=1e-12)
+    assert out["better"].tolist() == csv_out["better"].tolist()
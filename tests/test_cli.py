@@ -0,0 +1,69 @@
+"""
+명령줄 진입점 테스트. 잘못된 입력은 트레이스백 대신 메시지와 종료 코드 2 로 끝나야 함.
+"""
+
+import json
+
+import pytest
+
+from tot_calculator.cli import main
+from tot_calculator.damage import damage
+
+
+def test_damage_prints_scalar_formula(capsys):
+    assert main(["damage", "--atk", "4155", "--def", "5000", "--def-ignore", "30", "--json"]) == 0
+    assert json.loads(capsys.readouterr().out)["damage"] == pytest.approx(damage(4155, 5000, 30, 0, 120, 100))
+
+
+@pytest.mark.parametrize(
+    "argv",
+    [
+        ["damage", "--atk", "0", "--def", "0"],
+        ["damage", "--atk", "0", "--def", "5000", "--def-ignore", "100"],
+    ],
+)
+def test_damage_zero_denominator_exits_2(capsys, argv):
+    assert main(argv) == 2
+    captured = capsys.readouterr()
+    assert not captured.out
+    assert "데미지를 계산할 수 없습니다" in captured.err
+
+
+def test_search_over_budget_exits_2(capsys):
+    argv = ["search", "--x", "5000", "--engine", "vectorized", "--k-min", "0", "--k-max", "5000000",
+            "--k-step", "1", "--time-budget", "0"]
+    assert main(argv) == 2
+    assert "탐색을 중단했습니다" in capsys.readouterr().err
+
+
+def test_series_bad_first_day_exits_2(capsys):
+    assert main(["series", "--first-day", "0", "1000", "2000"]) == 2
+    captured = capsys.readouterr()
+    assert not captured.out
+    assert "일차는 1 이상이어야 합니다" in captured.err
+
+
+@pytest.mark.parametrize(
+    "rows, message",
+    [
+        ("atk_origin,position\n1661,센티널\n1700,없는 포지션\n", "알 수 없는 포지션: 없는 포지션"),
+        ("atk_origin,option_A\n1661,없는 옵션\n", "알 수 없는 무기 옵션: 없는 옵션"),
+    ],
+)
+def test_bulk_failure_keeps_existing_output(tmp_path, capsys, rows, message):
+    source = tmp_path / "roster.csv"
+    source.write_text(rows, encoding="utf-8")
+    output = tmp_path / "result.csv"
+    output.write_text("이전 결과\n", encoding="utf-8")
+
+    # 청크를 1행으로 잘라서 잘못된 행이 첫 청크를 쓴 뒤에 나오게 함
+    assert main(["bulk", str(source), str(output), "--chunk-rows", "1"]) == 2
+    assert message in capsys.readouterr().err
+    assert output.read_text(encoding="utf-8") == "이전 결과\n"
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["result.csv", "roster.csv"]
+
+
+def test_bulk_missing_input_exits_2(tmp_path, capsys):
+    assert main(["bulk", str(tmp_path / "none.csv"), str(tmp_path / "out.csv")]) == 2
+    assert "일괄 평가 실패" in capsys.readouterr().err
+    assert not (tmp_path / "out.csv").exists()
@@ -0,0 +1,155 @@
+"""
+무기 A / B 손익분기점 해석 풀이가 스칼라 compute_z 로 직접 계산한 데미지와 맞는지 확인.
+
+- break_even 이 돌려준 점에서 두 데미지가 같아야 하고
+- 촘촘한 스칼라 격자에서 데미지 차이의 부호가 바뀌는 구간마다 교차점이 정확히 하나씩 있어야 함
+"""
+
+import math
+import random
+
+import numpy as np
+import pytest
+
+from tot_calculator.crossover import (
+    VARIABLES,
+    adaptive_samples,
+    break_even,
+    efficiency_asymptote,
+    efficiency_extrema,
+    weapon_terms,
+)
+from tot_calculator.damage import compute_z, weak_multiplier
+
+SK_COEF = 250.0
+WEAK_COEF = 1
+E_DEF = 5000.0
+DEF_COEF = 30.0
+# 변수별 확인 범위 (공격력 0 은 두 데미지가 모두 0 이라 부호가 없으므로 뺌)
+RANGES = {"atk": (100.0, 20_000.0), "E_def": (0.0, 30_000.0), "def_coef": (0.0, 100.0)}
+SWEEP_POINTS = 4001
+
+
+def random_pairs(seed: int, count: int):
+    """
+    공격력이 높은 무기와 피증 / 치피 / 방어 무시가 높은 무기를 섞어서 교차가 자주 생기게 함.
+    """
+    rng = random.Random(seed)
+
+    def weapon():
+        return {
+            "atk": rng.uniform(2_000, 9_000),
+            "def_ignore": rng.uniform(0, 90),
+            "buff_x": rng.uniform(0, 120),
+            "buff_y": rng.uniform(100, 300),
+        }
+    return [(weapon(), weapon()) for _ in range(count)]
+
+
+PAIRS = random_pairs(seed=11, count=60)
+
+
+def terms(w):
+    return weapon_terms(w["atk"], w["def_ignore"], w["buff_x"], w["buff_y"], SK_COEF, weak_multiplier(WEAK_COEF))
+
+
+def scalar_damage(w, variable: str, t: float) -> float:
+    atk = t if variable == "atk" else w["atk"]
+    E_def = t if variable == "E_def" else E_DEF
+    def_coef = t if variable == "def_coef" else DEF_COEF
+    total_def = min(w["def_ignore"] + def_coef, 100.0)
+    return compute_z(w["buff_x"], w["buff_y"], atk, E_def, total_def, WEAK_COEF, SK_COEF)
+
+
+def sweep_sign_changes(A, B, variable: str):
+    """
+    촘촘한 격자에서 데미지 B - A 의 부호가 바뀌는 (t_i, t_i+1) 목록.
+    """
+    lo, hi = RANGES[variable]
+    ts = np.linspace(lo, hi, SWEEP_POINTS)
+    signs = [math.copysign(1, scalar_damage(B, variable, t) - scalar_damage(A, variable, t)) for t in ts]
+    return [(ts[i], ts[i + 1]) for i in range(len(ts) - 1) if signs[i] != signs[i + 1]]
+
+
+@pytest.mark.parametrize("variable", VARIABLES)
+def test_break_even_points_equalise_damage(variable):
+    lo, hi = RANGES[variable]
+    found = 0
+    for A, B in PAIRS:
+        for t_lo, t_hi in break_even(terms(A), terms(B), variable, E_DEF, DEF_COEF, lo, hi):
+            assert t_lo == t_hi
+            assert scalar_damage(A, variable, t_lo) == pytest.approx(scalar_damage(B, variable, t_lo), rel=1e-9)
+            found += 1
+    assert found >= 5
+
+
+@pytest.mark.parametrize("variable", VARIABLES)
+def test_break_even_matches_scalar_sweep(variable):
+    lo, hi = RANGES[variable]
+    for A, B in PAIRS:
+        crossings = [t for t, _ in break_even(terms(A), terms(B), variable, E_DEF, DEF_COEF, lo, hi)]
+        brackets = sweep_sign_changes(A, B, variable)
+        assert len(crossings) == len(brackets)
+        for t, (b_lo, b_hi) in zip(crossings, brackets):
+            assert b_lo <= t <= b_hi
+
+
+def test_no_crossover_returns_nothing():
+    A = {"atk": 4000.0, "def_ignore": 10.0, "buff_x": 20.0, "buff_y": 150.0}
+    # 모든 항목이 A 이상이라 어디서든 B 가 더 셈
+    better = [dict(A, buff_x=40.0), dict(A, atk=4500.0, def_ignore=20.0, buff_y=180.0)]
+    for B in better:
+        for variable in VARIABLES:
+            lo, hi = RANGES[variable]
+            assert break_even(terms(A), terms(B), variable, E_DEF, DEF_COEF, lo, hi) == []
+            assert sweep_sign_changes(A, B, variable) == []
+
+
+@pytest.mark.parametrize("variable", VARIABLES)
+def test_efficiency_extrema_match_scalar_sweep(variable):
+    lo, hi = RANGES[variable]
+    for A, B in PAIRS[:20]:
+        # 방어 무시 합이 100% 가 되는 지점(구간 경계)도 격자에 넣음
+        edges = [100.0 - w["def_ignore"] for w in (A, B)] if variable == "def_coef" else []
+        ts = np.union1d(np.linspace(lo, hi, SWEEP_POINTS), edges)
+        eff = [(scalar_damage(B, variable, t) / scalar_damage(A, variable, t) - 1) * 100 for t in ts]
+        (t_min, eff_min), (t_max, eff_max) = efficiency_extrema(terms(A), terms(B), variable, E_DEF, DEF_COEF, lo, hi)
+        assert eff_min == pytest.approx(min(eff), rel=1e-9, abs=1e-9)
+        assert eff_max == pytest.approx(max(eff), rel=1e-9, abs=1e-9)
+        for t, value in ((t_min, eff_min), (t_max, eff_max)):
+            actual = (scalar_damage(B, variable, t) / scalar_damage(A, variable, t) - 1) * 100
+            assert value == pytest.approx(actual, rel=1e-9, abs=1e-9)
+
+
+@pytest.mark.parametrize("variable", ("atk", "E_def"))
+def test_efficiency_asymptote_matches_large_values(variable):
+    def efficiency(A, B, t):
+        return (scalar_damage(B, variable, t) / scalar_damage(A, variable, t) - 1) * 100
+
+    for A, B in PAIRS[:20]:
+        far = 1e12
+        limit = efficiency_asymptote(terms(A), terms(B), variable, E_DEF, DEF_COEF)
+        if math.isinf(limit):
+            # B 만 방어 무시 100% 라 방어력이 커질수록 A 데미지만 0 으로 감
+            assert variable == "E_def" and B["def_ignore"] + DEF_COEF >= 100
+            assert efficiency(A, B, far) > 5 * efficiency(A, B, far / 10) > 0
+        else:
+            assert limit == pytest.approx(efficiency(A, B, far), abs=1e-4)
+
+
+def test_efficiency_asymptote_rejects_def_coef():
+    A, B = PAIRS[0]
+    with pytest.raises(ValueError):
+        efficiency_asymptote(terms(A), terms(B), "def_coef", E_DEF, DEF_COEF)
+
+
+def test_adaptive_samples_include_features():
+    samples = adaptive_samples(0, 8000, [1234.5, 7000.0, 9000.0], n=200)
+    assert samples.size <= 200
+    assert np.all(np.diff(samples) > 0)
+    assert samples[0] == 0 and samples[-1] == 8000
+    assert {1234.5, 7000.0} <= set(samples.tolist())
+    # 교차점 양옆은 균등 간격(약 80)보다 훨씬 촘촘해야 함
+    near = samples[np.abs(samples - 1234.5) < 80]
+    assert near.size > 10
+    np.testing.assert_array_equal(adaptive_samples(0, 8000, [], n=50), np.linspace(0, 8000, 50))
@@ -0,0 +1,95 @@
+"""
+데미지 커널이 계산기 1 / 계산기 2 에 있던 예전 compute_z 와 같은 값을 내는지 확인.
+"""
+
+import random
+
+import numpy as np
+import pytest
+
+from tot_calculator.damage import compute_z, damage, damage_batch, weak_multiplier
+
+
+def legacy_compute_z_one(buff_x, buff_y, atk, E_def, def_coef, Weak_coef, sk_coef):
+    # 계산기 1 의 예전 중첩 함수 (약점 개수를 받음)
+    numer = atk ** 2
+    denomi = atk + E_def * (1 - def_coef * 0.01)
+    return (
+        (numer / denomi)
+        * (1 + buff_x * 0.01)
+        * (1 + Weak_coef * 0.1)
+        * (sk_coef * 0.01)
+        * (buff_y * 0.01)
+    )
+
+
+def legacy_compute_z_two(x, y, atk, defense, w, skill, multiplier):
+    # 계산기 2 의 예전 중첩 함수 (약점 계수를 받음)
+    numerator = atk ** 2
+    denominator = atk + defense * (1 - w * 0.01)
+    return (numerator / denominator) * (1 + x * 0.01) * multiplier * (skill * 0.01) * (y * 0.01)
+
+
+def random_builds(seed: int, count: int):
+    rng = random.Random(seed)
+    return [
+        {
+            "atk": rng.uniform(500, 20_000),
+            "E_def": rng.uniform(0, 15_000),
+            "def_coef": rng.uniform(0, 100),
+            "buff_x": rng.uniform(0, 300),
+            "buff_y": rng.uniform(100, 400),
+            "Weak_coef": rng.choice((0, 1, 2)),
+            "sk_coef": rng.uniform(10, 1_000),
+        }
+        for _ in range(count)
+    ]
+
+
+BUILDS = random_builds(seed=7, count=200)
+
+
+def test_compute_z_matches_calculator_one():
+    for b in BUILDS:
+        args = (b["buff_x"], b["buff_y"], b["atk"], b["E_def"], b["def_coef"], b["Weak_coef"], b["sk_coef"])
+        assert compute_z(*args) == pytest.approx(legacy_compute_z_one(*args), rel=1e-12)
+
+
+def test_damage_matches_calculator_two():
+    for b in BUILDS:
+        multiplier = weak_multiplier(b["Weak_coef"])
+        expected = legacy_compute_z_two(
+            b["buff_x"], b["buff_y"], b["atk"], b["E_def"], b["def_coef"], b["sk_coef"], multiplier
+        )
+        actual = damage(b["atk"], b["E_def"], b["def_coef"], b["buff_x"], b["buff_y"], b["sk_coef"], multiplier)
+        assert actual == pytest.approx(expected, rel=1e-12)
+
+
+def test_damage_batch_matches_scalar_loop():
+    columns = {name: np.array([b[name] for b in BUILDS]) for name in BUILDS[0]}
+    batch = damage_batch(
+        columns["atk"], columns["E_def"], columns["def_coef"], columns["buff_x"], columns["buff_y"],
+        columns["sk_coef"], weak_multiplier(columns["Weak_coef"]),
+    )
+    expected = [
+        legacy_compute_z_one(b["buff_x"], b["buff_y"], b["atk"], b["E_def"], b["def_coef"], b["Weak_coef"], b["sk_coef"])
+        for b in BUILDS
+    ]
+    np.testing.assert_allclose(batch, expected, rtol=1e-12)
+
+
+def test_damage_batch_broadcasts_like_meshgrid():
+    # 계산기 2 의 3D 그래프처럼 (피증 × 치피) 격자를 한 번에 계산
+    x = np.linspace(0, 200, 21)
+    y = np.linspace(100, 300, 11)
+    X, Y = np.meshgrid(x, y)
+    grid = damage_batch(5000, 3000, 30, X, Y, 250, 1.1)
+    expected = [[legacy_compute_z_two(xv, yv, 5000, 3000, 30, 250, 1.1) for xv in x] for yv in y]
+    assert grid.shape == X.shape
+    np.testing.assert_allclose(grid, expected, rtol=1e-12)
+
+
+def test_damage_batch_zero_denominator_is_not_an_error():
+    out = damage_batch([0.0, 100.0], 0.0, 0.0, 0.0, 100.0, 100.0)
+    assert np.isnan(out[0])
+    assert np.isfinite(out[1])
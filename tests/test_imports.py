@@ -0,0 +1,68 @@
+"""
+lazy_import 테스트. 임시 모듈로 처음 부를 때까지 import 하지 않는지, 처음 import 한 시간만 기록하는지 확인.
+"""
+
+import sys
+import textwrap
+
+import pytest
+
+from tot_calculator import imports
+
+
+@pytest.fixture
+def slow_module(tmp_path, monkeypatch):
+    """
+    import 할 때 0.05초 걸리고 import 횟수를 파일에 남기는 임시 모듈 이름.
+    """
+    name = f"tot_slow_module_{tmp_path.name}"
+    log = tmp_path / "imported.txt"
+    (tmp_path / f"{name}.py").write_text(textwrap.dedent(f"""
+        import time
+        time.sleep(0.05)
+        with open({str(log)!r}, "a") as f:
+            f.write("x")
+        VALUE = 42
+    """))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setattr(imports, "IMPORT_TIMES", {})
+    yield name, log
+    sys.modules.pop(name, None)
+
+
+def test_lazy_import_defers_and_records_once(slow_module):
+    name, log = slow_module
+    assert name not in sys.modules and not log.exists()
+
+    module = imports.lazy_import(name)
+    assert module.VALUE == 42
+    assert log.read_text() == "x"
+    assert imports.IMPORT_TIMES[name] >= 0.05
+
+    # 두 번째부터는 다시 불러오지도, 시간을 다시 재지도 않음
+    recorded = imports.IMPORT_TIMES[name]
+    assert imports.lazy_import(name) is module
+    assert log.read_text() == "x"
+    assert imports.import_report() == [(name, recorded)]
+
+
+def test_already_loaded_module_records_zero(slow_module):
+    name, _ = slow_module
+    __import__(name)
+    imports.lazy_import(name)
+    assert imports.IMPORT_TIMES[name] == 0.0
+
+
+def test_record_import_keeps_first_and_order(slow_module):
+    name, _ = slow_module
+    imports.record_import("streamlit", 0.5)
+    imports.lazy_import(name)
+    imports.record_import("streamlit", 9.0)
+    assert [n for n, _ in imports.import_report()] == ["streamlit", name]
+    assert imports.IMPORT_TIMES["streamlit"] == 0.5
+
+
+def test_missing_module_is_not_recorded(slow_module):
+    with pytest.raises(ModuleNotFoundError):
+        imports.lazy_import("tot_no_such_module")
+    assert "tot_no_such_module" not in imports.IMPORT_TIMES
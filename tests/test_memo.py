@@ -0,0 +1,108 @@
+"""
+탐색 결과 메모 테스트. 계산기 3 처럼 k 범위를 조금씩 넓히면서 새 구간만 탐색하고 merge_top 으로 합친 결과가
+최종 범위를 처음부터 한 번에 탐색한 결과와 순서까지 같은지 확인.
+"""
+
+import random
+
+import pytest
+
+from tot_calculator.memo import MEMO_TOP_K, SearchMemo, grid_last
+from tot_calculator.parallel import merge_top
+from tot_calculator.vectorized import search_best_k_n_vec, search_top_arrays
+
+
+def widen(memo: SearchMemo, x, days, k_min, k_max, k_step, depth):
+    """
+    app.py 의 탐색 흐름: 저장된 결과가 있으면 그대로, 아니면 넓어진 구간만 탐색해서 합친 뒤 저장.
+    (결과, 새로 탐색한 구간 목록)
+    """
+    stored = memo.lookup(x, days, k_min, k_max, k_step, depth)
+    if stored is not None:
+        return stored, []
+    reused, missing = memo.extension(x, days, k_min, k_max, k_step, depth)
+    parts = [search_best_k_n_vec(x, lo, hi, k_step, days, depth) for lo, hi in missing]
+    found = merge_top([reused, *parts], depth)
+    memo.store(x, days, k_min, k_max, k_step, depth, found)
+    return found, missing
+
+
+def full_search(x, days, k_min, k_max, k_step, depth):
+    diff, k, n = search_top_arrays(x, k_min, k_max, k_step, days, depth)
+    return list(zip(diff.tolist(), k.tolist(), n.tolist()))
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_stepwise_extension_matches_full_search(seed):
+    rng = random.Random(seed)
+    x = rng.randrange(600, 12_000)
+    days = rng.randint(1, 14)
+    k_step = rng.randint(1, 40)
+    depth = rng.choice((MEMO_TOP_K, 35))
+    k_min = rng.randrange(3_000, 30_000)
+    k_max = k_min + rng.randrange(0, 2_000)
+
+    memo = SearchMemo()
+    found, missing = widen(memo, x, days, k_min, k_max, k_step, depth)
+    assert missing == [(k_min, k_max)]
+    for _ in range(6):
+        prev_min, prev_last = k_min, grid_last(k_min, k_max, k_step)
+        # 아래쪽은 격자에 맞춰, 위쪽은 격자 사이 값까지 포함해서 넓힘
+        k_min -= k_step * min(rng.randint(0, 300), k_min // k_step)
+        k_max = k_max + rng.randint(0, 5_000)
+        found, missing = widen(memo, x, days, k_min, k_max, k_step, depth)
+        # 이미 탐색한 구간은 다시 탐색하지 않음
+        assert all(hi < prev_min or lo > prev_last for lo, hi in missing)
+        assert [row[:3] for row in found] == full_search(x, days, k_min, k_max, k_step, depth)
+        assert found == search_best_k_n_vec(x, k_min, k_max, k_step, days, depth)
+
+
+def test_extension_reuses_only_aligned_grids():
+    memo = SearchMemo()
+    widen(memo, 5000, 8, 4000, 6000, 20, MEMO_TOP_K)
+
+    reused, missing = memo.extension(5000, 8, 3000, 9010, 20, MEMO_TOP_K)
+    assert reused and missing == [(3000, 3980), (6020, 9000)]
+    assert grid_last(3000, 9010, 20) == 9000
+    # 격자가 어긋나거나(k_min 차이가 step 의 배수가 아님) 다른 입력이면 재사용하지 않음
+    assert memo.extension(5000, 8, 3010, 9000, 20, MEMO_TOP_K) == ([], [(3010, 9000)])
+    assert memo.extension(5000, 8, 3000, 9000, 10, MEMO_TOP_K) == ([], [(3000, 9000)])
+    assert memo.extension(5001, 8, 3000, 9000, 20, MEMO_TOP_K) == ([], [(3000, 9000)])
+    assert memo.extension(5000, 7, 3000, 9000, 20, MEMO_TOP_K) == ([], [(3000, 9000)])
+    # 저장된 범위보다 좁으면 재사용할 수 없음 (새 범위 밖의 후보가 섞여 있음)
+    assert memo.extension(5000, 8, 4100, 6000, 20, MEMO_TOP_K) == ([], [(4100, 6000)])
+    # 더 깊은 후보가 필요하면 재사용하지 않음
+    assert memo.extension(5000, 8, 3000, 9000, 20, MEMO_TOP_K + 1) == ([], [(3000, 9000)])
+
+
+def test_extension_prefers_widest_stored_range():
+    memo = SearchMemo()
+    widen(memo, 5000, 8, 4000, 4400, 20, MEMO_TOP_K)
+    widen(memo, 5000, 8, 4000, 6000, 20, MEMO_TOP_K)
+    reused, missing = memo.extension(5000, 8, 4000, 7000, 20, MEMO_TOP_K)
+    assert missing == [(6020, 7000)]
+    assert reused == search_best_k_n_vec(5000, 4000, 6000, 20, 8, MEMO_TOP_K)
+
+
+def test_lookup_truncates_and_needs_depth():
+    memo = SearchMemo()
+    found, _ = widen(memo, 5000, 8, 3800, 50_000, 20, MEMO_TOP_K)
+    # k_max 가 격자 사이에 있어도 같은 탐색
+    assert memo.lookup(5000, 8, 3800, 50_010, 20, 5) == found[:5]
+    assert memo.lookup(5000, 8, 3800, 50_000, 20, MEMO_TOP_K + 1) is None
+
+    # 격자 전체(2 × 30개)가 depth 보다 적게 저장되어 있으면 더 큰 top_k 도 채울 수 있음
+    small, _ = widen(memo, 5000, 8, 3800, 3820, 20, 100)
+    assert len(small) == 60
+    assert memo.lookup(5000, 8, 3800, 3820, 20, 500) == small
+
+
+def test_least_recently_used_entry_is_evicted():
+    memo = SearchMemo(max_entries=2)
+    for x in (5000, 5001):
+        widen(memo, x, 8, 4000, 4200, 20, MEMO_TOP_K)
+    assert memo.lookup(5000, 8, 4000, 4200, 20, 5) is not None
+    widen(memo, 5002, 8, 4000, 4200, 20, MEMO_TOP_K)
+    assert len(memo) == 2
+    assert memo.lookup(5001, 8, 4000, 4200, 20, 5) is None
+    assert memo.lookup(5000, 8, 4000, 4200, 20, 5) is not None
@@ -0,0 +1,106 @@
+"""
+치명타 / 약점 몬테카를로 시뮬레이션 테스트. seed 재현성, 확률 0% / 100% 에서의 결정적 값, 표본 평균을 확인.
+"""
+
+import math
+
+import numpy as np
+import pytest
+
+from tot_calculator.damage import compute_z, weak_multiplier
+from tot_calculator.montecarlo import (
+    MAX_FIGHTS,
+    MAX_TOTAL_HITS,
+    hit_profile,
+    simulate_counts,
+    simulate_fights,
+)
+
+BUILD = {"atk": 4155.0, "E_def": 5000.0, "def_coef": 30.0, "buff_x": 20.0, "buff_y": 180.0, "sk_coef": 250.0}
+WEAK_COEF = 2
+
+
+def profile(**overrides):
+    b = dict(BUILD, **overrides)
+    return hit_profile(b["atk"], b["E_def"], b["def_coef"], b["buff_x"], b["buff_y"], b["sk_coef"],
+                       weak_multiplier(WEAK_COEF))
+
+
+def scalar_hit(crit: bool, weak: bool) -> float:
+    # 계산기의 compute_z 는 치명타 + 약점을 가정하므로 아닌 쪽은 치피 100% / 약점 0개로 넣음
+    b = BUILD
+    return compute_z(b["buff_x"], b["buff_y"] if crit else 100.0, b["atk"], b["E_def"], b["def_coef"],
+                     WEAK_COEF if weak else 0, b["sk_coef"])
+
+
+@pytest.mark.parametrize("fights, hits", [(200, 37), (3, 5000), (1, 1)])
+def test_same_seed_same_counts_for_any_chunk_size(fights, hits):
+    expected = simulate_counts(fights, hits, 35.0, 60.0, seed=7, chunk_hits=1 << 20)
+    # 전투 여러 개가 한 청크 / 전투 하나가 여러 청크 / 홀수 크기 청크를 모두 거침
+    for chunk_hits in (1, 7, 100, 4999, 5001):
+        got = simulate_counts(fights, hits, 35.0, 60.0, seed=7, chunk_hits=chunk_hits)
+        for a, b in zip(got, expected):
+            np.testing.assert_array_equal(a, b)
+
+
+def test_simulate_fights_reproducible_across_chunk_sizes():
+    profiles = {"A": profile(), "B": profile(atk=4300.0, buff_y=160.0)}
+    first = simulate_fights(profiles, 500, 40, 50.0, 50.0, seed=3, chunk_hits=64)
+    second = simulate_fights(profiles, 500, 40, 50.0, 50.0, seed=3, chunk_hits=1 << 20)
+    assert first.summaries == second.summaries
+    assert first.win_rate == second.win_rate
+    for name in profiles:
+        np.testing.assert_array_equal(first.counts[name], second.counts[name])
+    assert simulate_fights(profiles, 500, 40, 50.0, 50.0, seed=4).summaries != first.summaries
+
+
+@pytest.mark.parametrize("crit_rate", [0.0, 100.0])
+@pytest.mark.parametrize("weak_rate", [0.0, 100.0])
+def test_certain_outcomes_match_compute_z(crit_rate, weak_rate):
+    hits = 25
+    result = simulate_fights({"A": profile()}, 300, hits, crit_rate, weak_rate)
+    summary = result.summaries["A"]
+    expected = hits * scalar_hit(crit_rate == 100.0, weak_rate == 100.0)
+    # 전투마다 총 데미지가 똑같음 (std 는 평균의 합산 반올림 오차만큼만 0 이 아님)
+    assert summary.p5 == summary.p50 == summary.p95 == pytest.approx(expected, rel=1e-12)
+    assert summary.mean == pytest.approx(expected, rel=1e-12)
+    assert summary.std <= 1e-12 * expected
+    assert result.counts["A"].max() == 300
+
+
+def test_sample_mean_matches_expectation():
+    fights, hits, crit_rate, weak_rate = 20_000, 50, 35.0, 60.0
+    p = profile()
+    result = simulate_fights({"A": p}, fights, hits, crit_rate, weak_rate, seed=11)
+    pc, pw = crit_rate * 0.01, weak_rate * 0.01
+    c, w = p.crit_mult - 1, p.weak_mult - 1
+    expected = p.base * hits * (1 + c * pc + w * pw + c * w * pc * pw)
+    summary = result.summaries["A"]
+    # 표준 오차의 5배 안 (seed 고정이라 결과는 항상 같음)
+    assert abs(summary.mean - expected) < 5 * summary.std / math.sqrt(fights)
+
+    n_crit, n_weak, n_both = simulate_counts(fights, hits, crit_rate, weak_rate, seed=11)
+    total = fights * hits
+    for count, rate in ((n_crit, pc), (n_weak, pw), (n_both, pc * pw)):
+        assert abs(count.sum() / total - rate) < 5 * math.sqrt(rate * (1 - rate) / total)
+
+
+def test_common_random_numbers_and_histogram():
+    profiles = {"A": profile(), "B": profile(atk=4500.0)}
+    result = simulate_fights(profiles, 1000, 20, 40.0, 30.0)
+    # 같은 타격 결과를 공유하므로 모든 면에서 센 B 가 모든 전투에서 이김
+    assert result.win_rate == 1.0
+    assert all(int(counts.sum()) == 1000 for counts in result.counts.values())
+    # 두 무기가 같은 구간을 씀: 가장 약한 A 의 최소 ~ 가장 센 B 의 최대
+    assert result.bin_edges[0] <= result.summaries["A"].p5
+    assert result.bin_edges[-1] >= result.summaries["B"].p95
+    assert result.counts["A"][0] > 0 and result.counts["B"][-1] > 0
+
+
+@pytest.mark.parametrize(
+    "fights, hits",
+    [(0, 10), (10, 0), (MAX_FIGHTS + 1, 1), (MAX_TOTAL_HITS // 1000 + 1, 1000)],
+)
+def test_limits_raise(fights, hits):
+    with pytest.raises(ValueError):
+        simulate_fights({"A": profile()}, fights, hits, 50.0, 50.0)
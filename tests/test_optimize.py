@@ -0,0 +1,47 @@
+"""
+스탯 배분 최적화 테스트. 전수 평가 경계(69포인트)와 그 위의 성긴 격자 + 재탐색 결과를 전수 평가와 비교.
+"""
+
+import math
+import random
+
+import numpy as np
+import pytest
+
+from tot_calculator.defaults import DEFAULT_COMMON
+from tot_calculator.optimize import (
+    EXHAUSTIVE_BUDGET,
+    MAX_GRID_POINTS,
+    STATS,
+    _compositions,
+    allocation_damage,
+    base_from_common,
+    optimize_allocation,
+)
+
+
+def test_exhaustive_budget_is_69():
+    assert EXHAUSTIVE_BUDGET == 69
+    assert math.comb(EXHAUSTIVE_BUDGET + 3, 3) <= MAX_GRID_POINTS < math.comb(EXHAUSTIVE_BUDGET + 4, 3)
+
+
+def _brute_force(base, budget, rates) -> float:
+    return float(np.nanmax(allocation_damage(base, rates, _compositions(budget))))
+
+
+@pytest.mark.parametrize("budget", [0, 1, EXHAUSTIVE_BUDGET, EXHAUSTIVE_BUDGET + 1, 120])
+def test_optimum_matches_brute_force(budget):
+    rng = random.Random(budget)
+    for _ in range(5):
+        common = dict(DEFAULT_COMMON, E_def=rng.uniform(1000, 9000), def_coef=rng.uniform(0, 60),
+                      buff_x=rng.uniform(0, 80), Weak_coef=rng.randint(0, 2))
+        base = base_from_common(common, wep_atk=rng.uniform(0, 3000))
+        rates = {stat: rng.uniform(0.2, 3.0) for stat in STATS}
+        result = optimize_allocation(base, budget, rates)
+        assert sum(result.points.values()) == budget
+        assert result.damage == pytest.approx(_brute_force(base, budget, rates), rel=1e-12)
+
+
+def test_negative_budget_rejected():
+    with pytest.raises(ValueError):
+        optimize_allocation(base_from_common(DEFAULT_COMMON), -1, dict.fromkeys(STATS, 1.0))
@@ -0,0 +1,120 @@
+"""
+재실행 계측 테스트. 시계를 고정 간격으로 움직여서 중첩 phase / lap 시간이 한 번씩만 기록되는지,
+profile_once 가 지정한 재실행 한 번만 cProfile 로 재는지 확인.
+"""
+
+import json
+import logging
+import pstats
+
+import pytest
+
+from tot_calculator import perf
+
+
+class FakeClock:
+    """
+    perf_counter 대신 쓰는 시계. advance 로만 움직임.
+    """
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(perf.time, "perf_counter", fake)
+    return fake
+
+
+def test_nested_phases_are_not_double_counted(clock):
+    with perf.trace_rerun("calc1") as trace:
+        clock.advance(1.0)
+        perf.lap("widgets")
+        with perf.phase("compute"):
+            clock.advance(2.0)
+            with perf.phase("figure"):
+                clock.advance(3.0)
+                with perf.phase("serialize"):
+                    clock.advance(0.5)
+            clock.advance(0.25)
+        # 같은 단계를 다시 재면 합산
+        with perf.phase("compute"):
+            clock.advance(1.0)
+        clock.advance(0.75)
+        perf.lap("table")
+        clock.advance(0.125)
+    assert trace.phases == {"widgets": 1.0, "compute": 3.25, "figure": 3.0, "serialize": 0.5, "table": 0.75}
+    # 단계 합 + 나머지 = 전체 (중첩 시간이 두 번 더해지지 않음)
+    assert trace.total == 8.625
+    assert trace.other == 0.125
+    assert sum(trace.phases.values()) + trace.other == trace.total
+
+
+def test_phase_with_exception_is_recorded(clock):
+    with pytest.raises(RuntimeError), perf.trace_rerun("calc1") as trace:
+        with perf.phase("compute"):
+            clock.advance(2.0)
+            raise RuntimeError
+    assert trace.phases == {"compute": 2.0}
+    assert trace.total == 2.0
+
+
+def test_outside_trace_does_nothing(clock):
+    with perf.phase("compute"):
+        clock.advance(1.0)
+    perf.lap("widgets")
+    perf.count("search.grid_points", 30)
+    assert perf.current_trace() is None
+
+
+def test_trace_record_is_logged(clock, caplog):
+    with caplog.at_level(logging.INFO, logger=perf.logger.name), perf.trace_rerun("calc3"):
+        with perf.phase("compute"):
+            clock.advance(0.002)
+        perf.count("search.grid_points", 30)
+        perf.count("search.grid_points", 12)
+    records = [json.loads(r.getMessage()) for r in caplog.records if r.name == perf.logger.name]
+    assert len(records) == 1
+    assert records[0]["calculator"] == "calc3"
+    assert records[0]["phases_ms"] == {"compute": 2.0}
+    assert records[0]["counters"] == {"search.grid_points": 42}
+
+
+@pytest.fixture
+def fresh_profile_count(monkeypatch):
+    monkeypatch.setattr(perf, "_profile_reruns", 0)
+    monkeypatch.delenv("TOT_PROFILE", raising=False)
+
+
+def test_profile_once_profiles_only_target_rerun(tmp_path, monkeypatch, fresh_profile_count, capsys):
+    monkeypatch.setenv("TOT_PROFILE_RERUN", "2")
+    path = tmp_path / "rerun.prof"
+    ran = []
+    for rerun in range(1, 5):
+        with perf.profile_once(str(path)):
+            # 전체 재실행 안의 프래그먼트 재실행은 따로 세지 않음
+            with perf.profile_once(str(path)):
+                ran.append(rerun)
+        assert path.exists() == (rerun == 2)
+        if rerun == 2:
+            stats = pstats.Stats(str(path))
+            assert stats.total_calls > 0
+            path.unlink()
+    # 블록 본문은 매번 실행되지만 프로파일은 두 번째 재실행에서 한 번만
+    assert ran == [1, 2, 3, 4]
+    assert perf._profile_reruns == 4
+    assert capsys.readouterr().err.count("cProfile 결과를") == 1
+
+
+def test_profile_once_without_path_does_nothing(fresh_profile_count):
+    with perf.profile_once():
+        pass
+    assert perf._profile_reruns == 0
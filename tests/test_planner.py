@@ -0,0 +1,123 @@
+"""
+탐색 계획기 테스트. 범위에 따른 엔진 선택, 예산 표시, 시간 예산 / should_stop 으로 탐색이 중단되는지 확인.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from tot_calculator.parallel import search_best_k_n_parallel
+from tot_calculator.planner import ENGINES, SearchPlan, make_deadline, plan_search, run_search
+from tot_calculator.score import SearchCancelled, search_best_intervals, search_best_k_n
+from tot_calculator.score_index import ScoreIndex
+from tot_calculator.vectorized import search_best_k_n_vec
+
+
+@pytest.mark.parametrize(
+    "k_range, options, engine",
+    [
+        # 격자점 30개: NumPy 준비 비용보다 파이썬 반복이 쌈
+        ((3800, 3800, 1), {}, "python"),
+        # 격자점 약 7만 개: 구간 해석(고정 약 10ms)보다 벡터화가 쌈
+        ((3800, 50_000, 20), {}, "vectorized"),
+        ((3800, 50_000, 20), {"workers": 8, "allow_analytic": False}, "vectorized"),
+        # 격자점 6천만 개 이상: 구간 해석
+        ((0, 2_000_000, 1), {}, "interval"),
+        ((0, 20_000_000, 1), {"workers": 8}, "interval"),
+        # 색인이 이미 있으면 조회가 가장 쌈 (색인 범위 안일 때만)
+        ((3800, 50_000, 20), {"index_ready": True}, "index"),
+        ((0, 20_000_000, 1), {"index_ready": True}, "interval"),
+        # 해석 엔진을 쓰지 않으면 큰 범위는 병렬 샤드
+        ((0, 2_000_000, 1), {"workers": 8, "allow_analytic": False}, "parallel"),
+        ((0, 2_000_000, 1), {"workers": 1, "allow_analytic": False}, "vectorized"),
+    ],
+)
+def test_engine_routing(k_range, options, engine):
+    plan = plan_search(*k_range, **options)
+    assert plan.engine == engine
+    assert plan.within_budget
+    assert plan.grid_points == ((k_range[1] - k_range[0]) // k_range[2] + 1) * 30
+
+
+def test_memory_budget_avoids_large_chunks():
+    # 벡터화 청크 하나(최소 1,024 k × 30 × 48 byte)도 못 넣는 예산이면 메모리를 쓰지 않는 엔진으로
+    plan = plan_search(0, 2_000_000, 1, allow_analytic=False, memory_budget=1024 * 1024)
+    assert plan.engine == "python"
+    assert plan.est_bytes == 0
+
+
+def test_over_budget_plan_is_flagged():
+    plan = plan_search(0, 2_000_000, 1, allow_analytic=False, time_budget=0.05)
+    assert not plan.within_budget
+    forced = plan_search(3800, 50_000, 20, engine="python", time_budget=1e-6)
+    assert forced.engine == "python" and not forced.within_budget
+
+
+@pytest.mark.parametrize("engine", ["python", "vectorized", "parallel"])
+def test_over_budget_run_is_cancelled(engine):
+    """
+    예산을 넘는 계획을 그대로 실행하면 (수 초 ~ 수 분 걸릴 탐색) 예산 직후에 SearchCancelled 로 멈춰야 함.
+    """
+    plan = plan_search(0, 2_000_000, 1, workers=4, engine=engine, time_budget=0.2)
+    assert not plan.within_budget
+    start = time.perf_counter()
+    with ThreadPoolExecutor(4) as executor, pytest.raises(SearchCancelled):
+        run_search(plan, 5000, 0, 2_000_000, 1, 8, executor=executor, time_budget=0.2)
+    assert time.perf_counter() - start < 2.0
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_run_search_engines_agree(engine):
+    k_min, k_max, k_step, days = 3800, 20_000, 7, 8
+    expected = search_best_k_n(5000, k_min, k_max, k_step, days, 10)
+    plan = plan_search(k_min, k_max, k_step, workers=3, engine=engine)
+    index_cache = {days: ScoreIndex.build(days, k_max=30_000)} if engine == "index" else None
+    with ThreadPoolExecutor(3) as executor:
+        rows = run_search(plan, 5000, k_min, k_max, k_step, days, 10, executor=executor, index_cache=index_cache)
+    assert rows == expected
+
+
+def test_unknown_engine_raises():
+    with pytest.raises(ValueError):
+        plan_search(0, 100, 1, engine="gpu")
+    with pytest.raises(ValueError):
+        run_search(SearchPlan("gpu", 0, 0.0, 0, 0, True), 5000, 0, 100, 1, 8)
+    with pytest.raises(ValueError):
+        plan_search(0, 100, 0)
+
+
+def stop_after(calls: int):
+    """
+    calls번째 확인부터 참을 반환하는 should_stop. 확인 횟수는 .count 에 남음.
+    """
+    def should_stop():
+        should_stop.count += 1
+        return should_stop.count >= calls
+    should_stop.count = 0
+    return should_stop
+
+
+@pytest.mark.parametrize(
+    "search",
+    [
+        lambda stop: search_best_k_n(5000, 0, 200_000, 1, 8, should_stop=stop),
+        lambda stop: search_best_k_n_vec(5000, 0, 2_000_000, 1, 8, chunk_size=4096, should_stop=stop),
+        lambda stop: search_best_k_n_parallel(5000, 0, 2_000_000, 1, 8, shards=1, chunk_size=4096, should_stop=stop),
+        lambda stop: search_best_intervals(5000, 0, 2_000_000, 1, 8, top_k=100_000, should_stop=stop),
+    ],
+    ids=["python", "vectorized", "parallel", "interval"],
+)
+def test_should_stop_cancels_search(search):
+    stop = stop_after(3)
+    with pytest.raises(SearchCancelled):
+        search(stop)
+    assert stop.count == 3
+
+
+def test_make_deadline():
+    assert make_deadline(None) is None
+    expired = make_deadline(-1.0)
+    assert expired()
+    pending = make_deadline(60.0)
+    assert not pending()
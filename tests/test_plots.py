@@ -0,0 +1,98 @@
+"""
+그래프를 반복해서 그려도 메모리가 쌓이지 않는지 확인하는 회귀 테스트.
+
+- plots.figure_to_png: 렌더링한 Figure 는 참조를 놓으면 바로 해제되어야 하고 (weakref),
+  같은 그래프를 여러 번 그려도 추적되는 메모리가 늘지 않아야 함 (tracemalloc)
+- 앱의 PNG 캐시: 같은 입력으로 재실행을 반복하면 캐시에서 바로 나오므로 메모리가 늘지 않아야 함
+두 경우 모두 pyplot figure manager 에는 아무것도 등록되지 않아야 함.
+"""
+
+import gc
+import tracemalloc
+import weakref
+from pathlib import Path
+
+import numpy as np
+import pytest
+from matplotlib._pylab_helpers import Gcf
+
+from tot_calculator import plots
+
+APP_PATH = Path(__file__).resolve().parent.parent / "app.py"
+
+RENDERS = 10
+# 해제 여부만 보면 되므로 기본값(200)보다 낮은 해상도로 렌더링해서 테스트 시간을 줄임
+DPI = 72
+# 측정 구간 전체에서 허용하는 증가량. 해제되지 않은 Figure 하나(9×6인치, dpi 72 캔버스)만 해도 1 MB 가 넘음
+MAX_GROWTH_BYTES = 512 * 1024
+
+
+def _efficiency_args():
+    atk_range = np.linspace(0, 8000, 200)
+    curve_A = atk_range * 1.0
+    curve_B = atk_range * 1.1
+    return atk_range, curve_A, curve_B, (curve_B / np.maximum(curve_A, 1) - 1) * 100, 3000, 3200
+
+
+def _traced_growth(run, warmup: int, repeat: int) -> int:
+    """
+    warmup 번 실행해서 matplotlib / Streamlit 내부 캐시(글꼴 등)를 채운 뒤, repeat 번 더 실행하는 동안
+    늘어난 메모리 (byte). 추적을 켠 직후 한 번은 처음 추적되는 할당이 섞이므로 측정에서 뺌.
+    """
+    for _ in range(warmup):
+        run()
+    tracemalloc.start()
+    try:
+        run()
+        gc.collect()
+        before = tracemalloc.get_traced_memory()[0]
+        for _ in range(repeat):
+            run()
+        gc.collect()
+        return tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+
+
+def test_rendered_figures_are_released():
+    refs = []
+    for _ in range(RENDERS):
+        fig = plots.efficiency_figure(*_efficiency_args())
+        refs.append(weakref.ref(fig))
+        png = plots.figure_to_png(fig, dpi=DPI)
+        assert png.startswith(b"\x89PNG")
+        del fig
+    gc.collect()
+    assert all(ref() is None for ref in refs)
+    assert Gcf.get_num_fig_managers() == 0
+
+
+def test_figure_to_png_memory_is_bounded():
+    def render():
+        plots.figure_to_png(plots.efficiency_figure(*_efficiency_args()), dpi=DPI)
+
+    growth = _traced_growth(render, warmup=3, repeat=5)
+    assert growth < MAX_GROWTH_BYTES, f"5번 렌더링 후 {growth / 1024:.0f} KB 증가"
+    assert Gcf.get_num_fig_managers() == 0
+
+
+def test_app_plot_cache_reruns_are_bounded():
+    """
+    계산기 1 그래프(efficiency_plot_png)에 들어가는 기초 공격력을 세 값 사이에서 바꿔 가며 재실행.
+    첫 바퀴에서 세 그래프가 캐시에 들어간 뒤로는 렌더링 없이 캐시에서 나와야 함.
+    """
+    AppTest = pytest.importorskip("streamlit.testing.v1").AppTest
+
+    at = AppTest.from_file(str(APP_PATH), default_timeout=120)
+    at.run()
+    assert not at.exception
+
+    def cycle():
+        for atk_origin in (1661.0, 1700.0, 1800.0):
+            at.sidebar.number_input[1].set_value(atk_origin).run()
+            assert not at.exception
+            assert at.get("image")
+
+    growth = _traced_growth(cycle, warmup=1, repeat=2)
+    assert growth < MAX_GROWTH_BYTES, f"재실행 6번 후 {growth / 1024:.0f} KB 증가"
+    assert Gcf.get_num_fig_managers() == 0
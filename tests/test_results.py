@@ -0,0 +1,90 @@
+"""
+열 단위 결과 저장 테스트.
+"""
+
+import io
+
+import numpy as np
+import pytest
+
+from tot_calculator.results import (
+    EXPORT_MAX_ROWS,
+    INTERVAL_COLUMNS,
+    POINT_COLUMNS,
+    TRAJECTORY_COLUMNS,
+    ResultColumns,
+    point_columns,
+    search_top_columns,
+)
+from tot_calculator.score import search_best_intervals, search_best_k_n, series_trajectory
+
+
+def test_from_rows_keeps_engine_rows():
+    rows = search_best_k_n(5000, 3800, 6000, 7, 8, top_k=20)
+    columns = ResultColumns.from_rows(rows, POINT_COLUMNS)
+    assert len(columns) == 20
+    assert [columns.row(i) for i in range(len(columns))] == rows
+    assert {name: col.dtype for name, col in columns.columns.items()} == {
+        name: np.dtype(dtype) for name, dtype in POINT_COLUMNS.items()
+    }
+
+
+def test_from_rows_empty():
+    columns = ResultColumns.from_rows([], INTERVAL_COLUMNS)
+    assert len(columns) == 0
+    assert list(columns.columns) == list(INTERVAL_COLUMNS)
+
+
+def test_trajectory_day_beyond_int16():
+    rows = series_trajectory([(40_000, 9939)], 5000, 7)
+    assert ResultColumns.from_rows(rows, TRAJECTORY_COLUMNS).row(0) == rows[0]
+
+
+@pytest.mark.parametrize(
+    "row, column",
+    [
+        ((1, 2**31, 2, 3), "x"),
+        ((1, 2, 3, -(2**31) - 1), "diff"),
+        ((2**40, 2, 3, 4), "day"),
+    ],
+)
+def test_from_rows_rejects_out_of_range(row, column):
+    with pytest.raises(ValueError, match=column):
+        ResultColumns.from_rows([row], TRAJECTORY_COLUMNS)
+
+
+def test_from_rows_rejects_values_beyond_int64():
+    with pytest.raises(ValueError):
+        ResultColumns.from_rows([(1, 2**70, 3, 4)], TRAJECTORY_COLUMNS)
+
+
+def test_point_columns_rejects_int8_overflow():
+    with pytest.raises(ValueError, match="^n 열"):
+        point_columns(5000, [5000], [300], 8)
+
+
+def test_search_top_columns_matches_brute_force():
+    columns = search_top_columns(5000, 3800, 6000, 3, 8, top_k=50)
+    assert [columns.row(i) for i in range(len(columns))] == search_best_k_n(5000, 3800, 6000, 3, 8, top_k=50)
+    with pytest.raises(ValueError):
+        search_top_columns(5000, 3800, 6000, 3, 8, top_k=EXPORT_MAX_ROWS + 1)
+
+
+def test_arrow_csv_parquet_round_trip():
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+    rows = search_best_intervals(12345, 0, 200_000, 1, 8, top_k=10)
+    columns = ResultColumns.from_rows(rows, INTERVAL_COLUMNS)
+    labels = {"k_lo": "k from", "k_hi": "k to", "n": "n"}
+
+    table = columns.to_arrow(labels)
+    assert table.column_names == list(labels.values())
+    assert table.column("k from").to_pylist() == [r[1] for r in rows]
+    assert table.schema.field("n").type == pa.int8()
+
+    csv_lines = columns.to_csv(labels).decode("utf-8").splitlines()
+    assert csv_lines[0] == '"k from","k to","n"'
+    assert len(csv_lines) == len(rows) + 1
+
+    parquet = pq.read_table(io.BytesIO(columns.to_parquet()))
+    assert parquet.to_pylist() == [dict(zip(INTERVAL_COLUMNS, r)) for r in rows]
@@ -0,0 +1,174 @@
+"""
+스킬 로테이션 타임라인 테스트. 차분 배열 / 누적합으로 펼친 턴별 버프와 데미지를
+턴마다 버프 목록을 다 훑는 중첩 반복문 결과와 비교함.
+"""
+
+import random
+
+import numpy as np
+import pytest
+
+from tot_calculator.damage import damage
+from tot_calculator.defaults import DEFAULT_COMMON
+from tot_calculator.rotation import (
+    BUFF_KINDS,
+    LOADOUT_FIELDS,
+    MAX_TURNS,
+    Buff,
+    Skill,
+    Timeline,
+    rotation_damage,
+    weapon_loadouts,
+)
+from tot_calculator.weapons import DOLL_POSITIONS, WEAPON_OPTIONS, weapon_damage
+
+# 10턴: 공격력 버프 두 개가 4 ~ 5턴에 겹치고, 피증 버프는 마지막 턴(10)에 끝나고,
+# 방깎은 전투보다 오래 가고, 치피 버프는 마지막 턴에 시작함. 3턴에는 스킬 두 개
+EDGE_TIMELINE = Timeline(
+    turns=10,
+    skills=(Skill(1, 100.0), Skill(3, 250.0), Skill(3, 80.0), Skill(5, 300.0), Skill(10, 500.0)),
+    buffs=(
+        Buff("atk", 2, 4, 20.0),
+        Buff("atk", 4, 2, 15.0),
+        Buff("dmg", 7, 4, 30.0),
+        Buff("def_shred", 6, 50, 45.0),
+        Buff("crit", 10, 3, 60.0),
+    ),
+)
+
+
+def random_timeline(rng: random.Random) -> Timeline:
+    turns = rng.randint(1, 60)
+    skills = tuple(Skill(rng.randint(1, turns), rng.uniform(50, 600)) for _ in range(rng.randint(0, 12)))
+    buffs = tuple(
+        Buff(rng.choice(list(BUFF_KINDS)), rng.randint(1, turns), rng.randint(1, turns + 5), rng.uniform(5, 60))
+        for _ in range(rng.randint(0, 10))
+    )
+    return Timeline(turns, skills, buffs)
+
+
+TIMELINES = [EDGE_TIMELINE, *(random_timeline(random.Random(seed)) for seed in range(20))]
+
+
+def naive_turns(timeline: Timeline) -> dict:
+    """
+    턴마다 그 턴에 살아 있는 버프를 모두 더함. {"coef" / 버프 종류: 턴별 값 목록}
+    """
+    out = {name: [] for name in ("coef", *BUFF_KINDS)}
+    for t in range(1, timeline.turns + 1):
+        out["coef"].append(sum(s.coef for s in timeline.skills if s.turn == t))
+        for kind in BUFF_KINDS:
+            out[kind].append(sum(b.value for b in timeline.buffs if b.kind == kind and b.start <= t < b.start + b.duration))
+    return out
+
+
+def naive_damage(loadout: dict, timeline: Timeline) -> list:
+    turns = naive_turns(timeline)
+    row = []
+    for t in range(timeline.turns):
+        if turns["coef"][t] == 0:
+            row.append(0.0)
+            continue
+        atk = loadout["atk_base"] * (1 + (loadout["atk_bonus"] + turns["atk"][t]) * 0.01)
+        row.append(damage(
+            atk,
+            loadout["E_def"],
+            min(loadout["def_coef"] + turns["def_shred"][t], 100.0),
+            loadout["buff_x"] + turns["dmg"][t],
+            loadout["buff_y"] + turns["crit"][t],
+            turns["coef"][t],
+            loadout["multiplier"],
+        ))
+    return row
+
+
+def random_loadouts(seed: int, count: int) -> dict:
+    rng = np.random.default_rng(seed)
+    return {
+        "atk_base": rng.uniform(1500, 3000, count),
+        "atk_bonus": rng.uniform(0, 100, count),
+        "E_def": rng.uniform(0, 12_000, count),
+        "def_coef": rng.uniform(0, 90, count),
+        "buff_x": rng.uniform(0, 100, count),
+        "buff_y": rng.uniform(100, 250, count),
+        "multiplier": rng.choice([1.0, 1.1, 1.2], count),
+    }
+
+
+LOADOUTS = random_loadouts(seed=9, count=23)
+
+
+def test_edge_timeline_turn_arrays():
+    turns = EDGE_TIMELINE.turn_arrays()
+    np.testing.assert_array_equal(turns.coef, [100, 0, 330, 0, 300, 0, 0, 0, 0, 500])
+    np.testing.assert_array_equal(turns.atk, [0, 20, 20, 35, 35, 0, 0, 0, 0, 0])
+    np.testing.assert_array_equal(turns.dmg, [0, 0, 0, 0, 0, 0, 30, 30, 30, 30])
+    np.testing.assert_array_equal(turns.def_shred, [0, 0, 0, 0, 0, 45, 45, 45, 45, 45])
+    np.testing.assert_array_equal(turns.crit, [0] * 9 + [60])
+
+
+@pytest.mark.parametrize("timeline", TIMELINES)
+def test_turn_arrays_match_naive_loop(timeline):
+    turns = timeline.turn_arrays()
+    expected = naive_turns(timeline)
+    for name, values in expected.items():
+        np.testing.assert_allclose(getattr(turns, name), values, rtol=1e-12, atol=1e-9)
+
+
+@pytest.mark.parametrize("timeline", TIMELINES)
+def test_rotation_damage_matches_naive_loop(timeline):
+    out = rotation_damage(LOADOUTS, timeline)
+    assert out.shape == (23, timeline.turns)
+    for i in range(23):
+        loadout = {name: float(LOADOUTS[name][i]) for name in LOADOUT_FIELDS}
+        np.testing.assert_allclose(out[i], naive_damage(loadout, timeline), rtol=1e-12, atol=1e-9)
+
+
+@pytest.mark.parametrize("timeline", TIMELINES[:5])
+def test_rotation_damage_does_not_depend_on_chunk_size(timeline):
+    expected = rotation_damage(LOADOUTS, timeline, chunk_size=10_000)
+    for chunk_size in (1, 2, 7, 22, None):
+        np.testing.assert_array_equal(rotation_damage(LOADOUTS, timeline, chunk_size=chunk_size), expected)
+
+
+def test_scalar_loadout_fields_broadcast():
+    loadouts = dict(LOADOUTS, E_def=5000.0, multiplier=1.1)
+    expected = rotation_damage(
+        dict(LOADOUTS, E_def=np.full(23, 5000.0), multiplier=np.full(23, 1.1)), EDGE_TIMELINE
+    )
+    np.testing.assert_array_equal(rotation_damage(loadouts, EDGE_TIMELINE), expected)
+
+
+def test_single_skill_matches_weapon_damage():
+    # 버프 없이 스킬 하나만 쓰는 1턴 전투는 무기 효율 계산기의 데미지와 같아야 함
+    weapons = {
+        "wep_atk": [390.0, 420.0, 300.0],
+        "option": list(WEAPON_OPTIONS)[:2] + [list(WEAPON_OPTIONS)[0]],
+        "def_ignore": [0.0, 10.0, 25.0],
+        "dmg_buff": [0.0, 5.0, 12.0],
+    }
+    for position, (atk_per, ct_per) in DOLL_POSITIONS.items():
+        loadouts = weapon_loadouts(DEFAULT_COMMON, weapons, position)
+        out = rotation_damage(loadouts, Timeline(1, (Skill(1, DEFAULT_COMMON["sk_coef"]),)))
+        wep_ak, wep_ct = np.array([WEAPON_OPTIONS[o] for o in weapons["option"]]).T
+        expected = weapon_damage(
+            DEFAULT_COMMON, np.array(weapons["wep_atk"]), wep_ak, wep_ct,
+            np.array(weapons["def_ignore"]), np.array(weapons["dmg_buff"]), atk_per, ct_per,
+        )
+        np.testing.assert_allclose(out[:, 0], expected, rtol=1e-12)
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"turns": 0, "skills": ()},
+        {"turns": MAX_TURNS + 1, "skills": ()},
+        {"turns": 5, "skills": (Skill(6, 100.0),)},
+        {"turns": 5, "skills": (), "buffs": (Buff("speed", 1, 1, 10.0),)},
+        {"turns": 5, "skills": (), "buffs": (Buff("atk", 6, 1, 10.0),)},
+        {"turns": 5, "skills": (), "buffs": (Buff("atk", 1, 0, 10.0),)},
+    ],
+)
+def test_invalid_timeline_raises(kwargs):
+    with pytest.raises(ValueError):
+        Timeline(**kwargs)
@@ -0,0 +1,310 @@
+"""
+점수 탐색 엔진 동등성 테스트.
+
+고정 seed 로 만든 (x, days, k_min, k_max, k_step) 조합마다 모든 엔진의 결과가
+브루트포스 search_best_k_n / 구간 해석 search_best_intervals 와 튜플 단위로 같은지 확인함.
+x_hat 은 계단 함수라 동점이 많아서 동점 순서(k 오름차순, n 오름차순)까지 함께 확인됨.
+"""
+
+import random
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+
+from tot_calculator import parallel
+from tot_calculator.parallel import search_best_k_n_parallel
+from tot_calculator.score import (
+    N_MAX,
+    N_MIN,
+    SearchCancelled,
+    model_total_score,
+    search_best_intervals,
+    search_best_k_n,
+    search_best_k_n_exact,
+    search_series,
+    series_trajectory,
+)
+from tot_calculator.score_index import ScoreIndex
+from tot_calculator.vectorized import search_best_k_n_many, search_best_k_n_vec
+
+# 색인은 days마다 만들어야 해서 테스트용으로 k 범위를 줄임
+INDEX_K_MAX = 100_000
+
+
+def random_cases(seed: int, count: int):
+    """
+    격자점 수가 브루트포스로 금방 끝나는 크기(최대 약 4,000 × 30)인 무작위 조합.
+    k 범위는 m(k) 경계(3800, 4800)와 a(P) 마일스톤이 자주 걸리도록 0 ~ 60,000 에서 고름.
+    """
+    rng = random.Random(seed)
+    cases = []
+    for _ in range(count):
+        k_min = rng.randrange(0, 60_000)
+        k_step = rng.randint(1, 7)
+        k_max = k_min + rng.randrange(0, 4_000)
+        days = rng.randint(1, 14)
+        x = rng.randrange(600, 8_000)
+        top_k = rng.randint(1, 12)
+        cases.append((x, k_min, k_max, k_step, days, top_k))
+    return cases
+
+
+CASES = random_cases(seed=20240611, count=40)
+
+
+def sorted_search(target_x, k_min, k_max, k_step, days, top_k=5):
+    """
+    힙으로 바꾸기 전의 search_best_k_n: 모든 후보를 모아 diff 기준 안정 정렬 후 앞에서 top_k개.
+    """
+    best_list = []
+    for k in range(k_min, k_max + 1, k_step):
+        for n in range(N_MIN, N_MAX + 1):
+            x_hat, P, a, m = model_total_score(k, n, days=days)
+            best_list.append((abs(x_hat - target_x), k, n, x_hat, P, a, m))
+    best_list.sort(key=lambda x: x[0])
+    return best_list[:top_k]
+
+
+@pytest.fixture(scope="module")
+def reference():
+    # 같은 조합을 여러 테스트에서 쓰므로 브루트포스 결과는 한 번만 계산
+    return {case: search_best_k_n(*case) for case in CASES}
+
+
+@pytest.fixture(scope="module")
+def indexes():
+    built = {}
+
+    def get(days):
+        if days not in built:
+            built[days] = ScoreIndex.build(days, k_max=INDEX_K_MAX)
+        return built[days]
+    return get
+
+
+@pytest.mark.parametrize("case", CASES)
+def test_heap_search_matches_sorted_search(case, reference):
+    assert reference[case] == sorted_search(*case)
+
+
+@pytest.mark.parametrize(
+    "case",
+    [
+        # k < 3800 이고 P 가 첫 마일스톤(900) 아래라 모든 후보가 x_hat = 590 으로 동점
+        (590, 1, 29, 1, 1, 40),
+        (1000, 1, 29, 1, 1, 7),
+        # 한 구간 안의 격자점 수보다 큰 top_k (동점 구간이 여러 개에 걸침)
+        (617, 3800, 3850, 5, 1, 200),
+        # top_k 가 전체 후보 수(3 × 30 = 90)보다 큼
+        (5000, 4800, 4960, 80, 8, 500),
+        # 빈 범위
+        (5000, 10, 9, 1, 8, 5),
+    ],
+)
+def test_ties_and_oversized_top_k(case):
+    x, k_min, k_max, k_step, days, top_k = case
+    expected = sorted_search(*case)
+    assert search_best_k_n(*case) == expected
+    assert search_best_k_n_exact(*case) == expected
+    assert search_best_k_n_vec(*case) == expected
+    assert len(expected) == min(top_k, len(range(k_min, k_max + 1, k_step)) * (N_MAX - N_MIN + 1))
+
+
+def test_interval_solver_with_oversized_top_k():
+    # 후보 구간 수보다 큰 top_k 는 모든 구간을 반환하고, 펼친 점은 전체 격자와 같아야 함
+    intervals = search_best_intervals(5000, 4800, 4960, 80, 8, top_k=10_000)
+    assert len(intervals) < 10_000
+    points = sum(len(range(k_lo, k_hi + 1, 80)) for _, k_lo, k_hi, *_ in intervals)
+    assert points == 3 * (N_MAX - N_MIN + 1)
+
+
+def test_non_positive_top_k_returns_nothing():
+    assert search_best_k_n(5000, 4800, 5000, 1, 8, top_k=0) == []
+    assert search_best_k_n_exact(5000, 4800, 5000, 1, 8, top_k=0) == []
+    assert search_best_intervals(5000, 4800, 5000, 1, 8, top_k=-1) == []
+
+
+def test_interval_solver_honours_should_stop():
+    calls = []
+
+    def should_stop():
+        calls.append(None)
+        return len(calls) > 3
+
+    with pytest.raises(SearchCancelled):
+        search_best_intervals(5000, 3800, 2_000_000, 1, 8, top_k=100_000, should_stop=should_stop)
+    assert len(calls) == 4
+    # 멈추지 않으면 결과는 그대로
+    expected = search_best_intervals(5000, 3800, 50000, 20, 8, top_k=500)
+    assert search_best_intervals(5000, 3800, 50000, 20, 8, top_k=500, should_stop=lambda: False) == expected
+
+
+@pytest.mark.parametrize("case", CASES)
+def test_exact_matches_brute_force(case, reference):
+    assert search_best_k_n_exact(*case) == reference[case]
+
+
+@pytest.mark.parametrize("case", CASES)
+def test_vectorized_matches_brute_force(case, reference):
+    x, k_min, k_max, k_step, days, top_k = case
+    assert search_best_k_n_vec(*case) == reference[case]
+    # 청크 경계에서 동점 순서가 바뀌지 않아야 함
+    assert search_best_k_n_vec(x, k_min, k_max, k_step, days, top_k, chunk_size=97) == reference[case]
+
+
+@pytest.mark.parametrize("case", CASES)
+def test_many_targets_match_brute_force(case, reference):
+    x, k_min, k_max, k_step, days, top_k = case
+    others = [x + 37, max(0, x - 250)]
+    got = search_best_k_n_many([x, *others], k_min, k_max, k_step, days, top_k)
+    assert got[0] == reference[case]
+    assert got[1:] == [search_best_k_n(t, k_min, k_max, k_step, days, top_k) for t in others]
+
+
+@pytest.mark.parametrize("case", CASES)
+def test_parallel_matches_brute_force(case, reference, monkeypatch):
+    # 작은 범위도 여러 샤드로 나뉘게 해서 샤드 결과 병합까지 확인
+    monkeypatch.setattr(parallel, "MIN_SHARD_K", 64)
+    assert search_best_k_n_parallel(*case, shards=7) == reference[case]
+
+
+def test_parallel_process_pool_matches_brute_force(reference, monkeypatch):
+    monkeypatch.setattr(parallel, "MIN_SHARD_K", 64)
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        for case in CASES[:8]:
+            assert search_best_k_n_parallel(*case, executor=executor, shards=5) == reference[case]
+
+
+def test_parallel_default_shards_follow_workers(monkeypatch):
+    monkeypatch.setattr(parallel, "MIN_SHARD_K", 1)
+    seen = []
+    monkeypatch.setattr(parallel, "shard_ranges", lambda *args: seen.append(args[-1]) or [])
+    search_best_k_n_parallel(5000, 0, 10_000, 1, 8, workers=3)
+    assert seen == [12]
+
+
+def test_parallel_deadline_does_not_wait_for_running_shards(monkeypatch):
+    """
+    샤드 하나가 오래 걸려도 마감이 지나면 그 샤드를 기다리지 않고 바로 중단되어야 함.
+    """
+    release = threading.Event()
+
+    def slow_shard(task):
+        release.wait(10)
+        return []
+
+    monkeypatch.setattr(parallel, "_search_shard", slow_shard)
+    deadline = time.perf_counter() + 0.1
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        start = time.perf_counter()
+        with pytest.raises(SearchCancelled):
+            search_best_k_n_parallel(
+                5000, 0, 200_000, 1, 8, executor=executor, workers=2,
+                should_stop=lambda: time.perf_counter() > deadline,
+            )
+        elapsed = time.perf_counter() - start
+        release.set()
+    assert elapsed < 1.0
+
+
+def test_parallel_sequential_deadline_checks_chunks():
+    calls = []
+
+    def should_stop():
+        calls.append(None)
+        return len(calls) > 2
+
+    with pytest.raises(SearchCancelled):
+        search_best_k_n_parallel(5000, 0, 100_000, 1, 8, shards=1, chunk_size=1024, should_stop=should_stop)
+    assert len(calls) == 3
+
+
+@pytest.mark.parametrize("case", CASES)
+def test_index_lookup_points_matches_brute_force(case, reference, indexes):
+    x, k_min, k_max, k_step, days, top_k = case
+    assert indexes(days).lookup_points(x, k_min, k_max, k_step, top_k=top_k) == reference[case]
+
+
+@pytest.mark.parametrize("case", CASES)
+def test_index_lookup_intervals_matches_interval_solver(case, indexes):
+    x, k_min, k_max, k_step, days, top_k = case
+    expected = search_best_intervals(x, k_min, k_max, k_step, days, top_k)
+    assert indexes(days).lookup_intervals(x, k_min, k_max, k_step, top_k=top_k) == expected
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_wide_ranges_match_vectorized(seed, indexes):
+    """
+    브루트포스로는 오래 걸리는 넓은 범위는 벡터화 엔진을 기준으로 비교.
+    """
+    rng = random.Random(seed)
+    k_min = rng.randrange(0, 20_000)
+    k_max = rng.randrange(k_min, INDEX_K_MAX)
+    k_step = rng.randint(1, 50)
+    days = rng.randint(1, 14)
+    x = rng.randrange(600, 12_000)
+    top_k = rng.randint(1, 30)
+
+    expected = search_best_k_n_vec(x, k_min, k_max, k_step, days, top_k)
+    assert search_best_k_n_exact(x, k_min, k_max, k_step, days, top_k) == expected
+    assert indexes(days).lookup_points(x, k_min, k_max, k_step, top_k=top_k) == expected
+
+
+def random_series_cases(seed: int, count: int):
+    """
+    실제 (k, n) 으로 만든 일차별 총점에 잡음을 더한 입력. 잡음 0 이면 정확히 맞는 (k, n) 이 있음.
+    격자는 전수 탐색(격자점 × 30 × 일수)이 금방 끝나는 크기.
+    """
+    rng = random.Random(seed)
+    cases = []
+    for _ in range(count):
+        k_min = rng.randrange(0, 40_000)
+        k_step = rng.randint(1, 7)
+        k_max = k_min + rng.randrange(0, 1_500)
+        k_true = rng.randrange(k_min, k_max + 1)
+        n_true = rng.randint(N_MIN, N_MAX)
+        days = sorted(rng.sample(range(1, 15), rng.randint(1, 5)))
+        noise = rng.choice((0, 30, 400))
+        series = [(day, model_total_score(k_true, n_true, days=day)[0] + rng.randint(-noise, noise)) for day in days]
+        cases.append((tuple(series), k_min, k_max, k_step, rng.randint(1, 12)))
+    return cases
+
+
+def scan_series(series, k_min, k_max, k_step, top_k):
+    """
+    모든 (k, n) 의 최대 오차를 구한 뒤 n 마다 최소 최대 오차와 그 값을 갖는 k 의 처음 / 마지막을 모음.
+    """
+    rows = []
+    for n in range(N_MIN, N_MAX + 1):
+        errors = [
+            (max(abs(model_total_score(k, n, days=day)[0] - x) for day, x in series), k)
+            for k in range(k_min, k_max + 1, k_step)
+        ]
+        best = min(err for err, _ in errors)
+        ks = [k for err, k in errors if err == best]
+        rows.append((best, ks[0], ks[-1], n))
+    return sorted(rows)[:top_k]
+
+
+@pytest.mark.parametrize("case", random_series_cases(seed=20240612, count=25))
+def test_series_matches_exhaustive_scan(case):
+    series, k_min, k_max, k_step, top_k = case
+    rows = search_series(series, k_min, k_max, k_step, top_k)
+    assert rows == scan_series(series, k_min, k_max, k_step, top_k)
+    # 순서를 섞어서 넣어도 같아야 함
+    assert search_series(list(reversed(series)), k_min, k_max, k_step, top_k) == rows
+
+
+def test_series_trajectory_known_series():
+    """
+    k=9800, n=12: m = 27 + 5000 // 80 = 89, P = 117,600 × 일차.
+    1일차 a = 120 + 500 + 640 = 1,260, 2일차는 126,000 / 180,000 을 넘어 +4,000, 3일차는 240,000 / 330,000 까지 +8,000.
+    """
+    series = [(3, 9939), (1, 1939), (2, 5939)]
+    assert series_trajectory(series, 9800, 12) == [(1, 1939, 1939, 0), (2, 5939, 5939, 0), (3, 9939, 9939, 0)]
+    # k=5000, n=7: m = 29, 1일차 P = 35,000 이라 a = 120 + 400 → 1,139
+    assert series_trajectory(series, 5000, 7)[0] == (1, 1939, 1139, -800)
+    diff, k_lo, k_hi, n = search_series(series, 3800, 50_000, 1, top_k=1)[0]
+    assert diff == 0 and n == 12 and k_lo <= 9800 <= k_hi
@@ -0,0 +1,192 @@
+"""
+배치 API 테스트. 빈 포트에 서버를 띄우고 http.client 로 요청을 보냄.
+"""
+
+import http.client
+import json
+import random
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from tot_calculator.damage import damage, weak_multiplier
+from tot_calculator.score import search_best_intervals, search_best_k_n, search_best_k_n_exact
+from tot_calculator.server import SEARCH_GRID_POINTS, Coalescer, evaluate_search, make_server, search_key
+
+
+@pytest.fixture(scope="module")
+def server():
+    srv = make_server(port=0)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+
+def request(server, method: str, path: str, body=None, headers=None):
+    conn = http.client.HTTPConnection(*server.server_address[:2], timeout=30)
+    try:
+        data = body if isinstance(body, (bytes, type(None))) else json.dumps(body).encode("utf-8")
+        conn.request(method, path, data, headers or {})
+        response = conn.getresponse()
+        return response.status, json.loads(response.read())
+    finally:
+        conn.close()
+
+
+def test_coalescer_does_not_wait_when_idle():
+    # 창을 일부러 길게 잡아도 한가할 때 들어온 요청은 바로 계산되어야 함
+    coalescer = Coalescer("echo", lambda keys: [key * 2 for key in keys], window=0.5)
+    for i in range(3):
+        start = time.perf_counter()
+        assert coalescer.submit([i, i + 100]) == [i * 2, (i + 100) * 2]
+        assert time.perf_counter() - start < 0.25
+        time.sleep(0.6)
+    assert coalescer.stats.batches == 3
+
+
+def test_coalescer_shares_duplicate_keys():
+    calls = []
+
+    def evaluate(keys):
+        calls.append(list(keys))
+        time.sleep(0.05)
+        return [key + 1 for key in keys]
+
+    coalescer = Coalescer("dup", evaluate, window=0.01)
+    with ThreadPoolExecutor(8) as pool:
+        outs = list(pool.map(lambda i: coalescer.submit([1, 2, 3]), range(8)))
+    assert outs == [[2, 3, 4]] * 8
+    assert sorted(key for batch in calls for key in batch) == [1, 2, 3]
+
+
+def test_damage_matches_scalar_formula(server):
+    builds = [{"atk": 4000 + i, "E_def": 5000, "def_coef": 30, "Weak_coef": i % 3} for i in range(50)]
+    status, out = request(server, "POST", "/damage", {"builds": builds})
+    assert status == 200
+    expected = [damage(b["atk"], 5000, 30, 0, 120, 100, weak_multiplier(b["Weak_coef"])) for b in builds]
+    assert out["damage"] == pytest.approx(expected, rel=1e-12)
+
+
+def test_concurrent_overlapping_requests(server):
+    builds = [{"atk": 4000 + i} for i in range(40)]
+
+    def send(i):
+        return request(server, "POST", "/damage", {"builds": builds[i % 10:i % 10 + 30] + [{"atk": 9000 + i}]})
+
+    with ThreadPoolExecutor(16) as pool:
+        outs = list(pool.map(send, range(64)))
+    assert all(status == 200 for status, _ in outs)
+    for i, (_, out) in enumerate(outs):
+        assert out["damage"][-1] == pytest.approx(damage(9000 + i, 5000, 30, 0, 120, 100))
+
+
+def test_search_matches_engines(server):
+    queries = [
+        {"x": 5000},
+        {"x": 5000, "top": 3},
+        {"x": 12345, "k_min": 0, "k_max": 2_000_000, "k_step": 1, "intervals": True, "top": 2},
+    ]
+    status, out = request(server, "POST", "/search", {"queries": queries})
+    assert status == 200
+    rows = [[tuple(r.values()) for r in result] for result in out["results"]]
+    assert rows[0] == search_best_k_n(5000, 3800, 50000, 20, 8, 5)
+    assert rows[1] == rows[0][:3]
+    assert rows[2] == search_best_intervals(12345, 0, 2_000_000, 1, 8, 2)
+
+
+def test_evaluate_search_batches_match_per_key_engines():
+    """
+    같은 격자를 쓰는 점 탐색 묶음 / 큰 격자 / 구간 탐색이 섞인 배치도 항목마다 계산한 결과와 같아야 함.
+    """
+    rng = random.Random(3)
+    queries = []
+    for _ in range(60):
+        grid = rng.choice([(3800, 50000, 20), (0, 30000, 7), (3800, 2_000_000, 1)])
+        queries.append({
+            "x": rng.randrange(600, 20000),
+            "days": rng.choice((7, 8)),
+            "k_min": grid[0],
+            "k_max": grid[1],
+            "k_step": grid[2],
+            "top": rng.randint(1, 12),
+            "intervals": rng.random() < 0.2,
+        })
+    keys = list(dict.fromkeys(search_key(q) for q in queries))
+    assert any(not key[0] and (key[4] - key[3]) // key[5] * 30 > SEARCH_GRID_POINTS for key in keys)
+
+    expected = [
+        (search_best_intervals if intervals else search_best_k_n_exact)(x, k_min, k_last, k_step, days, depth)
+        for intervals, x, days, k_min, k_last, k_step, depth in keys
+    ]
+    assert evaluate_search(keys) == expected
+
+
+@pytest.mark.parametrize(
+    "path, body, status",
+    [
+        ("/damage", {"builds": [{"E_def": 1}]}, 400),
+        ("/search", {"queries": [{"x": "a"}]}, 400),
+        ("/search", {"queries": [{"x": 5000, "days": 0}]}, 400),
+        ("/compare", {"pairs": [{"position": "x"}]}, 400),
+        ("/nope", {}, 404),
+        ("/search", [1], 400),
+        ("/damage", b"{bad", 400),
+    ],
+)
+def test_bad_requests_return_json_errors(server, path, body, status):
+    got, out = request(server, "POST", path, body, {"Content-Type": "application/json"})
+    assert got == status
+    assert "error" in out
+
+
+def test_evaluation_error_returns_500():
+    srv = make_server(port=0)
+
+    def fail(keys):
+        raise ArithmeticError("계산 불가")
+
+    srv.api.coalescers["damage"] = Coalescer("damage", fail, window=0)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    try:
+        for _ in range(2):  # 실패한 항목은 캐시에 남지 않으므로 다시 보내도 같은 오류
+            status, out = request(srv, "POST", "/damage", {"builds": [{"atk": 4000}]})
+            assert status == 500
+            assert "계산 불가" in out["error"]
+        assert request(srv, "GET", "/health") == (200, {"status": "ok"})
+    finally:
+        srv.shutdown()
+        srv.server_close()
+
+
+def raw_request(server, head: bytes) -> tuple[int, dict, bytes]:
+    """
+    http.client 는 Content-Length 를 알아서 붙이므로 헤더를 직접 써서 보냄. (상태, 본문 JSON, 남은 응답)
+    """
+    with socket.create_connection(server.server_address[:2], timeout=10) as sock:
+        sock.sendall(head)
+        response = http.client.HTTPResponse(sock)
+        response.begin()
+        body = json.loads(response.read())
+        return response.status, body, response.getheader("Connection", "")
+
+
+@pytest.mark.parametrize(
+    "header, status",
+    [
+        (b"", 411),
+        (b"Content-Length: abc\r\n", 400),
+        (b"Content-Length: -5\r\n", 400),
+        (b"Content-Length: 1.5\r\n", 400),
+        (b"Content-Length: 999999999999\r\n", 413),
+    ],
+)
+def test_bad_content_length(server, header, status):
+    head = b"POST /damage HTTP/1.1\r\nHost: test\r\n" + header + b"\r\n"
+    got, body, connection = raw_request(server, head)
+    assert got == status
+    assert "error" in body
+    assert connection.lower() == "close"
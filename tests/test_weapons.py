@@ -0,0 +1,106 @@
+"""
+무기 × 포지션 × 적 조건 비교 텐서와 순위가 칸마다 스칼라 compute_z 로 계산한 값과 맞는지 확인.
+"""
+
+import random
+
+import numpy as np
+import pytest
+
+from tot_calculator.damage import compute_z
+from tot_calculator.defaults import DEFAULT_COMMON
+from tot_calculator.weapons import DOLL_POSITIONS, WEAPON_OPTIONS, comparison_matrix, rank_weapons
+
+POSITIONS = list(DOLL_POSITIONS)
+E_DEF_VALUES = [0.0, 2500.0, 5000.0, 12_000.0]
+DEF_COEF_VALUES = [0.0, 30.0, 75.0, 100.0]
+
+
+def random_weapons(seed: int, count: int) -> dict:
+    rng = random.Random(seed)
+    return {
+        "wep_atk": [rng.uniform(200, 600) for _ in range(count)],
+        "option": [rng.choice(list(WEAPON_OPTIONS)) for _ in range(count)],
+        "def_ignore": [rng.uniform(0, 40) for _ in range(count)],
+        "dmg_buff": [rng.uniform(0, 30) for _ in range(count)],
+    }
+
+
+WEAPONS = random_weapons(seed=4, count=9)
+
+
+def scalar_damage(common: dict, weapons: dict, i: int, position: str, E_def: float, def_coef: float) -> float:
+    """
+    무기 i, 포지션 하나, 적 조건 하나의 데미지를 계산기 1 처럼 스칼라로 계산.
+    """
+    atk_per, ct_per = DOLL_POSITIONS[position]
+    wep_ak, wep_ct = WEAPON_OPTIONS[weapons["option"][i]]
+    atk = (common["atk_origin"] + weapons["wep_atk"][i]) * (1 + (common["atk_bonus"] + atk_per + wep_ak) * 0.01)
+    return compute_z(
+        common["buff_x"] + weapons["dmg_buff"][i],
+        common["buff_y"] + wep_ct + ct_per,
+        atk,
+        E_def,
+        min(weapons["def_ignore"][i] + def_coef, 100.0),
+        common["Weak_coef"],
+        common["sk_coef"],
+    )
+
+
+def scalar_tensor(common: dict, weapons: dict):
+    return [
+        [
+            [[scalar_damage(common, weapons, i, p, e, d) for d in DEF_COEF_VALUES] for e in E_DEF_VALUES]
+            for p in POSITIONS
+        ]
+        for i in range(len(weapons["wep_atk"]))
+    ]
+
+
+@pytest.mark.parametrize("common", [DEFAULT_COMMON, dict(DEFAULT_COMMON, Weak_coef=2.0, buff_x=40.0, sk_coef=320.0)])
+def test_matrix_cells_match_scalar_compute_z(common):
+    matrix = comparison_matrix(common, WEAPONS, POSITIONS, E_DEF_VALUES, DEF_COEF_VALUES)
+    assert matrix.shape == (9, len(POSITIONS), len(E_DEF_VALUES), len(DEF_COEF_VALUES))
+    np.testing.assert_allclose(matrix, scalar_tensor(common, WEAPONS), rtol=1e-12)
+
+
+def test_rank_matches_scalar_ordering():
+    scalar = scalar_tensor(DEFAULT_COMMON, WEAPONS)
+    mean_damage, relative, wins, rank = rank_weapons(
+        comparison_matrix(DEFAULT_COMMON, WEAPONS, POSITIONS, E_DEF_VALUES, DEF_COEF_VALUES)
+    )
+    n = len(WEAPONS["wep_atk"])
+    conditions = [(e, d) for e in range(len(E_DEF_VALUES)) for d in range(len(DEF_COEF_VALUES))]
+    for p in range(len(POSITIONS)):
+        cells = [[scalar[i][p][e][d] for e, d in conditions] for i in range(n)]
+        best = [max(cells[i][c] for i in range(n)) for c in range(len(conditions))]
+        expected_relative = [sum(cells[i][c] / best[c] * 100 for c in range(len(conditions))) / len(conditions)
+                             for i in range(n)]
+        np.testing.assert_allclose(relative[:, p], expected_relative, rtol=1e-12)
+        np.testing.assert_allclose(mean_damage[:, p], [sum(row) / len(row) for row in cells], rtol=1e-12)
+        winners = [max(range(n), key=lambda i: cells[i][c]) for c in range(len(conditions))]
+        assert wins[:, p].tolist() == [winners.count(i) for i in range(n)]
+        assert int(wins[:, p].sum()) == len(conditions)
+
+        order = sorted(range(n), key=lambda i: -expected_relative[i])
+        assert [int(np.flatnonzero(rank[:, p] == r + 1)[0]) for r in range(n)] == order
+
+
+def test_single_condition_rank_is_damage_order():
+    matrix = comparison_matrix(DEFAULT_COMMON, WEAPONS, POSITIONS, [5000.0], [30.0])
+    rank = rank_weapons(matrix)[3]
+    for p, position in enumerate(POSITIONS):
+        values = [scalar_damage(DEFAULT_COMMON, WEAPONS, i, position, 5000.0, 30.0) for i in range(9)]
+        by_damage = sorted(range(9), key=lambda i: -values[i])
+        assert [int(np.flatnonzero(rank[:, p] == r + 1)[0]) for r in range(9)] == by_damage
+
+
+def test_tied_weapons_keep_input_order():
+    weapons = {name: values[:1] * 3 for name, values in WEAPONS.items()}
+    mean_damage, relative, wins, rank = rank_weapons(
+        comparison_matrix(DEFAULT_COMMON, weapons, POSITIONS, E_DEF_VALUES, DEF_COEF_VALUES)
+    )
+    np.testing.assert_array_equal(relative, 100.0)
+    assert rank[:, 0].tolist() == [1, 2, 3]
+    # 동점이면 argmax 는 첫 번째 무기를 고름
+    assert wins[:, 0].tolist() == [len(E_DEF_VALUES) * len(DEF_COEF_VALUES), 0, 0]
@@ -0,0 +1,41 @@
+"""
+통합 데미지 & 점수 계산기의 계산 로직 모음.
+
+Streamlit UI(app.py)와 분리되어 있어 스크립트에서도 그대로 import 해서 사용할 수 있음.
+명령줄에서는 `python -m tot_calculator search --x 5000 --days 8` 처럼 사용 (cli.py 참고).
+
+이 패키지를 import 해도 점수 모델(순수 파이썬)만 불러오며, NumPy / 그래프 모듈은
+해당 기능의 하위 모듈을 import 할 때만 불러옴.
+"""
+
+from .score import (
+    BASE_SCORE,
+    BONUS_TABLE,
+    N_MAX,
+    N_MIN,
+    compute_a,
+    compute_m,
+    compute_P,
+    model_total_score,
+    search_best_intervals,
+    search_best_k_n,
+    search_best_k_n_exact,
+    search_series,
+    series_trajectory,
+)
+
+__all__ = [
+    "BASE_SCORE",
+    "BONUS_TABLE",
+    "N_MAX",
+    "N_MIN",
+    "compute_a",
+    "compute_m",
+    "compute_P",
+    "model_total_score",
+    "search_best_intervals",
+    "search_best_k_n",
+    "search_best_k_n_exact",
+    "search_series",
+    "series_trajectory",
+]
@@ -0,0 +1,225 @@
+"""
+CSV / Parquet 로드아웃 일괄 평가.
+
+파일을 청크 단위로 읽어 무기 A / B 데미지를 배열로 한 번에 계산하고, 결과를 바로
+출력 파일에 이어 씀. 한 번에 메모리에 올라가는 것은 청크 하나뿐이라
+파일 크기와 상관없이 메모리 사용량이 일정함.
+
+Parquet 은 pyarrow 가 있을 때만 지원함.
+"""
+
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from .damage import efficiency_percent
+from .weapons import DOLL_POSITIONS, WEAPON_OPTIONS, final_atk, weapon_damage
+
+# 입력 열과 기본값 (파일에 없는 열은 기본값 또는 사이드바 값으로 채움)
+COMMON_COLUMNS = ("E_def", "atk_origin", "atk_bonus", "def_coef", "Weak_coef", "sk_coef", "buff_x", "buff_y")
+WEAPON_COLUMNS = {
+    "wep_atk": 390.0,
+    "option": "공격 보너스 15%",
+    "def_ignore": 0.0,
+    "dmg_buff": 0.0,
+}
+DEFAULT_POSITION = "센티널"
+
+OUTPUT_COLUMNS = (
+    "final_atk_A", "damage_A", "final_atk_B", "damage_B", "diff", "efficiency_percent", "better",
+)
+
+FORMATS = ("csv", "parquet")
+DEFAULT_CHUNK_ROWS = 50_000
+
+
+@dataclass(frozen=True)
+class BulkReport:
+    rows: int
+    chunks: int
+    seconds: float
+
+    @property
+    def rows_per_sec(self) -> float:
+        return self.rows / self.seconds if self.seconds > 0 else float("inf")
+
+
+def _input_dtypes() -> defaultdict:
+    # 청크마다 타입 추론 결과가 달라지지 않도록 (예: 빈 열, 정수/실수) 알려진 열은 숫자/문자열로,
+    # 나머지 열은 그대로 옮겨 쓰기만 하므로 문자열로 고정
+    dtypes = defaultdict(lambda: "object", {name: "float64" for name in COMMON_COLUMNS})
+    dtypes["position"] = "object"
+    for side in ("A", "B"):
+        for name, default in WEAPON_COLUMNS.items():
+            dtypes[f"{name}_{side}"] = "object" if isinstance(default, str) else "float64"
+    return dtypes
+
+
+def input_columns() -> list[str]:
+    """
+    인식하는 입력 열 이름 전체 (position, {무기 열}_A, {무기 열}_B 포함).
+    """
+    weapon = [f"{name}_{side}" for side in ("A", "B") for name in WEAPON_COLUMNS]
+    return [*COMMON_COLUMNS, "position", *weapon]
+
+
+def _column(chunk: pd.DataFrame, name: str, default: float):
+    # 숫자 열을 float64 배열로. 열이 없으면 기본값 스칼라 (브로드캐스팅)
+    if name in chunk:
+        return chunk[name].fillna(default).to_numpy(dtype=np.float64)
+    return float(default)
+
+
+def _lookup(chunk: pd.DataFrame, name: str, default: str, table: dict, what: str):
+    """
+    문자열 열(포지션, 무기 옵션)을 표의 (공격 보너스 %, 치명 피해 %) 두 값으로 변환.
+    열이 없으면 기본값의 스칼라 두 개를 반환.
+    """
+    if name not in chunk:
+        return table[default]
+    values = chunk[name].fillna(default)
+    codes = pd.Index(list(table)).get_indexer(values)
+    if (codes < 0).any():
+        unknown = sorted(set(values[codes < 0].astype(str)))[:5]
+        raise ValueError(f"알 수 없는 {what}: {', '.join(unknown)}")
+    return np.array(list(table.values()), dtype=np.float64)[codes].T
+
+
+def evaluate_chunk(chunk: pd.DataFrame, defaults: dict) -> pd.DataFrame:
+    """
+    청크 하나의 무기 A / B 데미지를 계산해서 OUTPUT_COLUMNS 를 붙인 DataFrame 을 반환.
+    defaults: 파일에 없는 공통 열의 값 (사이드바 공통 변수와 같은 형태)
+    """
+    common = {name: _column(chunk, name, defaults[name]) for name in COMMON_COLUMNS}
+    atk_per, ct_per = _lookup(chunk, "position", DEFAULT_POSITION, DOLL_POSITIONS, "포지션")
+
+    results = {}
+    for side in ("A", "B"):
+        wep_ak, wep_ct = _lookup(chunk, f"option_{side}", WEAPON_COLUMNS["option"], WEAPON_OPTIONS, "무기 옵션")
+        wep_atk = _column(chunk, f"wep_atk_{side}", WEAPON_COLUMNS["wep_atk"])
+        results[f"final_atk_{side}"] = final_atk(common["atk_origin"], wep_atk, common["atk_bonus"], atk_per, wep_ak)
+        results[f"damage_{side}"] = weapon_damage(
+            common,
+            wep_atk=wep_atk,
+            wep_ak=wep_ak,
+            wep_ct=wep_ct,
+            def_ignore=_column(chunk, f"def_ignore_{side}", WEAPON_COLUMNS["def_ignore"]),
+            dmg_buff=_column(chunk, f"dmg_buff_{side}", WEAPON_COLUMNS["dmg_buff"]),
+            atk_per=atk_per,
+            ct_per=ct_per,
+        )
+
+    diff = results["damage_B"] - results["damage_A"]
+    results["diff"] = diff
+    results["efficiency_percent"] = efficiency_percent(results["damage_A"], results["damage_B"])
+    results["better"] = np.where(diff > 0, "B", np.where(diff < 0, "A", "="))
+
+    out = chunk.copy()
+    for name in OUTPUT_COLUMNS:
+        out[name] = results[name]
+    return out
+
+
+def iter_chunks(source, fmt: str, chunk_rows: int = DEFAULT_CHUNK_ROWS):
+    """
+    source(경로 또는 파일 객체)를 chunk_rows 행씩 DataFrame 으로 읽음.
+    """
+    if fmt == "csv":
+        yield from pd.read_csv(source, chunksize=chunk_rows, dtype=_input_dtypes())
+    elif fmt == "parquet":
+        _, pq = _require_pyarrow()
+        for batch in pq.ParquetFile(source).iter_batches(batch_size=chunk_rows):
+            yield batch.to_pandas()
+    else:
+        raise ValueError(f"지원하지 않는 형식: {fmt}")
+
+
+class _ChunkWriter:
+    """
+    청크를 하나씩 받아 CSV / Parquet 파일에 이어 씀.
+    """
+
+    def __init__(self, sink, fmt: str):
+        if fmt not in FORMATS:
+            raise ValueError(f"지원하지 않는 형식: {fmt}")
+        self.sink = sink
+        self.fmt = fmt
+        # pyarrow 쓰기 객체 (pandas CSV 로 쓰는 중이면 True)
+        self._writer = None
+        self._schema = None
+
+    def write(self, chunk: pd.DataFrame) -> None:
+        if self.fmt == "csv" and not _has_pyarrow():
+            # pandas 의 CSV 쓰기는 실수 서식 때문에 느려서 pyarrow 가 없을 때만 사용
+            chunk.to_csv(self.sink, header=self._writer is None, index=False)
+            self._writer = True
+            return
+
+        pa, pq = _require_pyarrow()
+        if self._writer is None:
+            # 첫 청크에서 값이 모두 비어 있는 문자열 열은 null 타입으로 추론되므로 string 으로 고정
+            schema = pa.Schema.from_pandas(chunk, preserve_index=False)
+            for i, field in enumerate(schema):
+                if pa.types.is_null(field.type):
+                    schema = schema.set(i, field.with_type(pa.string()))
+            self._schema = schema
+            if self.fmt == "csv":
+                import pyarrow.csv as pa_csv
+                self._writer = pa_csv.CSVWriter(self.sink, schema)
+            else:
+                self._writer = pq.ParquetWriter(self.sink, schema)
+        # 모든 청크를 첫 청크와 같은 스키마로 변환 (맞출 수 없으면 ArrowInvalid = ValueError)
+        self._writer.write_table(pa.Table.from_pandas(chunk, schema=self._schema, preserve_index=False))
+
+    def close(self) -> None:
+        if self._writer not in (None, True):
+            self._writer.close()
+
+
+def _has_pyarrow() -> bool:
+    try:
+        _require_pyarrow()
+    except ImportError:
+        return False
+    return True
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("Parquet 파일을 다루려면 pyarrow 가 필요합니다. (pip install pyarrow)") from e
+    return pa, pq
+
+
+def evaluate_file(
+    source,
+    sink,
+    defaults: dict,
+    *,
+    in_format: str = "csv",
+    out_format: str = "csv",
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    progress=None,
+) -> BulkReport:
+    """
+    source 를 청크 단위로 읽어 evaluate_chunk 결과를 sink 에 이어 씀.
+    progress(누적 행 수) 가 있으면 청크마다 호출함.
+    """
+    start = time.perf_counter()
+    rows = chunks = 0
+    writer = _ChunkWriter(sink, out_format)
+    try:
+        for chunk in iter_chunks(source, in_format, chunk_rows):
+            writer.write(evaluate_chunk(chunk, defaults))
+            rows += len(chunk)
+            chunks += 1
+            if progress is not None:
+                progress(rows)
+    finally:
+        writer.close()
+    return BulkReport(rows, chunks, time.perf_counter() - start)
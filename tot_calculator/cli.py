@@ -0,0 +1,299 @@
+"""
+Streamlit 없이 쓰는 명령줄 진입점.
+
+    python -m tot_calculator search --x 5000 --days 8
+    python -m tot_calculator series 1939 5939 9939 10539
+    python -m tot_calculator damage --atk 4155 --def 5000 --def-ignore 30
+    python -m tot_calculator bulk roster.csv result.parquet
+    python -m tot_calculator serve --port 8765
+    python -m tot_calculator startup
+
+기본 search 경로(구간 해석 엔진)는 순수 파이썬이라 NumPy 도 불러오지 않음.
+NumPy 가 필요한 엔진/명령은 실행할 때만 import 해서 시작 시간을 늘리지 않음.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from .defaults import DEFAULT_COMMON, INTERVAL_FIELDS, POINT_FIELDS, SERIES_FIELDS, TRAJECTORY_FIELDS
+from .score import SearchCancelled, search_best_intervals, search_best_k_n_exact, search_series, series_trajectory
+
+# search 기본 경로의 콜드 스타트 목표 (인터프리터 자체 시작 시간을 뺀 값, ms)
+COLD_START_TARGET_MS = 150.0
+
+# 기본 search 경로에서 불러오면 안 되는 모듈
+HEAVY_MODULES = ("numpy", "pandas", "matplotlib", "streamlit")
+
+SEARCH_ENGINES = ("auto", "interval", "python", "vectorized", "parallel", "index")
+
+
+def _print_rows(rows, fields, as_json: bool) -> None:
+    if as_json:
+        print(json.dumps([dict(zip(fields, row)) for row in rows], ensure_ascii=False))
+        return
+    table = [fields] + [tuple(str(v) for v in row) for row in rows]
+    widths = [max(len(str(line[i])) for line in table) for i in range(len(fields))]
+    for line in table:
+        print("  ".join(str(v).rjust(w) for v, w in zip(line, widths)))
+
+
+def _run_engine(args):
+    """
+    interval 이외 엔진은 planner 를 거쳐 실행 (NumPy 사용).
+    """
+    from .planner import plan_search, run_search
+
+    executor = index_cache = None
+    if args.engine == "parallel":
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        executor = ProcessPoolExecutor(max_workers=args.workers, mp_context=multiprocessing.get_context("spawn"))
+    if args.engine == "index":
+        from .score_index import ScoreIndexCache
+
+        index_cache = ScoreIndexCache(cache_dir=os.environ.get("TOT_INDEX_DIR") or None)
+
+    plan = plan_search(args.k_min, args.k_max, args.k_step, workers=args.workers, engine=args.engine)
+    try:
+        return run_search(
+            plan, args.x, args.k_min, args.k_max, args.k_step, args.days, args.top,
+            executor=executor, index_cache=index_cache, time_budget=args.time_budget,
+        )
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+
+def cmd_search(args) -> int:
+    if args.k_step <= 0:
+        raise SystemExit("--k-step 은 1 이상이어야 합니다.")
+    if args.intervals:
+        rows = search_best_intervals(args.x, args.k_min, args.k_max, args.k_step, args.days, args.top)
+        _print_rows(rows, INTERVAL_FIELDS, args.json)
+        return 0
+
+    if args.engine in ("auto", "interval"):
+        rows = search_best_k_n_exact(args.x, args.k_min, args.k_max, args.k_step, args.days, args.top)
+    else:
+        try:
+            rows = _run_engine(args)
+        except SearchCancelled:
+            print(f"--time-budget {args.time_budget:g}초를 넘어 탐색을 중단했습니다. k 범위를 줄이거나 예산을 늘려 주세요.",
+                  file=sys.stderr)
+            return 2
+    _print_rows(rows, POINT_FIELDS, args.json)
+    return 0
+
+
+def cmd_series(args) -> int:
+    if args.k_step <= 0:
+        raise SystemExit("--k-step 은 1 이상이어야 합니다.")
+    series = list(enumerate(args.scores, start=args.first_day))
+    try:
+        rows = search_series(series, args.k_min, args.k_max, args.k_step, args.top)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
+    if not rows:
+        raise SystemExit("결과가 없습니다. k 범위와 --top 값을 확인해 주세요.")
+    if args.json:
+        print(json.dumps({
+            "results": [dict(zip(SERIES_FIELDS, row)) for row in rows],
+            "trajectory": [dict(zip(TRAJECTORY_FIELDS, row)) for row in series_trajectory(series, rows[0][1], rows[0][3])],
+        }, ensure_ascii=False))
+        return 0
+    _print_rows(rows, SERIES_FIELDS, False)
+    print()
+    _print_rows(series_trajectory(series, rows[0][1], rows[0][3]), TRAJECTORY_FIELDS, False)
+    return 0
+
+
+def cmd_damage(args) -> int:
+    from .damage import damage, weak_multiplier
+
+    total_def = min(args.def_ignore, 100.0)
+    try:
+        value = damage(args.atk, args.E_def, total_def, args.dmg, args.crit, args.skill, weak_multiplier(args.weak))
+    except ZeroDivisionError:
+        print("공격력 + 적 방어력 × (1 - 방어 무시) 가 0 이라 데미지를 계산할 수 없습니다. --atk / --def / --def-ignore 를 확인해 주세요.",
+              file=sys.stderr)
+        return 2
+    if args.json:
+        print(json.dumps({"damage": value}))
+    else:
+        print(f"{value:.4f}")
+    return 0
+
+
+def _parse_overrides(pairs) -> dict:
+    common = dict(DEFAULT_COMMON)
+    for pair in pairs:
+        name, sep, value = pair.partition("=")
+        if not sep or name not in common:
+            raise SystemExit(f"--set 은 {', '.join(common)} 중 하나를 name=value 로 지정해야 합니다: {pair}")
+        common[name] = float(value)
+    return common
+
+
+def _format_of(path: str, fmt: str | None) -> str:
+    if fmt:
+        return fmt
+    return "parquet" if path.lower().endswith((".parquet", ".pq")) else "csv"
+
+
+def cmd_bulk(args) -> int:
+    from .bulk import evaluate_file
+
+    common = _parse_overrides(args.set)
+    in_format = _format_of(args.input, args.in_format)
+    out_format = _format_of(args.output, args.out_format)
+    # 입력 오류는 중간 청크에서야 드러날 수 있으므로 임시 파일에 다 쓴 뒤에 바꿔 넣음 (실패해도 기존 출력 파일은 그대로)
+    tmp_path = f"{args.output}.{os.getpid()}.tmp"
+    try:
+        try:
+            with open(tmp_path, "wb") as sink:
+                report = evaluate_file(
+                    args.input, sink, common,
+                    in_format=in_format, out_format=out_format, chunk_rows=args.chunk_rows,
+                )
+            os.replace(tmp_path, args.output)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+    except (ValueError, OSError, ImportError) as e:
+        print(f"일괄 평가 실패: {e}", file=sys.stderr)
+        return 2
+    print(
+        f"{report.rows:,} rows in {report.chunks} chunks, {report.seconds:.2f}s "
+        f"({report.rows_per_sec:,.0f} rows/s) -> {args.output}",
+        file=sys.stderr,
+    )
+    return 0
+
+
+def cmd_serve(args) -> int:
+    from .server import make_server
+
+    server = make_server(
+        args.host, args.port, window=args.window_ms / 1000, cache_entries=args.cache_entries
+    )
+    host, port = server.server_address[:2]
+    print(f"http://{host}:{port} 에서 요청을 받습니다. (Ctrl+C 로 종료)", file=sys.stderr, flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+def _wall_ms(cmd) -> float:
+    start = time.perf_counter()
+    subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL)
+    return (time.perf_counter() - start) * 1000
+
+
+def cmd_startup(args) -> int:
+    """
+    search 기본 경로의 콜드 스타트를 새 프로세스로 여러 번 재서 목표와 비교.
+    인터프리터 자체 시작 시간(python -c pass)은 환경마다 달라서 빼고 비교함.
+    """
+    search_cmd = [sys.executable, "-m", "tot_calculator", "search", "--x", "5000", "--days", "8"]
+    bare = statistics.median(_wall_ms([sys.executable, "-c", "pass"]) for _ in range(args.repeat))
+    full = statistics.median(_wall_ms(search_cmd) for _ in range(args.repeat))
+    overhead = full - bare
+
+    probe = (
+        "import sys, io, contextlib\n"
+        "from tot_calculator.cli import main\n"
+        "with contextlib.redirect_stdout(io.StringIO()):\n"
+        "    main(['search', '--x', '5000', '--days', '8'])\n"
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))\n"
+    )
+    loaded = subprocess.run(
+        [sys.executable, "-c", probe], check=True, capture_output=True, text=True
+    ).stdout.strip()
+
+    ok = overhead <= args.target and not loaded
+    print(f"python -c pass     : {bare:7.1f} ms")
+    print(f"search (cold start): {full:7.1f} ms")
+    print(f"overhead           : {overhead:7.1f} ms (target {args.target:.0f} ms)")
+    print(f"heavy modules      : {loaded or 'none'}")
+    print("OK" if ok else "FAIL")
+    return 0 if ok else 1
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m tot_calculator", description="통합 데미지 & 점수 계산기 (CLI)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("search", help="총 점수 x에 가장 가까운 (k, n) 조합 찾기")
+    p.add_argument("--x", type=int, required=True, help="총 점수 x")
+    p.add_argument("--days", type=int, default=8, help="진행 일수 (기본 8)")
+    p.add_argument("--k-min", type=int, default=3800)
+    p.add_argument("--k-max", type=int, default=50000)
+    p.add_argument("--k-step", type=int, default=20)
+    p.add_argument("--top", type=int, default=5, help="상위 몇 개 (기본 5)")
+    p.add_argument("--engine", choices=SEARCH_ENGINES, default="auto",
+                   help="auto/interval 은 순수 파이썬 구간 해석 (가장 빠름, 결과는 모두 동일)")
+    p.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="parallel 엔진 워커 수")
+    p.add_argument("--time-budget", type=float, default=None, help="최대 탐색 시간 (초)")
+    p.add_argument("--intervals", action="store_true", help="점수가 같은 k를 구간으로 묶어서 출력")
+    p.add_argument("--json", action="store_true", help="JSON 으로 출력")
+    p.set_defaults(func=cmd_search)
+
+    p = sub.add_parser("series", help="일차별 총 점수로 (k, n) 함께 추론")
+    p.add_argument("scores", type=int, nargs="+", help="일차별 총 점수 (first-day 일차부터 하루씩)")
+    p.add_argument("--first-day", type=int, default=1, help="첫 점수의 일차 (기본 1)")
+    p.add_argument("--k-min", type=int, default=3800)
+    p.add_argument("--k-max", type=int, default=50000)
+    p.add_argument("--k-step", type=int, default=1)
+    p.add_argument("--top", type=int, default=5, help="상위 몇 개 (기본 5)")
+    p.add_argument("--json", action="store_true", help="JSON 으로 출력")
+    p.set_defaults(func=cmd_series)
+
+    p = sub.add_parser("damage", help="최종 데미지 계산")
+    p.add_argument("--atk", type=float, required=True, help="공격력")
+    p.add_argument("--def", dest="E_def", type=float, default=DEFAULT_COMMON["E_def"], help="적 방어력")
+    p.add_argument("--def-ignore", type=float, default=DEFAULT_COMMON["def_coef"], help="방어 무시(%%)")
+    p.add_argument("--dmg", type=float, default=DEFAULT_COMMON["buff_x"], help="피해 증가(%%)")
+    p.add_argument("--crit", type=float, default=DEFAULT_COMMON["buff_y"], help="치명 피해(%%)")
+    p.add_argument("--skill", type=float, default=DEFAULT_COMMON["sk_coef"], help="스킬 계수(%%)")
+    p.add_argument("--weak", type=float, default=DEFAULT_COMMON["Weak_coef"], help="약점 (개)")
+    p.add_argument("--json", action="store_true")
+    p.set_defaults(func=cmd_damage)
+
+    p = sub.add_parser("bulk", help="CSV / Parquet 로드아웃 파일 일괄 평가")
+    p.add_argument("input")
+    p.add_argument("output")
+    p.add_argument("--in-format", choices=("csv", "parquet"), default=None, help="기본: 확장자로 판단")
+    p.add_argument("--out-format", choices=("csv", "parquet"), default=None, help="기본: 확장자로 판단")
+    p.add_argument("--chunk-rows", type=int, default=50_000)
+    p.add_argument("--set", action="append", default=[], metavar="NAME=VALUE",
+                   help="파일에 없는 공통 변수 값 (예: --set E_def=8000)")
+    p.set_defaults(func=cmd_bulk)
+
+    p = sub.add_parser("serve", help="로컬 HTTP / JSON 배치 API 서버 실행")
+    p.add_argument("--host", default="127.0.0.1", help="기본 127.0.0.1 (외부에서 접속하려면 0.0.0.0)")
+    p.add_argument("--port", type=int, default=8765, help="기본 8765 (0 이면 빈 포트)")
+    p.add_argument("--window-ms", type=float, default=1.0, help="요청을 모으는 시간 (ms, 0 이면 바로 계산)")
+    p.add_argument("--cache-entries", type=int, default=100_000, help="엔드포인트별 결과 캐시 항목 수 (0 이면 끔)")
+    p.set_defaults(func=cmd_serve)
+
+    p = sub.add_parser("startup", help="search 콜드 스타트 측정")
+    p.add_argument("--repeat", type=int, default=7)
+    p.add_argument("--target", type=float, default=COLD_START_TARGET_MS, help="목표 (ms)")
+    p.set_defaults(func=cmd_startup)
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
@@ -0,0 +1,177 @@
+"""
+무기 A / B 손익분기점(교차점) 해석 풀이.
+
+공격력, 적 방어력, 방어 무시 중 하나만 변수 t로 두면 두 무기의 데미지 비 B / A 는
+K · (α_A + β_A·t) / (α_B + β_B·t) 꼴의 1차 분수식이 됨. (방어 무시는 100% 상한 때문에 구간별로)
+그래서 교차점은 1차 방정식으로 정확히 풀리고, 효율은 구간마다 단조이므로
+극값은 구간 끝점에서만 생김. 격자 샘플링 없이 닫힌 식으로 계산함.
+"""
+
+import math
+from dataclasses import dataclass
+
+import numpy as np
+
+VARIABLES = ("atk", "E_def", "def_coef")
+
+
+@dataclass(frozen=True)
+class WeaponTerms:
+    """
+    무기 하나의 데미지 식 항. 데미지 = coef · atk² / (atk + E_def · (1 - 방어 무시 / 100))
+    - atk: 관리실 공격력
+    - coef: 피증 · 치피 · 약점 계수 · 스킬 계수의 곱
+    - def_ignore: 무기 자체 방어 무시(%) (공통 방어 무시는 따로 더함)
+    """
+    atk: float
+    coef: float
+    def_ignore: float
+
+
+def weapon_terms(atk, def_ignore, buff_x, buff_y, sk_coef, multiplier=1.0) -> WeaponTerms:
+    """
+    damage() 와 같은 인자로 WeaponTerms 생성.
+    """
+    coef = (1 + buff_x * 0.01) * multiplier * (sk_coef * 0.01) * (buff_y * 0.01)
+    return WeaponTerms(float(atk), float(coef), float(def_ignore))
+
+
+@dataclass(frozen=True)
+class RatioPiece:
+    """
+    [t_lo, t_hi] 에서 데미지 비 B / A = K · (alpha_A + beta_A·t) / (alpha_B + beta_B·t)
+    """
+    t_lo: float
+    t_hi: float
+    K: float
+    alpha_A: float
+    beta_A: float
+    alpha_B: float
+    beta_B: float
+
+    def ratio(self, t):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.divide(self.K * (self.alpha_A + self.beta_A * t), self.alpha_B + self.beta_B * t)
+
+    def crossing(self):
+        """
+        비가 1이 되는 t. 구간 전체에서 같으면 (t_lo, t_hi), 없으면 None.
+        """
+        if self.alpha_A * self.beta_B == self.alpha_B * self.beta_A:
+            # 분자/분모가 비례 (예: 적 방어력 0) → 비가 상수
+            const = self.K * (self.beta_A / self.beta_B if self.beta_B else self.alpha_A / self.alpha_B)
+            return (self.t_lo, self.t_hi) if const == 1 else None
+        slope = self.K * self.beta_A - self.beta_B
+        offset = self.alpha_B - self.K * self.alpha_A
+        if slope == 0:
+            return None
+        t = offset / slope
+        if self.t_lo <= t <= self.t_hi:
+            return (t, t)
+        return None
+
+
+def _remaining(terms: WeaponTerms, def_coef: float) -> float:
+    # 적 방어력 중 방어 무시 후 남는 비율
+    return 1 - min(terms.def_ignore + def_coef, 100.0) * 0.01
+
+
+def ratio_pieces(A: WeaponTerms, B: WeaponTerms, variable: str, E_def: float, def_coef: float,
+                 lo: float = 0.0, hi: float = math.inf) -> list[RatioPiece]:
+    """
+    variable 만 [lo, hi] 에서 바꿀 때의 데미지 비 B / A 를 1차 분수식 구간들로 나눔.
+
+    - "atk": 두 무기에 같은 공격력 t를 넣음 (효율 그래프의 x축). 계수 비만 다름
+    - "E_def": 적 방어력 t. 공격력/방어 무시는 각 무기 값
+    - "def_coef": 공통 방어 무시(%) t. 무기 방어 무시와 합이 100%를 넘는 지점에서 구간이 나뉨
+    """
+    if A.coef == 0:
+        raise ValueError("무기 A의 데미지 계수가 0이라 비율을 계산할 수 없습니다.")
+    if variable == "atk":
+        D_A = E_def * _remaining(A, def_coef)
+        D_B = E_def * _remaining(B, def_coef)
+        return [RatioPiece(lo, hi, B.coef / A.coef, D_A, 1.0, D_B, 1.0)]
+
+    P_A = A.coef * A.atk ** 2
+    P_B = B.coef * B.atk ** 2
+    if P_A == 0:
+        raise ValueError("무기 A의 데미지가 0이라 비율을 계산할 수 없습니다.")
+    K = P_B / P_A
+
+    if variable == "E_def":
+        return [RatioPiece(lo, hi, K, A.atk, _remaining(A, def_coef), B.atk, _remaining(B, def_coef))]
+
+    if variable == "def_coef":
+        hi = min(hi, 100.0)
+        caps = sorted({100.0 - A.def_ignore, 100.0 - B.def_ignore})
+        edges = [lo] + [c for c in caps if lo < c < hi] + [hi]
+        pieces = []
+        for t_lo, t_hi in zip(edges[:-1], edges[1:]):
+            terms = []
+            for w in (A, B):
+                # 방어 무시 합이 100% 미만인 구간에서만 t에 따라 분모가 줄어듦
+                if t_lo < 100.0 - w.def_ignore:
+                    terms += [w.atk + E_def * (1 - w.def_ignore * 0.01), -E_def * 0.01]
+                else:
+                    terms += [w.atk, 0.0]
+            pieces.append(RatioPiece(t_lo, t_hi, K, *terms))
+        return pieces
+
+    raise ValueError(f"알 수 없는 변수: {variable}")
+
+
+def break_even(A: WeaponTerms, B: WeaponTerms, variable: str, E_def: float, def_coef: float,
+               lo: float = 0.0, hi: float = math.inf) -> list[tuple[float, float]]:
+    """
+    두 무기의 데미지가 같아지는 variable 값.
+    각 항목은 (t_lo, t_hi) 이며 한 점에서 교차하면 t_lo == t_hi, 구간 전체에서 같으면 그 구간.
+    """
+    crossings = []
+    for piece in ratio_pieces(A, B, variable, E_def, def_coef, lo, hi):
+        crossing = piece.crossing()
+        if crossing is not None and (not crossings or crossing != crossings[-1]):
+            crossings.append(crossing)
+    return crossings
+
+
+def efficiency_extrema(A: WeaponTerms, B: WeaponTerms, variable: str, E_def: float, def_coef: float,
+                       lo: float, hi: float) -> tuple[tuple[float, float], tuple[float, float]]:
+    """
+    [lo, hi] 에서 B의 A 대비 효율(%)의 ((최솟값 위치, 최솟값), (최댓값 위치, 최댓값)).
+    구간마다 단조이므로 구간 끝점만 비교하면 됨. (atk=0 처럼 0/0 인 점은 극한값)
+    """
+    points = []
+    for piece in ratio_pieces(A, B, variable, E_def, def_coef, lo, hi):
+        for t in (piece.t_lo, piece.t_hi):
+            points.append((t, float((piece.ratio(t) - 1) * 100)))
+    points = [p for p in points if not math.isnan(p[1])]
+    return min(points, key=lambda p: p[1]), max(points, key=lambda p: p[1])
+
+
+def efficiency_asymptote(A: WeaponTerms, B: WeaponTerms, variable: str, E_def: float, def_coef: float) -> float:
+    """
+    variable → ∞ 일 때 효율(%)의 극한. ("atk", "E_def" 만)
+    """
+    if variable not in ("atk", "E_def"):
+        raise ValueError(f"{variable} 은(는) 상한이 있어 극한이 없습니다.")
+    piece = ratio_pieces(A, B, variable, E_def, def_coef)[-1]
+    if piece.beta_B == 0:
+        return math.inf if piece.beta_A > 0 else (piece.K * piece.alpha_A / piece.alpha_B - 1) * 100
+    return (piece.K * piece.beta_A / piece.beta_B - 1) * 100
+
+
+def adaptive_samples(lo: float, hi: float, features, n: int = 200, spread: float = 0.1) -> np.ndarray:
+    """
+    [lo, hi] 의 그래프 샘플 (최대 n개). 절반은 균등하게, 나머지는 features(교차점, 현재 값 등)
+    양옆 spread × 범위 안에 기하급수 간격으로 몰아서 배치하고, features 자체도 샘플에 포함함.
+    """
+    features = sorted({float(f) for f in features if lo <= f <= hi})
+    if not features:
+        return np.linspace(lo, hi, n)
+
+    uniform = np.linspace(lo, hi, max(2, n // 2))
+    per_feature = max(2, (n - uniform.size - len(features)) // (2 * len(features)))
+    offsets = np.geomspace(1e-4, spread, per_feature) * (hi - lo)
+    clustered = [np.concatenate((f - offsets, f + offsets)) for f in features]
+    samples = np.concatenate([uniform, np.asarray(features), *clustered])
+    return np.unique(np.clip(samples, lo, hi))
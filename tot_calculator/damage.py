@@ -0,0 +1,61 @@
+"""
+데미지 공식.
+
+z = (공격력² / (공격력 + 적 방어력 · (1 - 방깎))) · 피증 · 약점계수 · 스킬계수 · 치피
+
+모든 함수는 스칼라와 NumPy 배열을 모두 받으며, 배열이면 브로드캐스팅으로 한 번에 계산함.
+"""
+
+import numpy as np
+
+
+def weak_multiplier(Weak_coef):
+    """
+    약점 개수 → 약점 계수 (0개: 1.0, 1개: 1.1, 2개: 1.2)
+    """
+    return 1 + Weak_coef * 0.1
+
+
+def damage(atk, E_def, def_coef, buff_x, buff_y, sk_coef, multiplier=1.0):
+    """
+    최종 데미지.
+    - atk: 공격력, E_def: 적 방어력, def_coef: 방어 무시(%)
+    - buff_x: 피해 증가(%), buff_y: 치명 피해(%), sk_coef: 스킬 계수(%)
+    - multiplier: 약점 계수 (weak_multiplier 참고)
+    """
+    numer = atk ** 2
+    denomi = atk + E_def * (1 - def_coef * 0.01)
+    return (
+        (numer / denomi)
+        * (1 + buff_x * 0.01)
+        * multiplier
+        * (sk_coef * 0.01)
+        * (buff_y * 0.01)
+    )
+
+
+def compute_z(buff_x, buff_y, atk, E_def, def_coef, Weak_coef, sk_coef):
+    """
+    무기 효율 계산기(계산기 1)의 인자 순서를 그대로 쓰는 최종 데미지.
+    """
+    return damage(atk, E_def, def_coef, buff_x, buff_y, sk_coef, weak_multiplier(Weak_coef))
+
+
+def damage_batch(atk, E_def, def_coef, buff_x, buff_y, sk_coef, multiplier=1.0) -> np.ndarray:
+    """
+    damage 의 배치 버전. 모든 입력을 float64 배열로 바꿔 브로드캐스팅하고 결과를 배열로 반환.
+    분모가 0인 경우(공격력 0, 방어력 0 등)는 예외 대신 nan/inf 가 됨.
+    """
+    args = [np.asarray(v, dtype=np.float64) for v in (atk, E_def, def_coef, buff_x, buff_y, sk_coef, multiplier)]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.asarray(damage(*args), dtype=np.float64)
+
+
+def efficiency_percent(damage_A, damage_B):
+    """
+    무기 B의 A 대비 효율(%) = (B / A - 1) × 100. A가 0이면 0.
+    """
+    damage_A = np.asarray(damage_A, dtype=np.float64)
+    damage_B = np.asarray(damage_B, dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(damage_A != 0, (damage_B / damage_A - 1) * 100, 0.0)
@@ -0,0 +1,23 @@
+"""
+CLI / 배치 API 가 함께 쓰는 기본값과 결과 필드 이름.
+
+어디서 import 해도 가볍도록 다른 모듈을 불러오지 않음 (CLI 콜드 스타트 경로에서도 쓰임).
+"""
+
+# 사이드바 공통 변수 기본값 (bulk / API 에서 입력에 없는 값을 채울 때 사용)
+DEFAULT_COMMON = {
+    "E_def": 5000.0,
+    "atk_origin": 1661.0,
+    "atk_bonus": 65.6,
+    "def_coef": 30.0,
+    "Weak_coef": 0.0,
+    "sk_coef": 100.0,
+    "buff_x": 0.0,
+    "buff_y": 120.0,
+}
+
+# 탐색 결과 튜플의 필드 이름 (score 모듈의 결과 순서와 같음)
+POINT_FIELDS = ("diff", "k", "n", "x_hat", "P", "a", "m")
+INTERVAL_FIELDS = ("diff", "k_lo", "k_hi", "n", "x_hat", "a", "m")
+SERIES_FIELDS = ("max_diff", "k_lo", "k_hi", "n")
+TRAJECTORY_FIELDS = ("day", "x", "x_hat", "diff")
@@ -0,0 +1,48 @@
+"""
+무거운 모듈(pandas, matplotlib 등)을 처음 쓰는 순간에 불러오고, 걸린 시간을 기록.
+
+앱을 처음 띄울 때(컨테이너 재시작 직후 등) 모든 모듈을 미리 불러오지 않아서
+첫 화면이 빨리 그려짐. 기록은 프로세스 단위라 세션이 바뀌어도 유지됨.
+"""
+
+import importlib
+import sys
+import threading
+import time
+
+# 모듈 이름 → 처음 import 하는 데 걸린 시간(초). 불러온 순서대로 저장됨
+IMPORT_TIMES: dict[str, float] = {}
+
+_lock = threading.Lock()
+
+
+def lazy_import(name: str):
+    """
+    importlib.import_module 과 같지만, 이 프로세스에서 처음 불러오는 모듈이면 걸린 시간을 기록함.
+    (의존 모듈을 처음 불러오는 시간까지 포함)
+    """
+    if name in IMPORT_TIMES:
+        return sys.modules[name]
+    with _lock:
+        loaded = name in sys.modules
+        start = time.perf_counter()
+        module = importlib.import_module(name)
+        # 다른 경로로 이미 불러온 모듈이면 0으로 기록
+        IMPORT_TIMES.setdefault(name, 0.0 if loaded else time.perf_counter() - start)
+    return module
+
+
+def record_import(name: str, seconds: float) -> None:
+    """
+    lazy_import 를 거치지 않은 초기화 단계(앱 시작 import 등)의 시간을 한 번만 기록.
+    """
+    with _lock:
+        IMPORT_TIMES.setdefault(name, seconds)
+
+
+def import_report() -> list[tuple[str, float]]:
+    """
+    (모듈 이름, 걸린 시간(초)) 목록. 불러온 순서대로.
+    """
+    with _lock:
+        return list(IMPORT_TIMES.items())
@@ -0,0 +1,106 @@
+"""
+(k, n) 탐색 결과 메모.
+
+같은 (target_x, days, k_min, k_max, k_step) 로 다시 탐색하면 저장해 둔 결과를 그대로 쓰고,
+상위 개수(top_k)만 바뀌면 저장된 후보를 잘라서 반환함. 결과는 MEMO_TOP_K 개까지 넉넉히 저장함.
+
+k 범위를 넓히면 (k_step 이 같고 격자가 맞을 때) 이미 탐색한 구간은 건너뛰고
+새 구간만 탐색한 뒤 parallel.merge_top 으로 합치면 됨. 결과는 순서까지 전체 탐색과 완전히 동일함.
+(결과는 (diff, k, n) 순으로 정렬되어 있어 구간별 상위 후보를 합치면 전체 상위 후보가 됨)
+"""
+
+from dataclasses import dataclass
+
+# 탐색할 때 저장해 둘 상위 후보 수 (계산기 3의 top_k 슬라이더 최대값)
+MEMO_TOP_K = 20
+MAX_MEMO_ENTRIES = 16
+
+
+def grid_last(k_min: int, k_max: int, k_step: int) -> int:
+    """
+    k_min + i * k_step ≤ k_max 인 마지막 격자점. (k_max 가 격자 사이에 있어도 같은 탐색이 되도록)
+    """
+    return k_min + (k_max - k_min) // k_step * k_step
+
+
+@dataclass(frozen=True)
+class MemoEntry:
+    target_x: int
+    days: int
+    k_step: int
+    k_min: int
+    k_last: int
+    # 저장할 때 요청한 후보 수. 결과가 이보다 적으면 격자 전체가 들어 있는 것
+    depth: int
+    rows: tuple
+
+    def covers(self, top_k: int) -> bool:
+        return top_k <= self.depth or len(self.rows) < self.depth
+
+
+class SearchMemo:
+    """
+    세션 하나의 탐색 결과 메모 (st.session_state 에 저장해서 사용).
+    가장 오래 쓰지 않은 항목부터 버리며 MAX_MEMO_ENTRIES 개까지 유지함.
+    """
+
+    def __init__(self, max_entries: int = MAX_MEMO_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: dict[tuple, MemoEntry] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _key(target_x, days, k_min, k_max, k_step) -> tuple:
+        return (target_x, days, k_step, k_min, grid_last(k_min, k_max, k_step))
+
+    def lookup(self, target_x: int, days: int, k_min: int, k_max: int, k_step: int, top_k: int):
+        """
+        저장된 결과의 상위 top_k개. 없거나 top_k개를 채울 수 없으면 None.
+        """
+        key = self._key(target_x, days, k_min, k_max, k_step)
+        entry = self._entries.get(key)
+        if entry is None or not entry.covers(top_k):
+            return None
+        # 최근 사용 순서 갱신
+        self._entries[key] = self._entries.pop(key)
+        return list(entry.rows[:top_k])
+
+    def extension(self, target_x: int, days: int, k_min: int, k_max: int, k_step: int, depth: int):
+        """
+        새 범위 안에 들어가고 상위 depth개를 모두 가진 저장 결과 중 격자점을 가장 많이 덮는 것을 골라
+        (재사용할 결과, 새로 탐색할 (k_lo, k_hi) 구간 목록) 을 반환.
+        재사용할 결과가 없으면 ([], [(k_min, k_max)]).
+        """
+        k_last = grid_last(k_min, k_max, k_step)
+        best = None
+        for entry in self._entries.values():
+            if (
+                entry.target_x == target_x
+                and entry.days == days
+                and entry.k_step == k_step
+                and (entry.k_min - k_min) % k_step == 0
+                and k_min <= entry.k_min
+                and entry.k_last <= k_last
+                and entry.covers(depth)
+                and (best is None or entry.k_last - entry.k_min > best.k_last - best.k_min)
+            ):
+                best = entry
+        if best is None:
+            return [], [(k_min, k_max)]
+
+        missing = []
+        if k_min < best.k_min:
+            missing.append((k_min, best.k_min - k_step))
+        if best.k_last < k_last:
+            missing.append((best.k_last + k_step, k_last))
+        return list(best.rows), missing
+
+    def store(self, target_x: int, days: int, k_min: int, k_max: int, k_step: int, depth: int, rows) -> None:
+        key = self._key(target_x, days, k_min, k_max, k_step)
+        self._entries.pop(key, None)
+        self._entries[key] = MemoEntry(target_x, days, k_step, key[3], key[4], depth, tuple(rows))
+        while len(self._entries) > self.max_entries:
+            del self._entries[next(iter(self._entries))]
+
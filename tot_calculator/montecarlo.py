@@ -0,0 +1,164 @@
+"""
+치명타 / 약점 적중 몬테카를로 시뮬레이션.
+
+기존 데미지 공식은 모든 타격이 치명타(치피 buff_y)이고 약점에 맞는다고 가정한 값 하나만 줌.
+여기서는 전투 한 번(타격 hits번)의 총 데미지 분포를 구함.
+
+타격 하나의 데미지 = 기본 데미지 × (치명타면 치피, 아니면 1) × (약점이면 약점 계수, 아니면 1)
+이므로 전투 총 데미지는 전투별 (치명타 수, 약점 수, 치명타 & 약점 수) 만으로 정해짐.
+
+- 타격마다 float32 난수 하나로 (치명, 약점) 조합을 한꺼번에 뽑고 전투별로 개수만 셈.
+- 난수는 최대 chunk_hits 개씩 청크로 만들어서 메모리 사용량이 일정함.
+- 난수는 전투 순서, 타격 순서대로 소비하므로 같은 seed 면 청크 크기와 상관없이 결과가 같음.
+- 무기 A / B 는 같은 타격 결과(같은 난수)를 공유해서 비교함 (공통 난수).
+"""
+
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+from .damage import damage_batch
+
+DEFAULT_SEED = 12345
+# 한 청크에서 만드는 난수 개수 (float32 4MB 분량 × 비교용 임시 배열)
+DEFAULT_CHUNK_HITS = 1 << 20
+MAX_FIGHTS = 1_000_000
+# 한 번에 시뮬레이션할 총 타격 수 상한 (한 코어에서 수 초 이내)
+MAX_TOTAL_HITS = 500_000_000
+HISTOGRAM_BINS = 60
+PERCENTILES = (5, 50, 95)
+
+
+@dataclass(frozen=True)
+class HitProfile:
+    """
+    무기 하나의 타격 데미지 구성. base 는 치명타 / 약점이 아닐 때의 데미지.
+    """
+    base: float
+    crit_mult: float
+    weak_mult: float
+
+    def total(self, hits: int, n_crit, n_weak, n_both):
+        # Σ (1 + (c-1)·치명 + (w-1)·약점 + (c-1)(w-1)·둘 다)
+        c, w = self.crit_mult - 1, self.weak_mult - 1
+        return self.base * (hits + c * n_crit + w * n_weak + c * w * n_both)
+
+
+def hit_profile(atk, E_def, def_coef, buff_x, buff_y, sk_coef, multiplier=1.0) -> HitProfile:
+    """
+    damage 와 같은 인자에서 타격 구성을 만듦. (치명 피해 buff_y%, 약점 계수 multiplier)
+    """
+    base = float(damage_batch(atk, E_def, def_coef, buff_x, 100.0, sk_coef, 1.0))
+    return HitProfile(base, buff_y * 0.01, float(multiplier))
+
+
+@dataclass(frozen=True)
+class DamageSummary:
+    mean: float
+    std: float
+    p5: float
+    p50: float
+    p95: float
+
+    @classmethod
+    def of(cls, totals: np.ndarray) -> "DamageSummary":
+        p5, p50, p95 = np.percentile(totals, PERCENTILES)
+        return cls(float(totals.mean()), float(totals.std()), float(p5), float(p50), float(p95))
+
+
+@dataclass(frozen=True)
+class SimulationResult:
+    fights: int
+    hits: int
+    seconds: float
+    summaries: dict
+    # B 가 A 보다 총 데미지가 큰 전투 비율 (무기가 두 개일 때)
+    win_rate: float | None
+    # 공통 구간으로 나눈 전투 총 데미지 히스토그램
+    bin_edges: np.ndarray
+    counts: dict
+
+    @property
+    def hits_per_sec(self) -> float:
+        return self.fights * self.hits / self.seconds if self.seconds > 0 else float("inf")
+
+
+def simulate_counts(
+    fights: int,
+    hits: int,
+    crit_rate: float,
+    weak_rate: float,
+    seed: int = DEFAULT_SEED,
+    chunk_hits: int = DEFAULT_CHUNK_HITS,
+):
+    """
+    전투 fights번 × 타격 hits번을 시뮬레이션해서 전투별 (치명타 수, 약점 수, 치명타 & 약점 수) 배열을 반환.
+    crit_rate / weak_rate 는 타격 하나가 치명타 / 약점일 확률(%) 이며 서로 독립.
+    """
+    if fights <= 0 or hits <= 0:
+        raise ValueError("전투 횟수와 타격 수는 1 이상이어야 합니다.")
+    pc = min(max(crit_rate * 0.01, 0.0), 1.0)
+    pw = min(max(weak_rate * 0.01, 0.0), 1.0)
+    # u 하나로 조합을 뽑음: [0, t_both) 치명+약점, [t_both, t_crit) 치명만, [t_crit, t_weak) 약점만
+    t_both = np.float32(pc * pw)
+    t_crit = np.float32(pc)
+    t_weak = np.float32(pc + (1 - pc) * pw)
+
+    n_crit = np.zeros(fights, dtype=np.int64)
+    n_weak = np.zeros(fights, dtype=np.int64)
+    n_both = np.zeros(fights, dtype=np.int64)
+
+    rng = np.random.default_rng(seed)
+    fights_per_chunk = max(1, min(fights, chunk_hits // hits))
+    # 전투 하나의 타격 수가 청크보다 크면 전투 하나를 여러 청크로 나눔
+    hits_per_chunk = min(hits, max(1, chunk_hits // fights_per_chunk))
+    for f0 in range(0, fights, fights_per_chunk):
+        f1 = min(f0 + fights_per_chunk, fights)
+        for h0 in range(0, hits, hits_per_chunk):
+            u = rng.random((f1 - f0, min(hits_per_chunk, hits - h0)), dtype=np.float32)
+            both = np.count_nonzero(u < t_both, axis=1)
+            crit = np.count_nonzero(u < t_crit, axis=1)
+            n_both[f0:f1] += both
+            n_crit[f0:f1] += crit
+            n_weak[f0:f1] += np.count_nonzero(u < t_weak, axis=1) - crit + both
+    return n_crit, n_weak, n_both
+
+
+def simulate_fights(
+    profiles: dict,
+    fights: int,
+    hits: int,
+    crit_rate: float,
+    weak_rate: float,
+    seed: int = DEFAULT_SEED,
+    chunk_hits: int = DEFAULT_CHUNK_HITS,
+    bins: int = HISTOGRAM_BINS,
+) -> SimulationResult:
+    """
+    profiles({이름: HitProfile}) 의 전투 총 데미지 분포를 같은 타격 결과로 시뮬레이션.
+    이름이 두 개 이상이면 win_rate 는 두 번째가 첫 번째보다 큰 전투 비율.
+    """
+    if fights > MAX_FIGHTS:
+        raise ValueError(f"전투 횟수는 {MAX_FIGHTS:,}번 이하여야 합니다.")
+    if fights * hits > MAX_TOTAL_HITS:
+        raise ValueError(f"전투 횟수 × 타격 수는 {MAX_TOTAL_HITS:,} 이하여야 합니다.")
+    start = time.perf_counter()
+    counts = simulate_counts(fights, hits, crit_rate, weak_rate, seed, chunk_hits)
+    totals = {name: profile.total(hits, *counts) for name, profile in profiles.items()}
+    seconds = time.perf_counter() - start
+
+    names = list(totals)
+    win_rate = float(np.mean(totals[names[1]] > totals[names[0]])) if len(names) > 1 else None
+    lo = min(float(t.min()) for t in totals.values())
+    hi = max(float(t.max()) for t in totals.values())
+    edges = np.linspace(lo, hi if hi > lo else lo + 1, bins + 1)
+    return SimulationResult(
+        fights=fights,
+        hits=hits,
+        seconds=seconds,
+        summaries={name: DamageSummary.of(t) for name, t in totals.items()},
+        win_rate=win_rate,
+        bin_edges=edges,
+        counts={name: np.histogram(t, bins=edges)[0] for name, t in totals.items()},
+    )
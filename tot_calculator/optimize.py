@@ -0,0 +1,196 @@
+"""
+부가 스탯 배분 최적화.
+
+정해진 포인트를 피해 증가 / 치명 피해 / 공격 보너스 / 방어 무시에 나눠서
+최종 데미지가 가장 큰 배분을 찾음. 포인트 하나가 각 스탯 몇 %가 되는지는 rates 로 정함.
+
+방어 무시 항은 데미지에 대해 볼록이라 전체 식이 오목하지 않으므로, 경사 하강 대신
+정수 배분 단체(simplex) 격자를 NumPy로 한 번에 평가함. 예산이 EXHAUSTIVE_BUDGET(69) 포인트
+이하이면 모든 배분을 평가하고, 그보다 크면 성긴 격자에서 최적점을 찾은 뒤 그 주변을 1포인트 단위로 다시 훑음.
+"""
+
+import math
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+
+from .damage import damage_batch, weak_multiplier
+
+STATS = ("buff_x", "buff_y", "atk_bonus", "def_coef")
+STAT_LABELS = {
+    "buff_x": "피해 증가",
+    "buff_y": "치명 피해",
+    "atk_bonus": "공격 보너스",
+    "def_coef": "방어 무시",
+}
+
+# 한 번에 평가할 배분 후보 수 상한 (수 ms 안에 끝나는 크기)
+MAX_GRID_POINTS = 60_000
+_MAX_REFINE_STEPS = 32
+
+
+@dataclass(frozen=True)
+class Allocation:
+    points: dict
+    damage: float
+    base_damage: float
+
+    @property
+    def gain_percent(self) -> float:
+        return (self.damage / self.base_damage - 1) * 100 if self.base_damage else 0.0
+
+
+def base_from_common(common: dict, wep_atk: float = 0.0, atk_per: float = 0.0, ct_per: float = 0.0) -> dict:
+    """
+    사이드바 공통 변수 (+ 무기 공격력, 포지션 보정)로 최적화 기준 스탯을 만듦.
+    """
+    return {
+        "atk": common["atk_origin"] + wep_atk,
+        "atk_bonus": common["atk_bonus"] + atk_per,
+        "buff_x": common["buff_x"],
+        "buff_y": common["buff_y"] + ct_per,
+        "def_coef": common["def_coef"],
+        "E_def": common["E_def"],
+        "sk_coef": common["sk_coef"],
+        "multiplier": weak_multiplier(common["Weak_coef"]),
+    }
+
+
+def allocation_damage(base: dict, rates: dict, alloc) -> np.ndarray:
+    """
+    alloc: (..., 4) 배열, STATS 순서의 포인트 수. 배분 후 최종 데미지를 반환.
+    """
+    alloc = np.asarray(alloc, dtype=np.float64)
+    gains = {stat: alloc[..., i] * rates[stat] for i, stat in enumerate(STATS)}
+    atk = base["atk"] * (1 + (base["atk_bonus"] + gains["atk_bonus"]) * 0.01)
+    return damage_batch(
+        atk,
+        base["E_def"],
+        np.minimum(base["def_coef"] + gains["def_coef"], 100.0),
+        base["buff_x"] + gains["buff_x"],
+        base["buff_y"] + gains["buff_y"],
+        base["sk_coef"],
+        base["multiplier"],
+    )
+
+
+@lru_cache(maxsize=16)
+def _compositions(units: int) -> np.ndarray:
+    """
+    합이 units 인 음이 아닌 정수 4개 조합 전체 ((units+3)C3, 4) 배열.
+    """
+    a, b, c = np.meshgrid(*(np.arange(units + 1),) * 3, indexing="ij")
+    keep = a + b + c <= units
+    a, b, c = a[keep], b[keep], c[keep]
+    comps = np.stack((a, b, c, units - a - b - c), axis=1)
+    comps.flags.writeable = False
+    return comps
+
+
+def _grid_units(max_points: int) -> int:
+    # (units+3)C3 <= max_points 인 가장 큰 units
+    units = 0
+    while math.comb(units + 4, 3) <= max_points:
+        units += 1
+    return units
+
+
+# 모든 배분을 평가하는 최대 예산: 72C3 = 59,640 <= MAX_GRID_POINTS < 73C3 = 62,196 이므로 69
+EXHAUSTIVE_BUDGET = _grid_units(MAX_GRID_POINTS)
+
+
+def _neighborhood(center, budget: int, radius: int) -> np.ndarray:
+    """
+    center 주변 (앞 세 스탯 ±radius) 에서 합이 budget 인 정수 배분.
+    """
+    offsets = np.arange(-radius, radius + 1)
+    a, b, c = np.meshgrid(center[0] + offsets, center[1] + offsets, center[2] + offsets, indexing="ij")
+    a, b, c = a.ravel(), b.ravel(), c.ravel()
+    d = budget - a - b - c
+    keep = (a >= 0) & (b >= 0) & (c >= 0) & (d >= 0)
+    return np.stack((a[keep], b[keep], c[keep], d[keep]), axis=1)
+
+
+def optimize_allocation(base: dict, budget: int, rates: dict, max_points: int = MAX_GRID_POINTS) -> Allocation:
+    """
+    budget 포인트의 최적 정수 배분.
+
+    (budget+3)C3 가 max_points 이하이면 모든 배분을 평가하므로 정확한 최적해.
+    그보다 크면 성긴 격자 → 주변 1포인트 단위 재탐색을 개선이 없을 때까지 반복.
+    """
+    if budget < 0:
+        raise ValueError("포인트 예산은 0 이상이어야 합니다.")
+    base_damage = float(allocation_damage(base, rates, np.zeros(len(STATS))))
+
+    units = _grid_units(max_points)
+    if budget <= units:
+        candidates = _compositions(budget)
+    else:
+        coarse = _compositions(units) * (budget / units)
+        best = coarse[int(np.nanargmax(allocation_damage(base, rates, coarse)))]
+        center = np.floor(best).astype(np.int64)
+        radius = math.ceil(budget / units)
+        # 앞 세 스탯 ±radius 격자가 max_points 를 넘지 않게
+        radius = min(radius, (round(max_points ** (1 / 3)) - 1) // 2)
+        # 최적점이 창 중앙에 올 때까지 창을 옮김 (매번 데미지가 커지므로 반드시 끝남)
+        for _ in range(_MAX_REFINE_STEPS):
+            candidates = _neighborhood(center, budget, radius)
+            best = candidates[int(np.nanargmax(allocation_damage(base, rates, candidates)))]
+            if np.array_equal(best[:3], center[:3]):
+                break
+            center = best
+
+    values = allocation_damage(base, rates, candidates)
+    i = int(np.nanargmax(values))
+    points = {stat: int(candidates[i, j]) for j, stat in enumerate(STATS)}
+    return Allocation(points, float(values[i]), base_damage)
+
+
+def apply_allocation(base: dict, rates: dict, points: dict) -> dict:
+    """
+    배분을 더한 스탯 dict (base 와 같은 형태).
+    """
+    stats = dict(base)
+    for stat in STATS:
+        stats[stat] = base[stat] + points.get(stat, 0) * rates[stat]
+    return stats
+
+
+def marginal_gains(stats: dict) -> dict:
+    """
+    각 스탯 +1%(%p) 당 ln(데미지) 증가량 (해석적 미분).
+    방어 무시가 이미 100% 이상이면 0.
+    """
+    atk = stats["atk"] * (1 + stats["atk_bonus"] * 0.01)
+    remaining = stats["E_def"] * (1 - min(stats["def_coef"], 100.0) * 0.01)
+    denom = atk + remaining
+    return {
+        "buff_x": 0.01 / (1 + stats["buff_x"] * 0.01),
+        "buff_y": 1 / stats["buff_y"] if stats["buff_y"] else math.inf,
+        "atk_bonus": (2 / atk - 1 / denom) * stats["atk"] * 0.01 if atk else math.inf,
+        "def_coef": stats["E_def"] * 0.01 / denom if stats["def_coef"] < 100 else 0.0,
+    }
+
+
+def equivalence_table(stats: dict, rates: dict | None = None) -> list[dict]:
+    """
+    스탯별 한계 효율 표. 각 행:
+    - stat: 스탯 키
+    - gain_percent: +1% 당 데미지 증가(%)
+    - buff_x_equiv: 피해 증가 몇 %와 같은지
+    - per_point_percent: 포인트 하나당 데미지 증가(%) (rates 가 있을 때)
+    """
+    grads = marginal_gains(stats)
+    reference = grads["buff_x"]
+    rows = []
+    for stat in STATS:
+        row = {
+            "stat": stat,
+            "gain_percent": grads[stat] * 100,
+            "buff_x_equiv": grads[stat] / reference if reference else math.inf,
+        }
+        if rates is not None:
+            row["per_point_percent"] = grads[stat] * rates[stat] * 100
+        rows.append(row)
+    return rows
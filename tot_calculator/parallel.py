@@ -0,0 +1,115 @@
+"""
+(k, n) 브루트포스 탐색을 k 구간(샤드)으로 나눠 여러 프로세스에서 실행.
+
+샤드마다 상위 top_k개를 구한 뒤 (diff, k, n) 순으로 병합하므로
+순차 탐색(search_best_k_n)과 결과가 완전히 동일함.
+"""
+
+import heapq
+import itertools
+from concurrent.futures import FIRST_COMPLETED, wait
+
+from . import perf
+from .score import N_MAX, N_MIN, SearchCancelled
+from .vectorized import DEFAULT_CHUNK_K, search_best_k_n_vec
+
+# 샤드 하나에 들어갈 최소 k 개수 (너무 잘게 나누면 프로세스 통신 비용이 더 큼)
+MIN_SHARD_K = 16_384
+
+# 샤드가 끝나기를 기다리는 동안 should_stop 을 확인하는 간격 (초)
+STOP_POLL_SEC = 0.05
+
+
+def shard_ranges(k_min: int, k_max: int, k_step: int, shards: int) -> list[tuple[int, int]]:
+    """
+    탐색 격자 k_min + i * k_step (≤ k_max) 를 최대 shards개의 연속 구간으로 나눔.
+    각 구간은 (shard_k_min, shard_k_max) 이며 격자점에서 시작하고 끝남.
+    """
+    if k_max < k_min:
+        return []
+    grid_size = (k_max - k_min) // k_step + 1
+    shards = max(1, min(shards, grid_size // MIN_SHARD_K or 1))
+    per_shard = -(-grid_size // shards)
+
+    ranges = []
+    for first in range(0, grid_size, per_shard):
+        last = min(first + per_shard, grid_size) - 1
+        ranges.append((k_min + first * k_step, k_min + last * k_step))
+    return ranges
+
+
+def merge_top(result_lists, top_k: int):
+    """
+    (diff, k, n) 순으로 정렬된 샤드별 결과를 합쳐 상위 top_k개 반환.
+    """
+    merged = heapq.merge(*result_lists, key=lambda r: (r[0], r[1], r[2]))
+    return list(itertools.islice(merged, top_k))
+
+
+def _search_shard(args):
+    # 프로세스 풀에서 실행되므로 모듈 최상위 함수여야 함
+    return search_best_k_n_vec(*args)
+
+
+def search_best_k_n_parallel(
+    target_x: int,
+    k_min: int,
+    k_max: int,
+    k_step: int,
+    days: int,
+    top_k: int = 5,
+    executor=None,
+    workers: int = 1,
+    shards: int | None = None,
+    progress=None,
+    chunk_size: int = DEFAULT_CHUNK_K,
+    should_stop=None,
+):
+    """
+    search_best_k_n 과 같은 결과를 executor(프로세스 풀)로 나눠 계산.
+
+    - workers: executor 의 워커 수 (샤드 수 기본값 계산에 씀)
+    - shards: 샤드 개수 (기본: 워커 수의 4배)
+    - progress: progress(완료 샤드 수, 전체 샤드 수) 콜백. 샤드가 끝날 때마다 호출됨.
+    - should_stop: 샤드를 기다리는 동안 STOP_POLL_SEC 마다 확인해서 참이면 아직 시작하지 않은 샤드를 취소하고
+      SearchCancelled 를 던짐. (이미 실행 중인 샤드는 워커에서 끝까지 돌지만 결과를 기다리지 않음)
+    executor가 없으면 현재 프로세스에서 샤드를 차례로 실행함. (should_stop 은 청크마다 확인)
+    """
+    if k_step <= 0:
+        raise ValueError("k_step은 1 이상이어야 합니다.")
+    if top_k <= 0:
+        return []
+
+    if shards is None:
+        shards = max(1, workers) * 4
+    ranges = shard_ranges(k_min, k_max, k_step, shards)
+    tasks = [(target_x, lo, hi, k_step, days, top_k, chunk_size) for lo, hi in ranges]
+
+    shard_results = []
+    if executor is None:
+        for done, task in enumerate(tasks, start=1):
+            shard_results.append(search_best_k_n_vec(*task, should_stop=should_stop))
+            if progress is not None:
+                progress(done, len(tasks))
+    else:
+        futures = {executor.submit(_search_shard, task): task for task in tasks}
+        pending = set(futures)
+        try:
+            while pending:
+                finished, pending = wait(
+                    pending, timeout=None if should_stop is None else STOP_POLL_SEC, return_when=FIRST_COMPLETED
+                )
+                for future in finished:
+                    shard_results.append(future.result())
+                    # 다른 프로세스에서 센 격자점 수는 보이지 않으므로 여기서 샤드 단위로 셈
+                    _, lo, hi, *_ = futures[future]
+                    perf.count("search.grid_points", ((hi - lo) // k_step + 1) * (N_MAX - N_MIN + 1))
+                    if progress is not None:
+                        progress(len(shard_results), len(tasks))
+                if pending and should_stop is not None and should_stop():
+                    raise SearchCancelled("탐색이 중단되었습니다.")
+        finally:
+            for future in futures:
+                future.cancel()
+
+    return merge_top(shard_results, top_k)
@@ -0,0 +1,217 @@
+"""
+재실행(rerun) 단위 성능 계측.
+
+계산기 하나가 한 번 실행되는 동안 단계별(위젯 읽기 / 계산 / 그래프 생성 / 이미지 변환 /
+표 그리기) 시간과 카운터(탐색한 격자점 수 등)를 모아 RerunTrace 하나로 남김.
+
+    with perf.trace_rerun("calc1") as trace:
+        ...                       # 위젯 읽기
+        perf.lap("widgets")       # 직전 lap 이후 시간을 widgets 단계로
+        with perf.phase("figure"):
+            ...
+        perf.count("search.grid_points", 30)
+
+trace_rerun 밖에서 phase / count 를 부르면 아무것도 하지 않으므로, 계산 모듈에서
+그대로 호출해도 CLI / 스크립트 실행에는 영향이 없음. 표준 라이브러리만 사용함.
+
+- 각 trace 는 "tot_calculator.perf" 로거에 JSON 한 줄로 기록됨.
+  TOT_PERF_LOG 에 파일 경로를 지정하면 그 파일에 JSON Lines 로 이어 씀.
+- TOT_PROFILE 에 파일 경로를 지정하면 프로세스의 TOT_PROFILE_RERUN 번째(기본 1) 재실행
+  한 번을 cProfile 로 재서 그 파일(pstats 형식)로 저장함. 전체 재실행과 프래그먼트 재실행을
+  모두 하나로 셈 (예: 첫 화면 다음에 계산기 버튼을 누른 재실행은 2).
+"""
+
+import contextlib
+import contextvars
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+
+# 단계 이름 → 패널 표시 이름 (표시 순서)
+PHASES = {
+    "widgets": "위젯 읽기",
+    "compute": "계산",
+    "figure": "그래프 생성",
+    "serialize": "이미지 변환/전송",
+    "table": "표 그리기",
+}
+
+logger = logging.getLogger(__name__)
+
+_current: contextvars.ContextVar = contextvars.ContextVar("tot_perf_trace", default=None)
+
+_log_lock = threading.Lock()
+_log_configured = False
+
+_profile_lock = threading.Lock()
+_profile_reruns = 0
+# profile_once 블록 안에서 다시 부르면 (전체 재실행 안의 프래그먼트) 따로 세지 않음
+_in_profile_block: contextvars.ContextVar = contextvars.ContextVar("tot_perf_profile_block", default=False)
+
+
+@dataclass
+class RerunTrace:
+    calculator: str
+    started_at: float = field(default_factory=time.time)
+    phases: dict = field(default_factory=dict)
+    counters: dict = field(default_factory=dict)
+    total: float = 0.0
+    # 마지막 lap 시점과 그때까지 단계별 시간 합 (lap 사이에 phase 로 잰 시간은 빼기 위함)
+    _lap_start: float = field(default_factory=time.perf_counter, repr=False)
+    _lap_phases: float = field(default=0.0, repr=False)
+
+    @property
+    def other(self) -> float:
+        """
+        어느 단계에도 속하지 않은 시간 (마크다운 등 나머지 위젯 그리기).
+        """
+        return max(self.total - sum(self.phases.values()), 0.0)
+
+    def to_record(self) -> dict:
+        return {
+            "event": "rerun",
+            "calculator": self.calculator,
+            "started_at": round(self.started_at, 3),
+            "total_ms": round(self.total * 1000, 3),
+            "phases_ms": {name: round(seconds * 1000, 3) for name, seconds in self.phases.items()},
+            "other_ms": round(self.other * 1000, 3),
+            "counters": dict(self.counters),
+        }
+
+
+def current_trace() -> RerunTrace | None:
+    return _current.get()
+
+
+@contextlib.contextmanager
+def phase(name: str):
+    """
+    현재 trace 의 name 단계에 걸린 시간을 더함. (같은 단계를 여러 번 재면 합산)
+    단계 안에서 다른 단계를 열면 안쪽 단계 시간은 바깥 단계에서 빠짐.
+    """
+    trace = _current.get()
+    if trace is None:
+        yield
+        return
+    start = time.perf_counter()
+    before = sum(trace.phases.values())
+    try:
+        yield
+    finally:
+        nested = sum(trace.phases.values()) - before
+        elapsed = time.perf_counter() - start - nested
+        trace.phases[name] = trace.phases.get(name, 0.0) + elapsed
+
+
+def lap(name: str) -> None:
+    """
+    직전 lap(없으면 trace 시작) 이후 지금까지의 시간을 name 단계에 더함.
+    그 사이에 phase 로 따로 잰 시간은 빼고 더함.
+    """
+    trace = _current.get()
+    if trace is None:
+        return
+    now = time.perf_counter()
+    recorded = sum(trace.phases.values())
+    elapsed = now - trace._lap_start - (recorded - trace._lap_phases)
+    trace.phases[name] = trace.phases.get(name, 0.0) + elapsed
+    trace._lap_start = now
+    trace._lap_phases = recorded + elapsed
+
+
+def count(name: str, value: int = 1) -> None:
+    """
+    현재 trace 의 카운터 name 에 value 를 더함.
+    """
+    trace = _current.get()
+    if trace is not None:
+        trace.counters[name] = trace.counters.get(name, 0) + value
+
+
+def _configure_log_file() -> None:
+    # TOT_PERF_LOG 가 있으면 처음 한 번만 파일 핸들러를 붙임
+    global _log_configured
+    with _log_lock:
+        if _log_configured:
+            return
+        _log_configured = True
+        path = os.environ.get("TOT_PERF_LOG")
+        if path:
+            handler = logging.FileHandler(path, encoding="utf-8")
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            logger.addHandler(handler)
+            logger.setLevel(logging.INFO)
+
+
+def log_trace(trace: RerunTrace) -> None:
+    _configure_log_file()
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(json.dumps(trace.to_record(), ensure_ascii=False))
+
+
+@contextlib.contextmanager
+def trace_rerun(calculator: str):
+    """
+    블록 하나를 calculator 의 재실행 한 번으로 계측하고, 끝나면 로그로 남김.
+    중간에 예외가 나도 (Streamlit 의 재실행 중단 포함) 그때까지의 기록은 남김.
+    """
+    trace = RerunTrace(calculator)
+    token = _current.set(trace)
+    start = time.perf_counter()
+    # 첫 lap 은 전체 시간과 같은 시점부터 잼
+    trace._lap_start = start
+    try:
+        yield trace
+    finally:
+        trace.total = time.perf_counter() - start
+        _current.reset(token)
+        log_trace(trace)
+
+
+def _claim_profile() -> bool:
+    # 이번 재실행이 TOT_PROFILE_RERUN 번째이면 True
+    global _profile_reruns
+    target = int(os.environ.get("TOT_PROFILE_RERUN", "1"))
+    with _profile_lock:
+        _profile_reruns += 1
+        return _profile_reruns == target
+
+
+@contextlib.contextmanager
+def profile_once(path: str | None = None):
+    """
+    재실행 한 번을 감싸는 블록. path(기본: TOT_PROFILE)가 있으면 TOT_PROFILE_RERUN 번째 블록만
+    cProfile 로 재서 path 에 pstats 형식으로 저장하고, 누적 시간 상위 30개 함수를 표준 에러에 출력함.
+    path 가 없으면 아무것도 하지 않음.
+    """
+    path = path or os.environ.get("TOT_PROFILE")
+    if not path or _in_profile_block.get():
+        yield
+        return
+    token = _in_profile_block.set(True)
+    try:
+        if not _claim_profile():
+            yield
+            return
+        # search CLI 시작 시간에 포함되지 않도록 쓸 때만 불러옴
+        import cProfile
+        import io
+        import pstats
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            profiler.dump_stats(path)
+            summary = io.StringIO()
+            pstats.Stats(profiler, stream=summary).sort_stats("cumulative").print_stats(30)
+            # JSON Lines 로그와 섞이지 않도록 표준 에러로 출력
+            print(f"cProfile 결과를 {path} 에 저장했습니다.\n{summary.getvalue()}", file=sys.stderr)
+    finally:
+        _in_profile_block.reset(token)
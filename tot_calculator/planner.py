@@ -0,0 +1,194 @@
+"""
+(k, n) 탐색 계획기.
+
+탐색 범위로 격자점 수를 추정해서 가장 싼 엔진을 고르고,
+실행 전에 예상 시간/메모리를 알려주며, 시간 예산을 넘기면 탐색을 중단함.
+모든 엔진은 search_best_k_n 과 같은 결과를 반환함.
+"""
+
+import time
+from dataclasses import dataclass
+
+from .parallel import search_best_k_n_parallel
+from .score import N_MAX, N_MIN, search_best_k_n, search_best_k_n_exact
+from .score_index import INDEX_K_MAX
+from .vectorized import search_best_k_n_vec
+
+ENGINES = ("python", "vectorized", "parallel", "index", "interval")
+
+# 엔진별 대략적인 처리 속도 (단일 코어 기준 측정값)
+PYTHON_POINTS_PER_SEC = 450_000
+VECTORIZED_POINTS_PER_SEC = 40_000_000
+VECTORIZED_OVERHEAD_SEC = 0.001
+PARALLEL_OVERHEAD_SEC = 0.3
+PARALLEL_EFFICIENCY = 0.8
+INTERVAL_SEC = 0.01
+INDEX_LOOKUP_SEC = 0.002
+INDEX_BUILD_SEC = 0.25
+INDEX_BYTES = 13 * 1024 * 1024
+
+# 벡터화 엔진이 격자점 하나당 잡는 메모리 (int64 임시 배열 약 6개)
+BYTES_PER_POINT = 48
+MIN_CHUNK_K = 1024
+MAX_CHUNK_K = 131_072
+
+
+@dataclass(frozen=True)
+class SearchPlan:
+    engine: str
+    grid_points: int
+    est_seconds: float
+    est_bytes: int
+    chunk_size: int
+    within_budget: bool
+    # parallel 엔진의 워커 수
+    workers: int = 1
+
+
+def count_grid_points(k_min: int, k_max: int, k_step: int) -> int:
+    """
+    탐색할 (k, n) 격자점 수 = k 개수 × n 개수(30)
+    """
+    if k_max < k_min:
+        return 0
+    return ((k_max - k_min) // k_step + 1) * (N_MAX - N_MIN + 1)
+
+
+def _chunk_size(memory_budget: int | None, workers: int = 1) -> int:
+    if memory_budget is None:
+        return MAX_CHUNK_K // 4
+    per_k = BYTES_PER_POINT * (N_MAX - N_MIN + 1) * workers
+    return max(MIN_CHUNK_K, min(MAX_CHUNK_K, memory_budget // per_k))
+
+
+def estimate_engine(
+    engine: str,
+    k_min: int,
+    k_max: int,
+    k_step: int,
+    *,
+    workers: int = 1,
+    index_ready: bool = False,
+    memory_budget: int | None = None,
+) -> tuple[float, int, int]:
+    """
+    엔진 하나의 (예상 시간(초), 예상 메모리(byte), 청크 크기) 추정.
+    """
+    points = count_grid_points(k_min, k_max, k_step)
+    points_per_chunk_k = N_MAX - N_MIN + 1
+
+    if engine == "python":
+        return points / PYTHON_POINTS_PER_SEC, 0, 0
+    if engine == "vectorized":
+        chunk = _chunk_size(memory_budget)
+        chunk_points = min(points, chunk * points_per_chunk_k)
+        return VECTORIZED_OVERHEAD_SEC + points / VECTORIZED_POINTS_PER_SEC, chunk_points * BYTES_PER_POINT, chunk
+    if engine == "parallel":
+        chunk = _chunk_size(memory_budget, workers)
+        chunk_points = min(points, chunk * points_per_chunk_k)
+        speed = VECTORIZED_POINTS_PER_SEC * max(1.0, workers * PARALLEL_EFFICIENCY)
+        return PARALLEL_OVERHEAD_SEC + points / speed, chunk_points * BYTES_PER_POINT * workers, chunk
+    if engine == "index":
+        if index_ready:
+            return INDEX_LOOKUP_SEC, 0, 0
+        return INDEX_BUILD_SEC + INDEX_LOOKUP_SEC, INDEX_BYTES, 0
+    if engine == "interval":
+        return INTERVAL_SEC, 0, 0
+    raise ValueError(f"알 수 없는 엔진: {engine}")
+
+
+def plan_search(
+    k_min: int,
+    k_max: int,
+    k_step: int,
+    *,
+    workers: int = 1,
+    allow_analytic: bool = True,
+    index_ready: bool = False,
+    time_budget: float | None = None,
+    memory_budget: int | None = None,
+    engine: str | None = None,
+) -> SearchPlan:
+    """
+    예상 시간이 가장 짧은 엔진을 고름. (engine을 지정하면 그 엔진으로 계획만 세움)
+
+    - allow_analytic=False 이면 모든 격자점을 직접 계산하는 엔진(python/vectorized/parallel)만 고려
+    - time_budget(초), memory_budget(byte) 을 넘는 엔진은 되도록 피하고,
+      어느 엔진도 예산 안에 못 들면 within_budget=False 로 표시
+    """
+    if k_step <= 0:
+        raise ValueError("k_step은 1 이상이어야 합니다.")
+
+    if engine is not None:
+        candidates = [engine]
+    else:
+        candidates = ["python", "vectorized"]
+        if workers > 1:
+            candidates.append("parallel")
+        if allow_analytic:
+            candidates.append("interval")
+            if k_max <= INDEX_K_MAX:
+                candidates.append("index")
+
+    plans = []
+    for name in candidates:
+        seconds, nbytes, chunk = estimate_engine(
+            name, k_min, k_max, k_step,
+            workers=workers, index_ready=index_ready, memory_budget=memory_budget,
+        )
+        within = (time_budget is None or seconds <= time_budget) and (
+            memory_budget is None or nbytes <= memory_budget
+        )
+        plans.append(SearchPlan(name, count_grid_points(k_min, k_max, k_step), seconds, nbytes, chunk, within, workers))
+
+    # 예산 안에 드는 계획을 먼저, 그 안에서는 예상 시간이 짧은 순
+    return min(plans, key=lambda p: (not p.within_budget, p.est_seconds))
+
+
+def make_deadline(seconds: float | None):
+    """
+    지금부터 seconds초가 지나면 참을 반환하는 should_stop 콜백. (None이면 제한 없음)
+    """
+    if seconds is None:
+        return None
+    deadline = time.perf_counter() + seconds
+    return lambda: time.perf_counter() > deadline
+
+
+def run_search(
+    plan: SearchPlan,
+    target_x: int,
+    k_min: int,
+    k_max: int,
+    k_step: int,
+    days: int,
+    top_k: int = 5,
+    *,
+    executor=None,
+    index_cache=None,
+    time_budget: float | None = None,
+    progress=None,
+):
+    """
+    plan.engine 으로 탐색을 실행. 시간 예산을 넘기면 SearchCancelled 가 발생함.
+    """
+    should_stop = make_deadline(time_budget)
+
+    if plan.engine == "python":
+        return search_best_k_n(target_x, k_min, k_max, k_step, days, top_k, should_stop=should_stop)
+    if plan.engine == "vectorized":
+        return search_best_k_n_vec(
+            target_x, k_min, k_max, k_step, days, top_k,
+            chunk_size=plan.chunk_size, should_stop=should_stop,
+        )
+    if plan.engine == "parallel":
+        return search_best_k_n_parallel(
+            target_x, k_min, k_max, k_step, days, top_k,
+            executor=executor, workers=plan.workers, progress=progress,
+            chunk_size=plan.chunk_size, should_stop=should_stop,
+        )
+    if plan.engine == "index":
+        return index_cache.get(days).lookup_points(target_x, k_min, k_max, k_step, top_k=top_k)
+    if plan.engine == "interval":
+        return search_best_k_n_exact(target_x, k_min, k_max, k_step, days, top_k)
+    raise ValueError(f"알 수 없는 엔진: {plan.engine}")
@@ -0,0 +1,155 @@
+"""
+계산기 그래프 렌더링.
+
+pyplot 전역 상태(figure manager)를 거치지 않고 Figure 객체를 직접 만들어
+PNG 바이트로 렌더링한 뒤 바로 정리함. 그래서 재실행이 반복돼도 figure가 쌓이지 않음.
+"""
+
+from io import BytesIO
+
+from matplotlib.figure import Figure
+
+# st.pyplot 기본값과 같은 저장 옵션
+SAVEFIG_KWARGS = {"format": "png", "bbox_inches": "tight", "dpi": 200}
+
+
+def figure_to_png(fig: Figure, dpi: int | None = None) -> bytes:
+    """
+    Figure를 PNG 바이트로 렌더링하고 그려진 요소를 모두 해제.
+    dpi를 주면 기본값(200) 대신 사용 (미리보기용 저해상도 렌더링 등).
+    """
+    buf = BytesIO()
+    kwargs = dict(SAVEFIG_KWARGS)
+    if dpi is not None:
+        kwargs["dpi"] = dpi
+    try:
+        fig.savefig(buf, **kwargs)
+    finally:
+        fig.clear()
+    return buf.getvalue()
+
+
+def efficiency_figure(
+    atk_range, damage_curve_A, damage_curve_B, efficiency_curve, final_atk_A, final_atk_B, crossovers=()
+) -> Figure:
+    """
+    계산기 1 : 공격력에 따른 무기 A/B 데미지 곡선과 효율(B vs A) 그래프
+    crossovers 에 준 공격력(손익분기점)은 초록 세로선으로 표시
+    """
+    fig = Figure(figsize=(9, 6))
+    ax1 = fig.add_subplot(111)
+    ax1.plot(atk_range, damage_curve_A, label="Weapon A", color="blue")
+    ax1.plot(atk_range, damage_curve_B, label="Weapon B", color="red")
+    ax1.axvline(final_atk_A, color="blue", linestyle=":")
+    ax1.axvline(final_atk_B, color="red", linestyle=":")
+    for atk in crossovers:
+        ax1.axvline(atk, color="green", linestyle="-.", linewidth=1)
+    ax1.set_xlabel("ATK")
+    ax1.set_ylabel("Final Damage")
+    ax1.legend(loc="upper left")
+    ax1.grid(True)
+
+    ax2 = ax1.twinx()
+    ax2.plot(atk_range, efficiency_curve, label="Efficiency (B vs A, %)", color="green", linestyle="--")
+    ax2.set_ylabel("Efficiency (%)")
+    ax2.axhline(0, color="black", linestyle=":")
+    ax2.legend(loc="upper right")
+    return fig
+
+
+def surface_figure(X, Y, Z, x, y, z_val, atk, defense, w) -> Figure:
+    """
+    계산기 2 : 피해증가 × 치명피해 격자에 대한 3D 데미지 곡면과 현재 위치
+    """
+    from mpl_toolkits.mplot3d import Axes3D  # noqa: F401  (projection='3d' 등록, 3D 그래프에서만 필요)
+
+    fig = Figure(figsize=(10, 7))
+    ax = fig.add_subplot(111, projection='3d')
+    ax.plot_surface(X, Y, Z, cmap='plasma', edgecolor='none', alpha=0.8)
+    ax.scatter(x, y, z_val, color='red', s=50, label='Current')
+    ax.set_xlabel('Dmg Increase (%)')
+    ax.set_ylabel('Crit (%)')
+    ax.set_zlabel('Actual Dmg')
+    ax.set_title(f'3D Dmg Graph (atk={atk}, def={defense}, w={w}%)')
+    ax.legend()
+    return fig
+
+
+def surface_preview_figure(X, Y, Z, x, y, z_val, atk, defense, w) -> Figure:
+    """
+    계산기 2 : 입력이 바뀌는 동안 보여줄 가벼운 와이어프레임 미리보기
+    """
+    from mpl_toolkits.mplot3d import Axes3D  # noqa: F401  (projection='3d' 등록, 3D 그래프에서만 필요)
+
+    fig = Figure(figsize=(10, 7))
+    ax = fig.add_subplot(111, projection='3d')
+    ax.plot_wireframe(X, Y, Z, color='#7c3aed', linewidth=0.6)
+    ax.scatter(x, y, z_val, color='red', s=50, label='Current')
+    ax.set_xlabel('Dmg Increase (%)')
+    ax.set_ylabel('Crit (%)')
+    ax.set_zlabel('Actual Dmg')
+    ax.set_title(f'3D Dmg Graph (atk={atk}, def={defense}, w={w}%) - preview')
+    ax.legend()
+    return fig
+
+
+def weapon_heatmap_figure(values, weapon_names, E_def_values, title) -> Figure:
+    """
+    다중 무기 비교 : 무기 × 적 방어력별 최고 무기 대비 데미지(%) 히트맵
+    """
+    fig = Figure(figsize=(10, max(3.0, 0.35 * len(weapon_names) + 1.5)))
+    ax = fig.add_subplot(111)
+    image = ax.imshow(
+        values,
+        aspect="auto",
+        cmap="viridis",
+        interpolation="nearest",
+        extent=(E_def_values[0], E_def_values[-1], len(weapon_names) - 0.5, -0.5),
+    )
+    ax.set_yticks(range(len(weapon_names)))
+    ax.set_yticklabels(weapon_names)
+    ax.set_xlabel("Enemy DEF")
+    ax.set_title(title)
+    fig.colorbar(image, ax=ax, label="% of best weapon")
+    return fig
+
+
+def damage_distribution_figure(bin_edges, counts: dict, summaries: dict) -> Figure:
+    """
+    계산기 1 : 몬테카를로 전투 총 데미지 분포 (무기별 히스토그램, p5 / p95 는 점선, 평균은 실선)
+    """
+    colors = ("blue", "red", "green", "purple")
+    fig = Figure(figsize=(9, 4.5))
+    ax = fig.add_subplot(111)
+    for (name, values), color in zip(counts.items(), colors):
+        ax.stairs(values, bin_edges, fill=True, alpha=0.3, color=color, label=f"Weapon {name}")
+        summary = summaries[name]
+        ax.axvline(summary.mean, color=color, linewidth=1)
+        for p in (summary.p5, summary.p95):
+            ax.axvline(p, color=color, linestyle=":", linewidth=1)
+    ax.set_xlabel("Total damage per fight")
+    ax.set_ylabel("Fights")
+    ax.legend(loc="upper left")
+    ax.grid(True, alpha=0.3)
+    return fig
+
+
+def rotation_figure(per_turn, labels) -> Figure:
+    """
+    계산기 1 : 스킬 로테이션 턴별 데미지 (막대) 와 누적 데미지 (선, 오른쪽 축). per_turn 은 (무기, 턴) 배열
+    """
+    fig = Figure(figsize=(9, 4.5))
+    ax1 = fig.add_subplot(111)
+    ax2 = ax1.twinx()
+    turns = range(1, per_turn.shape[1] + 1)
+    width = 0.8 / len(labels)
+    for i, (row, label) in enumerate(zip(per_turn, labels)):
+        color = f"C{i % 10}"
+        ax1.bar([t - 0.4 + width * (i + 0.5) for t in turns], row, width=width, color=color, alpha=0.5, label=label)
+        ax2.plot(turns, row.cumsum(), color=color, marker=".")
+    ax1.set_xlabel("Turn")
+    ax1.set_ylabel("Damage per turn")
+    ax2.set_ylabel("Cumulative damage")
+    ax1.legend(loc="upper left")
+    ax1.grid(True, alpha=0.3)
+    return fig
@@ -0,0 +1,151 @@
+"""
+탐색 결과 열 단위 저장.
+
+엔진이 돌려주는 (diff, k, n, x_hat, P, a, m) 튜플 목록 대신 열마다 고정 폭 정수 NumPy 배열
+하나씩 저장함. 화면 표시와 CSV / Parquet 내보내기는 행마다 dict 를 만들지 않고
+Arrow 표를 바로 만들어 씀. (연속 NumPy 정수 배열 → Arrow 배열은 복사 없이 버퍼를 공유함)
+
+pyarrow 는 to_arrow / 내보내기에서만 필요하며 (Streamlit 이 함께 설치함) 쓸 때 불러옴.
+"""
+
+import io
+from dataclasses import dataclass
+
+import numpy as np
+
+from .score import BASE_SCORE
+from .vectorized import DEFAULT_CHUNK_K, compute_a_vec, compute_m_vec, search_top_arrays
+
+# 열 이름 → 타입. k ≤ 2,000,000, 점수 ≤ 5,000,000 이라 P 만 int64 가 필요함
+POINT_COLUMNS = {
+    "diff": np.int32,
+    "k": np.int32,
+    "n": np.int8,
+    "x_hat": np.int32,
+    "P": np.int64,
+    "a": np.int32,
+    "m": np.int32,
+}
+INTERVAL_COLUMNS = {
+    "diff": np.int32,
+    "k_lo": np.int32,
+    "k_hi": np.int32,
+    "n": np.int8,
+    "x_hat": np.int32,
+    "a": np.int32,
+    "m": np.int32,
+}
+SERIES_COLUMNS = {"max_diff": np.int32, "k_lo": np.int32, "k_hi": np.int32, "n": np.int8}
+TRAJECTORY_COLUMNS = {"day": np.int32, "x": np.int32, "x_hat": np.int32, "diff": np.int32}
+
+# 한 번에 내보낼 수 있는 후보 수 상한
+EXPORT_MAX_ROWS = 100_000
+
+
+@dataclass(frozen=True)
+class ResultColumns:
+    # 열 이름 → 같은 길이의 1차원 연속 배열 (열 순서 = 표시 순서)
+    columns: dict
+
+    @classmethod
+    def from_rows(cls, rows, schema: dict) -> "ResultColumns":
+        """
+        엔진 결과 튜플 목록 → 열 배열. 튜플 순서는 schema 의 열 순서와 같아야 함.
+        값이 열 타입 범위를 벗어나면 잘리는 대신 ValueError.
+        """
+        try:
+            data = np.array(rows, dtype=np.int64).reshape(-1, len(schema))
+        except OverflowError as e:
+            raise ValueError("결과 값이 int64 범위를 벗어났습니다.") from e
+        return cls({name: _fit(name, data[:, i], dtype) for i, (name, dtype) in enumerate(schema.items())})
+
+    def __len__(self) -> int:
+        return len(next(iter(self.columns.values()))) if self.columns else 0
+
+    @property
+    def nbytes(self) -> int:
+        return sum(col.nbytes for col in self.columns.values())
+
+    def head(self, n: int) -> "ResultColumns":
+        # 앞부분 슬라이스는 복사 없는 view
+        return ResultColumns({name: col[:n] for name, col in self.columns.items()})
+
+    def row(self, i: int) -> tuple:
+        return tuple(col[i].item() for col in self.columns.values())
+
+    def to_arrow(self, labels: dict | None = None):
+        """
+        Arrow 표 (열 데이터는 복사하지 않음).
+        labels({열 이름: 표시 이름}) 가 주어지면 그 순서대로 그 열만 표시 이름으로 씀.
+        """
+        pa = _require_pyarrow()
+        labels = labels or {name: name for name in self.columns}
+        return pa.table(
+            [pa.array(self.columns[name]) for name in labels],
+            names=list(labels.values()),
+        )
+
+    def to_csv(self, labels: dict | None = None) -> bytes:
+        import pyarrow.csv as pa_csv
+
+        buf = io.BytesIO()
+        pa_csv.write_csv(self.to_arrow(labels), buf)
+        return buf.getvalue()
+
+    def to_parquet(self, labels: dict | None = None) -> bytes:
+        import pyarrow.parquet as pq
+
+        buf = io.BytesIO()
+        pq.write_table(self.to_arrow(labels), buf)
+        return buf.getvalue()
+
+
+def _fit(name: str, values: np.ndarray, dtype) -> np.ndarray:
+    """
+    int64 열 → dtype 연속 배열. 범위를 벗어난 값이 있으면 ValueError.
+    """
+    info = np.iinfo(dtype)
+    if values.size and (values.min() < info.min or values.max() > info.max):
+        raise ValueError(f"{name} 열 값이 {info.dtype} 범위({info.min:,} ~ {info.max:,})를 벗어났습니다.")
+    return np.ascontiguousarray(values, dtype=dtype)
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow as pa
+    except ImportError as e:
+        raise ImportError("결과 표를 만들려면 pyarrow 가 필요합니다. (pip install pyarrow)") from e
+    return pa
+
+
+def point_columns(target_x: int, k, n, days: int) -> ResultColumns:
+    """
+    (k, n) 배열에서 x_hat, P, a(P), m(k) 를 배열 단위로 계산해 POINT_COLUMNS 형태로 만듦.
+    """
+    k = np.asarray(k, dtype=np.int64)
+    n = np.asarray(n, dtype=np.int64)
+    P = days * k * n
+    a = compute_a_vec(P)
+    m = compute_m_vec(k)
+    x_hat = BASE_SCORE + m + a
+    values = {"diff": np.abs(x_hat - target_x), "k": k, "n": n, "x_hat": x_hat, "P": P, "a": a, "m": m}
+    return ResultColumns({name: _fit(name, values[name], dtype) for name, dtype in POINT_COLUMNS.items()})
+
+
+def search_top_columns(
+    target_x: int,
+    k_min: int,
+    k_max: int,
+    k_step: int,
+    days: int,
+    top_k: int,
+    chunk_size: int = DEFAULT_CHUNK_K,
+    should_stop=None,
+) -> ResultColumns:
+    """
+    search_best_k_n_vec 과 같은 상위 top_k개를 튜플 없이 열 배열로 반환 (후보 목록 내보내기용).
+    """
+    if top_k > EXPORT_MAX_ROWS:
+        raise ValueError(f"후보는 최대 {EXPORT_MAX_ROWS:,}개까지 내보낼 수 있습니다.")
+    _, k, n = search_top_arrays(target_x, k_min, k_max, k_step, days, top_k, chunk_size, should_stop)
+    return point_columns(target_x, k, n, days)
@@ -0,0 +1,379 @@
+"""
+특수 점수 계산기 (평균 k, n 추론) 의 점수 모델.
+
+x_hat = 590 + m(k) + a(P),  P = days * k * n
+"""
+
+import bisect
+import heapq
+import itertools
+
+from . import perf
+
+BASE_SCORE = 590
+
+# 하루 평균 활동 횟수 n 탐색 범위 (1 ~ 30)
+N_MIN = 1
+N_MAX = 30
+
+# 누적 활동치 마일스톤: (임계값 목록, 임계값 하나당 보너스)
+BONUS_TABLE = [
+    ([900, 1800, 2700], 40),
+    ([4500, 9000, 15000, 24000, 36000], 100),
+    ([45000, 60000, 72000, 90000], 160),
+    ([126000, 180000, 240000, 330000], 2000),
+    (
+        [
+            375000, 420000, 480000, 540000, 600000,
+            675000, 788000, 900000, 1050000, 1200000, 1350000
+        ],
+        300,
+    ),
+]
+
+
+class SearchCancelled(RuntimeError):
+    """탐색 도중 should_stop() 이 참이 되어 중단됨 (시간 예산 초과 등)."""
+
+
+def compute_a(P: int) -> int:
+    """
+    누적 활동치 P에 따른 추가 평가점수 a(P)를 계산.
+    각 마일스톤을 넘을 때마다 보너스를 누적해서 더함.
+    """
+    a = 0
+    for thresholds, bonus in BONUS_TABLE:
+        for t in thresholds:
+            if P >= t:
+                a += bonus
+    return a
+
+
+def compute_m(k: int) -> int:
+    """
+    활동치 k에 따른 보너스 m(k) 계산.
+    - k < 3800: 0점
+    - 3800 ~ 4800: 27점
+    - 4800 초과: 27 + floor((k - 4800) / 80)
+    """
+    if k < 3800:
+        return 0
+    if k <= 4800:
+        return 27
+    extra = (k - 4800) // 80
+    return 27 + extra
+
+
+def compute_P(k: int, n: int, days: int) -> int:
+    """
+    days일 동안의 누적 활동치 P = days * k * n
+    """
+    return days * k * n
+
+
+def model_total_score(k: int, n: int, days: int) -> tuple[int, int, int, int]:
+    """
+    (k, n, days)에 따른 모델 총점과 구성요소 계산.
+    x_hat = 590 + m(k) + a(P)
+    """
+    P = compute_P(k, n, days=days)
+    a = compute_a(P)
+    m = compute_m(k)
+    total = BASE_SCORE + m + a
+    return total, P, a, m
+
+
+def search_best_k_n(
+    target_x: int,
+    k_min: int,
+    k_max: int,
+    k_step: int,
+    days: int,
+    top_k: int = 5,
+    should_stop=None,
+):
+    """
+    n은 항상 1 ~ 30 전체 탐색.
+    k 범위 내에서 (k, n)을 브루트포스로 탐색해
+    x_hat이 target_x에 가장 근접한 상위 top_k개 반환.
+
+    후보를 모두 모아 정렬하지 않고 heapq.nsmallest 로 상위 top_k개만 유지함.
+    (sorted(...)[:top_k] 와 같이 안정적이라 동점은 탐색 순서를 따름)
+
+    should_stop 이 주어지면 k 256개마다 확인해서 참이면 SearchCancelled 를 던짐.
+    실제로 계산한 격자점 수는 perf 카운터 "search.grid_points" 에 더함 (중단된 경우 포함).
+
+    결과는 (diff, k, n, x_hat, P, a, m) 튜플 목록.
+    """
+    if top_k <= 0:
+        return []
+
+    evaluated_k = 0
+
+    def candidates():
+        nonlocal evaluated_k
+        for i, k in enumerate(range(k_min, k_max + 1, k_step)):
+            if should_stop is not None and i % 256 == 0 and should_stop():
+                raise SearchCancelled("탐색이 중단되었습니다.")
+            evaluated_k += 1
+            for n in range(N_MIN, N_MAX + 1):  # 하루 평균 횟수: 1 ~ 30
+                x_hat, P, a, m = model_total_score(k, n, days=days)
+                diff = abs(x_hat - target_x)
+                yield (diff, k, n, x_hat, P, a, m)
+
+    try:
+        return heapq.nsmallest(top_k, candidates(), key=lambda x: x[0])
+    finally:
+        perf.count("search.grid_points", evaluated_k * (N_MAX - N_MIN + 1))
+
+
+# -----------------------------
+# 구간 해석 (정확 모드)
+# -----------------------------
+# n, days가 고정이면 x_hat(k)는 k에 대해 단조 증가하는 계단 함수이고,
+# m(k)와 a(P)의 경계에서만 값이 바뀜. 그래서 모든 k를 훑지 않고
+# 목표 점수와 만나는 지점 근처의 구간만 양쪽으로 넓혀가며 보면 됨.
+
+_THRESHOLDS = sorted(t for thresholds, _ in BONUS_TABLE for t in thresholds)
+
+
+def _ceil_div(a: int, b: int) -> int:
+    return -(-a // b)
+
+
+def constant_interval(k: int, n: int, days: int) -> tuple[int, int | None]:
+    """
+    k를 포함하면서 x_hat이 일정한 최대 구간 [lo, hi] 반환. (hi가 None이면 끝없음)
+    """
+    # m(k) 구간: [0, 3799], [3800, 4879], 이후 80 단위
+    if k < 3800:
+        m_lo, m_hi = 0, 3799
+    elif k < 4880:
+        m_lo, m_hi = 3800, 4879
+    else:
+        m_lo = 4800 + (k - 4800) // 80 * 80
+        m_hi = m_lo + 79
+
+    # a(P) 구간: P = days * n * k 가 같은 마일스톤 사이에 있는 k
+    c = days * n
+    idx = bisect.bisect_right(_THRESHOLDS, c * k)
+    a_lo = _ceil_div(_THRESHOLDS[idx - 1], c) if idx > 0 else 0
+    a_hi = _ceil_div(_THRESHOLDS[idx], c) - 1 if idx < len(_THRESHOLDS) else None
+
+    hi = m_hi if a_hi is None else min(m_hi, a_hi)
+    return max(m_lo, a_lo), hi
+
+
+def _collect_intervals_for_n(target_x, k_min, k_step, grid_size, n, days, top_k, should_stop=None):
+    """
+    n 하나에 대해 목표 점수와 가까운 순서로 상수 구간을 모음.
+    top_k개를 채운 뒤에도 마지막과 차이가 같은 구간은 함께 포함함.
+    결과는 (diff, 첫 격자 index, 마지막 격자 index, x_hat) 목록.
+    should_stop 이 주어지면 구간 256개마다 확인해서 참이면 SearchCancelled 를 던짐.
+    """
+    def grid_k(i):
+        return k_min + i * k_step
+
+    def x_hat_at(i):
+        return model_total_score(grid_k(i), n, days=days)[0]
+
+    def grid_interval(i):
+        lo, hi = constant_interval(grid_k(i), n, days)
+        lo_i = max(0, _ceil_div(lo - k_min, k_step))
+        hi_i = grid_size - 1 if hi is None else min(grid_size - 1, (hi - k_min) // k_step)
+        x_hat = x_hat_at(i)
+        return abs(x_hat - target_x), lo_i, hi_i, x_hat
+
+    # x_hat >= target_x 가 되는 첫 격자점 (오른쪽) 과 그 직전 (왼쪽) 에서 출발
+    right_i = bisect.bisect_left(range(grid_size), target_x, key=x_hat_at)
+    left = grid_interval(right_i - 1) if right_i > 0 else None
+    right = grid_interval(right_i) if right_i < grid_size else None
+
+    collected = []
+    while left is not None or right is not None:
+        if right is None or (left is not None and left[0] <= right[0]):
+            pick = left
+            left = grid_interval(left[1] - 1) if left[1] > 0 else None
+        else:
+            pick = right
+            right = grid_interval(right[2] + 1) if right[2] + 1 < grid_size else None
+
+        if len(collected) >= top_k and pick[0] > collected[-1][0]:
+            break
+        collected.append(pick)
+        if should_stop is not None and len(collected) % 256 == 0 and should_stop():
+            raise SearchCancelled("탐색이 중단되었습니다.")
+
+    return collected
+
+
+def _interval_candidates(target_x, k_min, k_max, k_step, days, top_k, should_stop=None):
+    if k_step <= 0:
+        raise ValueError("k_step은 1 이상이어야 합니다.")
+    if top_k <= 0 or k_max < k_min:
+        return []
+
+    grid_size = (k_max - k_min) // k_step + 1
+    candidates = []
+    for n in range(N_MIN, N_MAX + 1):
+        for diff, lo_i, hi_i, x_hat in _collect_intervals_for_n(
+            target_x, k_min, k_step, grid_size, n, days, top_k, should_stop
+        ):
+            k_lo = k_min + lo_i * k_step
+            k_hi = k_min + hi_i * k_step
+            _, _, a, m = model_total_score(k_lo, n, days=days)
+            candidates.append((diff, k_lo, k_hi, n, x_hat, a, m))
+
+    candidates.sort(key=lambda c: (c[0], c[1], c[3]))
+    return candidates
+
+
+def search_best_intervals(
+    target_x: int,
+    k_min: int,
+    k_max: int,
+    k_step: int,
+    days: int,
+    top_k: int = 5,
+    should_stop=None,
+):
+    """
+    정확 모드: 상수 구간 경계만 따라가며 x_hat이 target_x에 가장 가까운 (k 범위, n) 상위 top_k개 반환.
+
+    k 범위는 탐색 격자(k_min + i * k_step) 위의 점만 포함하며,
+    결과는 (diff, k_lo, k_hi, n, x_hat, a, m) 튜플 목록.
+    탐색량이 k 범위 크기와 무관해서 어떤 범위든 바로 계산됨. (대신 top_k 에 비례하므로
+    내보내기처럼 top_k가 클 때는 should_stop 으로 시간 예산을 걸 수 있음)
+    """
+    return _interval_candidates(target_x, k_min, k_max, k_step, days, top_k, should_stop)[:top_k]
+
+
+def intervals_to_points(intervals, k_step: int, days: int, top_k: int):
+    """
+    (diff, k_lo, k_hi, n, x_hat, a, m) 구간 목록을 격자점으로 펼쳐
+    (diff, k, n) 순서의 상위 top_k개 (diff, k, n, x_hat, P, a, m) 를 반환.
+    구간 목록에는 top_k번째와 차이가 같은 구간까지 모두 들어 있어야 함.
+    """
+    def points(interval):
+        diff, k_lo, k_hi, n, x_hat, a, m = interval
+        for k in range(k_lo, k_hi + 1, k_step):
+            P = compute_P(k, n, days=days)
+            yield (diff, k, n, x_hat, P, a, m)
+
+    # 구간마다 k 오름차순으로 점을 내므로 (diff, k, n) 기준으로 병합만 하면 됨
+    merged = heapq.merge(*(points(c) for c in intervals), key=lambda r: (r[0], r[1], r[2]))
+    return list(itertools.islice(merged, top_k))
+
+
+def search_best_k_n_exact(
+    target_x: int,
+    k_min: int,
+    k_max: int,
+    k_step: int,
+    days: int,
+    top_k: int = 5,
+):
+    """
+    구간 해석 결과를 격자점으로 펼쳐 search_best_k_n 과 똑같은 결과를 반환.
+    (차이, k, n) 순서로 정렬되므로 브루트포스 결과와 그대로 비교할 수 있음.
+    """
+    intervals = _interval_candidates(target_x, k_min, k_max, k_step, days, top_k)
+    return intervals_to_points(intervals, k_step, days, top_k)
+
+
+# -----------------------------
+# 여러 날 점수로 함께 추론
+# -----------------------------
+# 일차별 총점 x_d 가 있을 때 모든 날을 함께 설명하는 (k, n) 을 찾음.
+# n, days가 고정이면 x_hat(k)는 k에 대해 단조 증가하므로 |x_hat - x_d| ≤ tol 인 k는
+# 격자 위의 연속 구간 하나이고, 이를 이분 탐색으로 바로 구할 수 있음.
+# 날마다 이 구간을 교집합으로 좁혀 가면 되므로 탐색량이 날 수 × log(격자 크기) 정도이고,
+# 앞선 날에서 구간이 비면 뒤의 날은 보지 않음.
+
+
+def _series_feasible(series, n, k_min, k_step, lo_i, hi_i, tol):
+    """
+    격자 index [lo_i, hi_i] 안에서 모든 날의 |x_hat - x_d| ≤ tol 인 index 구간. 없으면 None.
+    """
+    for day, x in series:
+        def x_hat_at(i, day=day):
+            return model_total_score(k_min + i * k_step, n, days=day)[0]
+
+        lo_i = bisect.bisect_left(range(lo_i, hi_i + 1), x - tol, key=x_hat_at) + lo_i
+        hi_i = bisect.bisect_right(range(lo_i, hi_i + 1), x + tol, key=x_hat_at) + lo_i - 1
+        if lo_i > hi_i:
+            return None
+    return lo_i, hi_i
+
+
+def _series_best_for_n(series, n, k_min, k_step, grid_size, cutoff=None):
+    """
+    n 하나에서 모든 날의 최대 오차가 가장 작은 (최대 오차, 첫 index, 마지막 index).
+    최대 오차가 cutoff 보다 클 수밖에 없으면 None.
+
+    오차 허용치 tol 을 0, 1, 3, 7, ... 로 늘려 가능한 값을 찾은 뒤 그 아래를 이분 탐색함.
+    tol 이 작을수록 가능한 구간은 더 큰 tol 의 구간에 포함되므로, 이미 찾은 구간 안에서만 다시 확인함.
+    """
+    lo_tol, tol = 0, 0
+    while True:
+        found = _series_feasible(series, n, k_min, k_step, 0, grid_size - 1, tol)
+        if found is not None:
+            break
+        if cutoff is not None and tol >= cutoff:
+            return None
+        lo_tol = tol + 1
+        tol = tol * 2 + 1
+        if cutoff is not None:
+            tol = min(tol, cutoff)
+
+    best = (tol, *found)
+    while lo_tol < best[0]:
+        tol = (lo_tol + best[0]) // 2
+        found = _series_feasible(series, n, k_min, k_step, best[1], best[2], tol)
+        if found is None:
+            lo_tol = tol + 1
+        else:
+            best = (tol, *found)
+    return best
+
+
+def search_series(series, k_min: int, k_max: int, k_step: int, top_k: int = 5):
+    """
+    일차별 총점으로 (k, n) 을 함께 추론.
+
+    series: (일차, 그 일차까지의 총점 x) 목록
+    각 n 마다 모든 날의 최대 오차 max_d |x_hat_d - x_d| 가 가장 작은 k 구간을 구해서
+    최대 오차가 작은 순으로 상위 top_k개를 반환. k 구간 안의 모든 격자점은 최대 오차가 같음.
+    결과는 (diff, k_lo, k_hi, n) 튜플 목록.
+    """
+    if k_step <= 0:
+        raise ValueError("k_step은 1 이상이어야 합니다.")
+    series = sorted((int(day), int(x)) for day, x in series)
+    if not series or top_k <= 0 or k_max < k_min:
+        return []
+    if series[0][0] <= 0:
+        raise ValueError("일차는 1 이상이어야 합니다.")
+
+    grid_size = (k_max - k_min) // k_step + 1
+    rows = []
+    for n in range(N_MIN, N_MAX + 1):
+        # 이미 top_k개를 모았으면 그중 가장 큰 오차보다 나쁜 n은 끝까지 찾지 않음
+        cutoff = rows[top_k - 1][0] if len(rows) >= top_k else None
+        best = _series_best_for_n(series, n, k_min, k_step, grid_size, cutoff)
+        if best is None:
+            continue
+        diff, lo_i, hi_i = best
+        rows.append((diff, k_min + lo_i * k_step, k_min + hi_i * k_step, n))
+        rows.sort()
+    return rows[:top_k]
+
+
+def series_trajectory(series, k: int, n: int):
+    """
+    (k, n) 일 때 일차별 (일차, 입력 총점, 모델 총점, 차이) 목록.
+    """
+    rows = []
+    for day, x in sorted(series):
+        x_hat = model_total_score(k, n, days=day)[0]
+        rows.append((day, x, x_hat, x_hat - x))
+    return rows
@@ -0,0 +1,216 @@
+"""
+days별 점수 → (k, n) 역색인.
+
+days가 정해지면 (k, n) → x_hat 대응은 바뀌지 않으므로, 모든 n에 대해
+x_hat이 일정한 k 구간을 한 번만 만들어 점수 순으로 정렬해 둠.
+목표 점수 조회는 격자 탐색 대신 이진 탐색 + 양옆 구간 확인으로 끝남.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from .score import BASE_SCORE, N_MAX, N_MIN, _ceil_div, intervals_to_points
+from .vectorized import _THRESHOLDS, compute_a_vec, compute_m_vec
+
+# 색인이 다루는 k 범위 (UI 입력 최대값과 동일)
+INDEX_K_MAX = 2_000_000
+
+# 디스크 파일 형식 버전 (점수 모델이 바뀌면 올려서 예전 파일을 무시)
+INDEX_FORMAT_VERSION = 1
+
+_FIELDS = ("score", "k_lo", "k_hi", "n")
+
+# 조회할 때 한 번에 확인할 색인 항목 수. 목표 점수 근처에서 작게 시작해 두 배씩 늘림
+_LOOKUP_BLOCK = 256
+_LOOKUP_BLOCK_MAX = 65_536
+
+
+class ScoreIndex:
+    """
+    days 하나에 대한 역색인. 각 항목은 x_hat이 일정한 (k_lo ~ k_hi, n) 구간이며
+    (score, k_lo, n) 순으로 정렬되어 있음.
+    """
+
+    def __init__(self, days: int, score, k_lo, k_hi, n, k_max: int = INDEX_K_MAX):
+        self.days = days
+        self.k_max = k_max
+        self.score = score
+        self.k_lo = k_lo
+        self.k_hi = k_hi
+        self.n = n
+
+    @classmethod
+    def build(cls, days: int, k_max: int = INDEX_K_MAX) -> "ScoreIndex":
+        parts = []
+        m_breaks = np.concatenate(([0, 3800], np.arange(4880, k_max + 1, 80)))
+        for n in range(N_MIN, N_MAX + 1):
+            c = days * n
+            a_breaks = np.array([_ceil_div(int(t), c) for t in _THRESHOLDS], dtype=np.int64)
+            lo = np.unique(np.concatenate((m_breaks, a_breaks)))
+            lo = lo[lo <= k_max]
+            hi = np.append(lo[1:] - 1, k_max)
+            score = BASE_SCORE + compute_m_vec(lo) + compute_a_vec(c * lo)
+            parts.append((score, lo, hi, np.full(lo.size, n)))
+
+        score, k_lo, k_hi, n = (np.concatenate(cols) for cols in zip(*parts))
+        order = np.lexsort((n, k_lo, score))
+        return cls(
+            days,
+            score[order].astype(np.int64),
+            k_lo[order].astype(np.int32),
+            k_hi[order].astype(np.int32),
+            n[order].astype(np.int8),
+            k_max=k_max,
+        )
+
+    @property
+    def nbytes(self) -> int:
+        return sum(getattr(self, name).nbytes for name in _FIELDS)
+
+    # -----------------------------
+    # 디스크 저장 / 메모리 매핑 로드
+    # -----------------------------
+    @staticmethod
+    def _path(cache_dir: str, days: int, k_max: int, name: str) -> str:
+        filename = f"score_index_v{INDEX_FORMAT_VERSION}_days{days}_k{k_max}_{name}.npy"
+        return os.path.join(cache_dir, filename)
+
+    def save(self, cache_dir: str) -> None:
+        os.makedirs(cache_dir, exist_ok=True)
+        for name in _FIELDS:
+            path = self._path(cache_dir, self.days, self.k_max, name)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                np.save(f, getattr(self, name))
+            os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, cache_dir: str, days: int, k_max: int = INDEX_K_MAX) -> "ScoreIndex | None":
+        paths = [cls._path(cache_dir, days, k_max, name) for name in _FIELDS]
+        if not all(os.path.exists(p) for p in paths):
+            return None
+        arrays = [np.load(p, mmap_mode="r") for p in paths]
+        return cls(days, *arrays, k_max=k_max)
+
+    # -----------------------------
+    # 조회
+    # -----------------------------
+    def _side_slices(self, pos: int, step: int):
+        """
+        pos 부터 step(+1 / -1) 방향으로 색인 항목을 연속 구간(slice) 단위로 냄.
+        필요한 만큼만 보도록 구간 크기는 _LOOKUP_BLOCK 부터 _LOOKUP_BLOCK_MAX 까지 두 배씩 늘림.
+        """
+        size = _LOOKUP_BLOCK
+        while 0 <= pos < self.score.size:
+            stop = pos + step * size
+            if stop < 0:
+                yield slice(pos, None, -1)
+                return
+            stop = min(stop, self.score.size)
+            yield slice(pos, stop, step)
+            pos = stop
+            size = min(size * 2, _LOOKUP_BLOCK_MAX)
+
+    def _collect_side(self, slices, target_x, k_min, k_max, k_step, top_k):
+        """
+        slices 순서(목표 점수에서 멀어지는 방향)로 색인 항목을 보며,
+        탐색 격자와 겹치는 구간을 top_k개 (+ 마지막과 차이가 같은 구간) 모음.
+        """
+        collected = []
+        for block in slices:
+            # 연속 구간이라 복사 없는 view
+            k_lo = np.maximum(self.k_lo[block].astype(np.int64), k_min)
+            k_hi = np.minimum(self.k_hi[block].astype(np.int64), k_max)
+            # 구간 안의 첫/마지막 격자점
+            first = k_min + (-((k_min - k_lo) // k_step)) * k_step
+            last = k_min + (k_hi - k_min) // k_step * k_step
+            valid = (k_lo <= k_hi) & (first <= last)
+            score = self.score[block]
+            n = self.n[block]
+            diff = np.abs(score.astype(np.int64) - target_x)
+
+            for i in np.flatnonzero(valid).tolist():
+                if len(collected) >= top_k and diff[i] > collected[-1][0]:
+                    return collected
+                collected.append((int(diff[i]), int(first[i]), int(last[i]), int(n[i]), int(score[i])))
+        return collected
+
+    def _candidates(self, target_x, k_min, k_max, k_step, top_k):
+        if k_step <= 0:
+            raise ValueError("k_step은 1 이상이어야 합니다.")
+        if top_k <= 0 or k_max < k_min:
+            return []
+        if k_max > self.k_max:
+            raise ValueError(f"색인 범위(k ≤ {self.k_max})를 벗어났습니다.")
+
+        pos = int(np.searchsorted(self.score, target_x, side="left"))
+
+        candidates = []
+        for side in (self._side_slices(pos - 1, -1), self._side_slices(pos, 1)):
+            for diff, k_lo, k_hi, n, x_hat in self._collect_side(side, target_x, k_min, k_max, k_step, top_k):
+                a = int(compute_a_vec(self.days * k_lo * n))
+                m = int(compute_m_vec(k_lo))
+                candidates.append((diff, k_lo, k_hi, n, x_hat, a, m))
+
+        candidates.sort(key=lambda c: (c[0], c[1], c[3]))
+        return candidates
+
+    def lookup_intervals(self, target_x: int, k_min: int, k_max: int, k_step: int, top_k: int = 5):
+        """
+        score.search_best_intervals 와 같은 결과를 색인에서 조회.
+        """
+        return self._candidates(target_x, k_min, k_max, k_step, top_k)[:top_k]
+
+    def lookup_points(self, target_x: int, k_min: int, k_max: int, k_step: int, top_k: int = 5):
+        """
+        score.search_best_k_n 과 같은 결과를 색인에서 조회.
+        """
+        candidates = self._candidates(target_x, k_min, k_max, k_step, top_k)
+        return intervals_to_points(candidates, k_step, self.days, top_k)
+
+
+class ScoreIndexCache:
+    """
+    days → ScoreIndex 를 보관하는 프로세스 공용 캐시.
+
+    - 메모리에 올린 색인 크기 합이 max_bytes를 넘으면 가장 오래 안 쓴 색인부터 제거 (LRU)
+    - cache_dir 가 있으면 만든 색인을 .npy 로 저장하고, 다음부터는 메모리 매핑으로 불러옴
+    """
+
+    def __init__(self, max_bytes: int = 128 * 1024 * 1024, cache_dir: str | None = None, k_max: int = INDEX_K_MAX):
+        self.max_bytes = max_bytes
+        self.cache_dir = cache_dir
+        self.k_max = k_max
+        self._indexes: OrderedDict[int, ScoreIndex] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def nbytes(self) -> int:
+        return sum(index.nbytes for index in self._indexes.values())
+
+    def __contains__(self, days: int) -> bool:
+        return days in self._indexes
+
+    def get(self, days: int) -> ScoreIndex:
+        with self._lock:
+            index = self._indexes.get(days)
+            if index is not None:
+                self._indexes.move_to_end(days)
+                return index
+
+            index = None
+            if self.cache_dir:
+                index = ScoreIndex.load(self.cache_dir, days, self.k_max)
+            if index is None:
+                index = ScoreIndex.build(days, self.k_max)
+                if self.cache_dir:
+                    index.save(self.cache_dir)
+
+            self._indexes[days] = index
+            # 방금 만든 색인은 남기고 오래된 것부터 제거
+            while len(self._indexes) > 1 and self.nbytes > self.max_bytes:
+                self._indexes.popitem(last=False)
+            return index
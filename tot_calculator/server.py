@@ -0,0 +1,463 @@
+"""
+로컬 HTTP / JSON 배치 API.
+
+Streamlit 화면을 거치지 않고 봇이나 스프레드시트에서 계산기를 호출하기 위한 서비스. 표준 라이브러리
+(http.server)만 사용하며 기본적으로 127.0.0.1 에만 열림.
+
+    python -m tot_calculator serve --port 8765
+
+    POST /damage   {"builds": [{"atk": 4155, "E_def": 5000, "def_coef": 30, ...}, ...]}
+    POST /compare  {"common": {...}, "pairs": [{"position": "센티널", "A": {...}, "B": {...}}, ...]}
+    POST /search   {"queries": [{"x": 5000, "days": 8, "k_min": 3800, "k_max": 50000, "k_step": 20, "top": 5}, ...]}
+    GET  /health, GET /stats
+
+요청은 항목(빌드 하나, 무기 쌍 하나, 탐색 하나) 단위로 Coalescer 에 넣음. 짧은 창(window) 동안
+여러 요청에서 들어온 항목을 모아 배열 한 번으로 계산하고, 같은 항목은 한 번만 계산해서 나눠 줌.
+계산한 항목은 LRU 캐시에 남겨 두었다가 같은 항목이 다시 오면 바로 반환함.
+"""
+
+import json
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import asdict, dataclass
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from .damage import damage_batch, efficiency_percent, weak_multiplier
+from .defaults import DEFAULT_COMMON, INTERVAL_FIELDS, POINT_FIELDS
+from .memo import grid_last
+from .planner import count_grid_points
+from .score import search_best_intervals, search_best_k_n_exact
+from .vectorized import search_best_k_n_many
+from .weapons import DOLL_POSITIONS, WEAPON_OPTIONS, final_atk, weapon_damage
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+# 항목을 모으는 시간. 요청이 계속 들어오는 동안에만 첫 항목 뒤에 이만큼 기다렸다가 한 번에 계산함
+DEFAULT_WINDOW_MS = 1.0
+DEFAULT_MAX_BATCH = 65_536
+DEFAULT_CACHE_ENTRIES = 100_000
+# 응답을 기다리는 최대 시간 (초)
+REQUEST_TIMEOUT = 30.0
+
+MAX_BODY_BYTES = 16 * 1024 * 1024
+MAX_ITEMS = 100_000
+MAX_QUERIES = 256
+MAX_TOP = 1000
+K_LIMIT = 2_000_000
+SCORE_LIMIT = 5_000_000
+# 이 크기 이하의 격자는 같은 격자의 탐색을 모아 배열로 계산 (목표 하나당 약 6ns × 격자점, 구간 해석은 약 3ms)
+SEARCH_GRID_POINTS = 262_144
+
+# 빌드 하나의 입력 (약점은 개수, 나머지는 % 또는 수치). atk 외에는 CLI damage 와 같은 기본값
+DAMAGE_FIELDS = ("atk", "E_def", "def_coef", "buff_x", "buff_y", "sk_coef", "Weak_coef")
+WEAPON_FIELDS = {"wep_atk": 390.0, "option": "공격 보너스 15%", "def_ignore": 0.0, "dmg_buff": 0.0}
+DEFAULT_POSITION = "센티널"
+COMPARE_FIELDS = ("final_atk_A", "damage_A", "final_atk_B", "damage_B", "diff", "efficiency_percent", "better")
+SEARCH_DEFAULTS = {"days": 8, "k_min": 3800, "k_max": 50000, "k_step": 20, "top": 5, "intervals": False}
+
+
+class RequestError(ValueError):
+    """잘못된 요청 (HTTP 상태 코드를 함께 가짐)."""
+
+    def __init__(self, message: str, status: HTTPStatus = HTTPStatus.BAD_REQUEST):
+        super().__init__(message)
+        self.status = status
+
+
+# -----------------------------
+# 항목 모아서 계산하기
+# -----------------------------
+@dataclass
+class CoalescerStats:
+    # 요청 수 / 요청에 들어 있던 항목 수
+    requests: int = 0
+    items: int = 0
+    # 캐시에서 바로 반환한 항목 / 이미 계산 중인 같은 항목을 기다린 항목
+    cache_hits: int = 0
+    coalesced: int = 0
+    # 실제로 계산한 배치 수 / 항목 수
+    batches: int = 0
+    evaluated: int = 0
+    eval_seconds: float = 0.0
+
+
+class Coalescer:
+    """
+    여러 스레드(요청)에서 들어온 항목을 모아 evaluate(항목 목록) → 결과 목록 한 번으로 계산.
+    항목은 해시할 수 있는 값(튜플)이어야 하며, 같은 항목은 캐시 / 계산 중인 결과를 함께 씀.
+    계산은 전용 스레드 하나에서 함.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        evaluate,
+        window: float = DEFAULT_WINDOW_MS / 1000,
+        max_batch: int = DEFAULT_MAX_BATCH,
+        cache_entries: int = DEFAULT_CACHE_ENTRIES,
+    ):
+        self.name = name
+        self.evaluate = evaluate
+        self.window = window
+        self.max_batch = max_batch
+        self.cache_entries = cache_entries
+        self.stats = CoalescerStats()
+        self._lock = threading.Lock()
+        self._ready = threading.Condition(self._lock)
+        # 계산을 기다리는 항목 / 계산을 기다리거나 계산 중인 항목
+        self._pending: dict = {}
+        self._inflight: dict = {}
+        self._cache: OrderedDict = OrderedDict()
+        self._last_done = float("-inf")
+        threading.Thread(target=self._run, name=f"coalescer-{name}", daemon=True).start()
+
+    def submit(self, keys, timeout: float = REQUEST_TIMEOUT) -> list:
+        results = [None] * len(keys)
+        waiting = []
+        with self._lock:
+            self.stats.requests += 1
+            self.stats.items += len(keys)
+            for i, key in enumerate(keys):
+                if key in self._cache:
+                    self._cache.move_to_end(key)
+                    results[i] = self._cache[key]
+                    self.stats.cache_hits += 1
+                elif key in self._inflight:
+                    waiting.append((i, self._inflight[key]))
+                    self.stats.coalesced += 1
+                else:
+                    future = Future()
+                    self._inflight[key] = self._pending[key] = future
+                    waiting.append((i, future))
+            if self._pending:
+                self._ready.notify()
+        for i, future in waiting:
+            results[i] = future.result(timeout)
+        return results
+
+    def _take_batch(self) -> dict:
+        with self._ready:
+            while not self._pending:
+                self._ready.wait()
+        # 직전 배치가 창 안에 끝났을 때(요청이 계속 들어오는 중)만 창 동안 다른 요청의 항목을 더 모음.
+        # 한동안 요청이 없었으면 기다리지 않고 바로 계산해서 한가할 때 지연이 늘지 않게 함
+        if self.window > 0 and time.perf_counter() - self._last_done < self.window:
+            time.sleep(self.window)
+        with self._lock:
+            batch = {}
+            for key in list(self._pending)[: self.max_batch]:
+                batch[key] = self._pending.pop(key)
+            return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._take_batch()
+            start = time.perf_counter()
+            try:
+                values = self.evaluate(list(batch))
+            except Exception as e:  # 계산 오류는 기다리는 요청 모두에 전달
+                logger.exception("%s 계산 실패", self.name)
+                with self._lock:
+                    for key in batch:
+                        self._inflight.pop(key, None)
+                for future in batch.values():
+                    future.set_exception(e)
+                self._last_done = time.perf_counter()
+                continue
+            with self._lock:
+                self.stats.batches += 1
+                self.stats.evaluated += len(batch)
+                self.stats.eval_seconds += time.perf_counter() - start
+                for key, value in zip(batch, values):
+                    self._inflight.pop(key, None)
+                    if self.cache_entries > 0:
+                        self._cache[key] = value
+                while len(self._cache) > self.cache_entries:
+                    self._cache.popitem(last=False)
+            for future, value in zip(batch.values(), values):
+                future.set_result(value)
+            self._last_done = time.perf_counter()
+
+
+# -----------------------------
+# 입력 검사
+# -----------------------------
+def _number(item: dict, name: str, default=None) -> float:
+    value = item.get(name, default)
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise RequestError(f"{name} 는 숫자여야 합니다: {value!r}")
+    value = float(value)
+    if not math.isfinite(value):
+        raise RequestError(f"{name} 는 유한한 숫자여야 합니다.")
+    return value
+
+
+def _integer(item: dict, name: str, lo: int, hi: int) -> int:
+    value = item.get(name, SEARCH_DEFAULTS.get(name))
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise RequestError(f"{name} 는 정수여야 합니다: {value!r}")
+    if not lo <= value <= hi:
+        raise RequestError(f"{name} 는 {lo} ~ {hi} 사이여야 합니다: {value}")
+    return value
+
+
+def _items(body: dict, name: str, limit: int) -> list:
+    items = body.get(name)
+    if not isinstance(items, list) or not all(isinstance(item, dict) for item in items):
+        raise RequestError(f"{name} 는 객체 배열이어야 합니다.")
+    if len(items) > limit:
+        raise RequestError(f"{name} 는 한 번에 {limit:,}개까지 보낼 수 있습니다.", HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+    return items
+
+
+def _choice(item: dict, name: str, default: str, table: dict) -> str:
+    value = item.get(name, default)
+    if value not in table:
+        raise RequestError(f"{name} 는 {', '.join(table)} 중 하나여야 합니다: {value!r}")
+    return value
+
+
+def damage_key(build: dict) -> tuple:
+    if "atk" not in build:
+        raise RequestError("빌드마다 atk 가 필요합니다.")
+    return tuple(_number(build, name, DEFAULT_COMMON.get(name)) for name in DAMAGE_FIELDS)
+
+
+def compare_key(common: tuple, pair: dict) -> tuple:
+    sides = []
+    for side in ("A", "B"):
+        weapon = pair.get(side, {})
+        if not isinstance(weapon, dict):
+            raise RequestError(f"{side} 는 객체여야 합니다.")
+        sides.append((
+            _number(weapon, "wep_atk", WEAPON_FIELDS["wep_atk"]),
+            _choice(weapon, "option", WEAPON_FIELDS["option"], WEAPON_OPTIONS),
+            _number(weapon, "def_ignore", WEAPON_FIELDS["def_ignore"]),
+            _number(weapon, "dmg_buff", WEAPON_FIELDS["dmg_buff"]),
+        ))
+    return (common, _choice(pair, "position", DEFAULT_POSITION, DOLL_POSITIONS), *sides)
+
+
+def search_key(query: dict) -> tuple:
+    """
+    탐색 하나의 키. k_max 는 마지막 격자점으로 맞추고, 상위 개수는 기본값(5) 이상으로 올려서
+    상위 개수만 5개 이하로 다른 탐색이 같은 계산을 함께 쓰도록 함. (응답할 때 잘라서 반환)
+    더 크게 올리면 구간 해석 엔진이 후보를 그만큼 더 만들어야 해서 (20개면 약 2.5배) 올리지 않음.
+    """
+    x = _integer(query, "x", 0, SCORE_LIMIT)
+    days = _integer(query, "days", 1, 365)
+    k_min = _integer(query, "k_min", 0, K_LIMIT)
+    k_max = _integer(query, "k_max", k_min, K_LIMIT)
+    k_step = _integer(query, "k_step", 1, K_LIMIT)
+    top = _integer(query, "top", 1, MAX_TOP)
+    intervals = query.get("intervals", SEARCH_DEFAULTS["intervals"])
+    if not isinstance(intervals, bool):
+        raise RequestError(f"intervals 는 true / false 여야 합니다: {intervals!r}")
+    return (intervals, x, days, k_min, grid_last(k_min, k_max, k_step), k_step, max(top, SEARCH_DEFAULTS["top"]))
+
+
+# -----------------------------
+# 배치 계산
+# -----------------------------
+def _finite(values: np.ndarray) -> list:
+    # JSON 에 NaN / inf 를 쓸 수 없어서 None 으로 바꿈
+    return [v if math.isfinite(v) else None for v in values.tolist()]
+
+
+def evaluate_damage(keys: list) -> list:
+    atk, E_def, def_coef, buff_x, buff_y, sk_coef, weak = np.array(keys, dtype=np.float64).reshape(-1, 7).T
+    return _finite(damage_batch(atk, E_def, np.minimum(def_coef, 100.0), buff_x, buff_y, sk_coef, weak_multiplier(weak)))
+
+
+def evaluate_compare(keys: list) -> list:
+    common = np.array([key[0] for key in keys], dtype=np.float64).reshape(-1, len(DEFAULT_COMMON)).T
+    common = dict(zip(DEFAULT_COMMON, common))
+    atk_per, ct_per = np.array([DOLL_POSITIONS[key[1]] for key in keys], dtype=np.float64).reshape(-1, 2).T
+
+    columns = {}
+    for side, index in (("A", 2), ("B", 3)):
+        wep_atk, def_ignore, dmg_buff = np.array(
+            [(key[index][0], key[index][2], key[index][3]) for key in keys], dtype=np.float64
+        ).reshape(-1, 3).T
+        wep_ak, wep_ct = np.array([WEAPON_OPTIONS[key[index][1]] for key in keys], dtype=np.float64).reshape(-1, 2).T
+        columns[f"final_atk_{side}"] = final_atk(common["atk_origin"], wep_atk, common["atk_bonus"], atk_per, wep_ak)
+        columns[f"damage_{side}"] = weapon_damage(
+            common, wep_atk=wep_atk, wep_ak=wep_ak, wep_ct=wep_ct,
+            def_ignore=def_ignore, dmg_buff=dmg_buff, atk_per=atk_per, ct_per=ct_per,
+        )
+    diff = columns["damage_B"] - columns["damage_A"]
+    columns["diff"] = diff
+    columns["efficiency_percent"] = efficiency_percent(columns["damage_A"], columns["damage_B"])
+
+    values = {name: _finite(np.asarray(columns[name])) for name in COMPARE_FIELDS[:-1]}
+    values["better"] = np.where(diff > 0, "B", np.where(diff < 0, "A", "=")).tolist()
+    return [dict(zip(COMPARE_FIELDS, row)) for row in zip(*(values[name] for name in COMPARE_FIELDS))]
+
+
+def evaluate_search(keys: list) -> list:
+    """
+    점 탐색 중 격자(days, k 범위)가 같은 것끼리 묶어 vectorized.search_best_k_n_many 로 함께 계산
+    (x_hat 격자는 한 번만 계산하고 목표 점수마다 상위 후보만 다시 고름).
+    격자가 SEARCH_GRID_POINTS 보다 크거나 구간 결과를 원하는 탐색은 항목마다 구간 해석 엔진으로 계산.
+    두 엔진 모두 브루트포스와 결과가 같음. 같은 탐색은 Coalescer 가 한 번만 넘겨 줌.
+    """
+    results = [None] * len(keys)
+    groups = {}
+    for i, (intervals, x, days, k_min, k_last, k_step, depth) in enumerate(keys):
+        if not intervals and count_grid_points(k_min, k_last, k_step) <= SEARCH_GRID_POINTS:
+            groups.setdefault((days, k_min, k_last, k_step, depth), []).append(i)
+            continue
+        search = search_best_intervals if intervals else search_best_k_n_exact
+        results[i] = search(x, k_min, k_last, k_step, days, depth)
+
+    for (days, k_min, k_last, k_step, depth), members in groups.items():
+        targets = [keys[i][1] for i in members]
+        for i, rows in zip(members, search_best_k_n_many(targets, k_min, k_last, k_step, days, depth)):
+            results[i] = rows
+    return results
+
+
+# -----------------------------
+# HTTP
+# -----------------------------
+class BatchApi:
+    """
+    엔드포인트별 Coalescer 묶음. 요청 본문(dict) → 응답(dict).
+    """
+
+    def __init__(
+        self,
+        window: float = DEFAULT_WINDOW_MS / 1000,
+        cache_entries: int = DEFAULT_CACHE_ENTRIES,
+        max_batch: int = DEFAULT_MAX_BATCH,
+    ):
+        self.started_at = time.time()
+        self.coalescers = {
+            name: Coalescer(name, evaluate, window=window, max_batch=max_batch, cache_entries=cache_entries)
+            for name, evaluate in (("damage", evaluate_damage), ("compare", evaluate_compare), ("search", evaluate_search))
+        }
+
+    def damage(self, body: dict) -> dict:
+        keys = [damage_key(build) for build in _items(body, "builds", MAX_ITEMS)]
+        return {"damage": self.coalescers["damage"].submit(keys)}
+
+    def compare(self, body: dict) -> dict:
+        overrides = body.get("common", {})
+        if not isinstance(overrides, dict) or set(overrides) - set(DEFAULT_COMMON):
+            raise RequestError(f"common 은 {', '.join(DEFAULT_COMMON)} 중에서 지정해야 합니다.")
+        common = tuple(_number(overrides, name, default) for name, default in DEFAULT_COMMON.items())
+        keys = [compare_key(common, pair) for pair in _items(body, "pairs", MAX_ITEMS)]
+        return {"results": self.coalescers["compare"].submit(keys)}
+
+    def search(self, body: dict) -> dict:
+        queries = _items(body, "queries", MAX_QUERIES)
+        keys = [search_key(query) for query in queries]
+        found = self.coalescers["search"].submit(keys)
+        results = []
+        for query, key, rows in zip(queries, keys, found):
+            fields = INTERVAL_FIELDS if key[0] else POINT_FIELDS
+            top = query.get("top", SEARCH_DEFAULTS["top"])
+            results.append([dict(zip(fields, row)) for row in rows[:top]])
+        return {"results": results}
+
+    def stats(self) -> dict:
+        return {
+            "uptime_seconds": round(time.time() - self.started_at, 3),
+            "endpoints": {name: asdict(c.stats) for name, c in self.coalescers.items()},
+        }
+
+
+class BatchRequestHandler(BaseHTTPRequestHandler):
+    # keep-alive 로 연결을 재사용할 수 있도록 (응답마다 Content-Length 를 씀)
+    protocol_version = "HTTP/1.1"
+    server_version = "tot-calculator"
+    # 헤더와 본문을 따로 보내므로 Nagle 을 끄지 않으면 지연 ACK 와 겹쳐 응답마다 수십 ms 씩 늦어짐
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        logger.debug("%s %s", self.address_string(), format % args)
+
+    def _send(self, status: HTTPStatus, payload: dict) -> None:
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        if self.close_connection:
+            # 본문을 읽지 못해 연결을 닫는 경우 클라이언트가 연결을 다시 쓰지 않도록 알림
+            self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send(HTTPStatus.OK, {"status": "ok"})
+        elif self.path == "/stats":
+            self._send(HTTPStatus.OK, self.server.api.stats())
+        else:
+            self._send(HTTPStatus.NOT_FOUND, {"error": f"없는 경로: {self.path}"})
+
+    def _content_length(self) -> int:
+        """
+        본문 길이. 본문을 읽을 수 없는 경우에는 다음 요청의 경계도 알 수 없으므로 연결을 닫음.
+        """
+        value = self.headers.get("Content-Length")
+        if value is None:
+            self.close_connection = True
+            raise RequestError("Content-Length 헤더가 필요합니다.", HTTPStatus.LENGTH_REQUIRED)
+        value = value.strip()
+        if not (value.isascii() and value.isdigit()):
+            self.close_connection = True
+            raise RequestError(f"Content-Length 는 0 이상의 정수여야 합니다: {value!r}")
+        length = int(value)
+        if length > MAX_BODY_BYTES:
+            self.close_connection = True
+            raise RequestError(f"요청 본문은 {MAX_BODY_BYTES // 1024 // 1024}MB 이하여야 합니다.",
+                               HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+        return length
+
+    def do_POST(self):
+        api = self.server.api
+        routes = {"/damage": api.damage, "/compare": api.compare, "/search": api.search}
+        try:
+            handler = routes.get(self.path)
+            raw = self.rfile.read(self._content_length())
+            if handler is None:
+                raise RequestError(f"없는 경로: {self.path}", HTTPStatus.NOT_FOUND)
+            try:
+                body = json.loads(raw)
+            except ValueError as e:
+                raise RequestError(f"JSON 을 읽을 수 없습니다: {e}") from e
+            if not isinstance(body, dict):
+                raise RequestError("요청 본문은 JSON 객체여야 합니다.")
+            self._send(HTTPStatus.OK, handler(body))
+        except RequestError as e:
+            self._send(e.status, {"error": str(e)})
+        except TimeoutError:
+            self._send(HTTPStatus.SERVICE_UNAVAILABLE, {"error": "계산이 시간 안에 끝나지 않았습니다."})
+        except Exception as e:  # 계산 오류 (Coalescer 가 기다리던 요청에 넘긴 예외 포함). 응답 없이 연결이 끊기지 않게 함
+            logger.exception("%s 처리 실패", self.path)
+            self._send(HTTPStatus.INTERNAL_SERVER_ERROR, {"error": f"계산 중 오류가 발생했습니다: {e}"})
+
+
+class BatchHTTPServer(ThreadingHTTPServer):
+    # 연결마다 스레드 하나. 동시 접속이 몰려도 연결이 거부되지 않도록 대기열을 기본값(5)보다 늘림
+    daemon_threads = True
+    request_queue_size = 128
+
+
+def make_server(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, **api_options) -> BatchHTTPServer:
+    """
+    api_options 는 BatchApi 에 그대로 넘김. (port 0 이면 빈 포트)
+    """
+    server = BatchHTTPServer((host, port), BatchRequestHandler)
+    server.api = BatchApi(**api_options)
+    return server
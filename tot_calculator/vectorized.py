@@ -0,0 +1,174 @@
+"""
+NumPy 기반 (k, n) 일괄 탐색 엔진.
+
+score.search_best_k_n 과 같은 결과를 내지만, k × n 격자를 배열 단위로 계산함.
+k는 고정 크기 청크로 나눠서 처리하고 후보는 상위 top_k개만 유지하므로
+탐색 범위가 커져도 메모리 사용량은 일정함.
+"""
+
+import numpy as np
+
+from . import perf
+from .score import BASE_SCORE, BONUS_TABLE, N_MAX, N_MIN, SearchCancelled, model_total_score
+
+# 한 번에 처리할 k 개수 (청크당 k 개수 × 30개의 격자점을 계산)
+DEFAULT_CHUNK_K = 32_768
+
+N_VALUES = np.arange(N_MIN, N_MAX + 1, dtype=np.int64)
+
+# a(P) 계산용 테이블: 정렬된 임계값과, 임계값을 i개 넘었을 때의 누적 보너스
+_THRESHOLDS = np.array(
+    [t for thresholds, _ in BONUS_TABLE for t in thresholds], dtype=np.int64
+)
+_CUM_BONUS = np.concatenate(
+    ([0], np.cumsum([bonus for thresholds, bonus in BONUS_TABLE for _ in thresholds]))
+).astype(np.int64)
+
+
+def compute_a_vec(P):
+    """
+    compute_a 의 배열 버전. P 이하인 임계값 개수를 searchsorted 로 구해
+    누적 보너스 테이블에서 바로 읽어옴.
+    """
+    idx = np.searchsorted(_THRESHOLDS, P, side="right")
+    return _CUM_BONUS[idx]
+
+
+def compute_m_vec(k):
+    """
+    compute_m 의 배열 버전.
+    - k < 3800: 0점
+    - 3800 ~ 4800: 27점
+    - 4800 초과: 27 + floor((k - 4800) / 80)
+    """
+    k = np.asarray(k, dtype=np.int64)
+    extra = np.maximum(k - 4800, 0) // 80
+    return np.where(k < 3800, 0, 27 + extra)
+
+
+def _select_top(diff, top_k: int):
+    """
+    평탄화된 diff 배열에서 (diff, 위치) 순으로 가장 작은 top_k개의 위치를 반환.
+    전체 정렬 대신 argpartition 으로 top_k번째 값만 찾아 O(N) 으로 선택함.
+    """
+    if diff.size <= top_k:
+        return np.argsort(diff, kind="stable")
+
+    kth = diff[np.argpartition(diff, top_k - 1)[top_k - 1]]
+    below = np.flatnonzero(diff < kth)
+    ties = np.flatnonzero(diff == kth)[: top_k - below.size]
+    idx = np.concatenate((below, ties))
+    # 위치 오름차순으로 정렬된 상태에서 안정 정렬 → 동점은 탐색 순서 유지
+    idx.sort()
+    return idx[np.argsort(diff[idx], kind="stable")]
+
+
+def search_top_arrays(
+    target_x: int,
+    k_min: int,
+    k_max: int,
+    k_step: int,
+    days: int,
+    top_k: int = 5,
+    chunk_size: int = DEFAULT_CHUNK_K,
+    should_stop=None,
+):
+    """
+    search_best_k_n_vec 의 상위 top_k개를 (diff, k, n) int64 배열 세 개로 반환.
+
+    k를 chunk_size개씩 잘라 (k, n) 격자 전체를 배열로 계산하고,
+    청크마다 상위 top_k개만 골라 지금까지의 상위 top_k개와 합침.
+    탐색 범위와 상관없이 후보는 항상 top_k개만 유지함.
+    동점은 기존과 같이 탐색 순서(k 오름차순, n 오름차순)를 유지하므로 결과가 완전히 동일함.
+    should_stop 이 주어지면 청크마다 확인해서 참이면 SearchCancelled 를 던짐.
+    계산한 격자점 수는 청크마다 perf 카운터 "search.grid_points" 에 더함.
+    """
+    if k_step <= 0:
+        raise ValueError("k_step은 1 이상이어야 합니다.")
+
+    n_count = N_VALUES.size
+    best_diff = np.empty(0, dtype=np.int64)
+    best_k = np.empty(0, dtype=np.int64)
+    best_n = np.empty(0, dtype=np.int64)
+    if top_k <= 0 or k_max < k_min:
+        return best_diff, best_k, best_n
+
+    for start in range(k_min, k_max + 1, k_step * chunk_size):
+        if should_stop is not None and should_stop():
+            raise SearchCancelled("탐색이 중단되었습니다.")
+        stop = min(start + k_step * chunk_size, k_max + 1)
+        ks = np.arange(start, stop, k_step, dtype=np.int64)
+        perf.count("search.grid_points", ks.size * n_count)
+
+        P = days * ks[:, None] * N_VALUES[None, :]
+        x_hat = BASE_SCORE + compute_m_vec(ks)[:, None] + compute_a_vec(P)
+        # 행 우선 평탄화 = 기존 이중 루프의 순회 순서
+        diff = np.abs(x_hat - target_x).ravel()
+
+        idx = _select_top(diff, top_k)
+        # 이전 청크(더 작은 k)를 앞에 두고 안정 정렬 → 동점 순서 유지
+        merged_diff = np.concatenate((best_diff, diff[idx]))
+        merged_k = np.concatenate((best_k, ks[idx // n_count]))
+        merged_n = np.concatenate((best_n, N_VALUES[idx % n_count]))
+        keep = np.argsort(merged_diff, kind="stable")[:top_k]
+        best_diff, best_k, best_n = merged_diff[keep], merged_k[keep], merged_n[keep]
+
+    return best_diff, best_k, best_n
+
+
+def search_best_k_n_vec(
+    target_x: int,
+    k_min: int,
+    k_max: int,
+    k_step: int,
+    days: int,
+    top_k: int = 5,
+    chunk_size: int = DEFAULT_CHUNK_K,
+    should_stop=None,
+):
+    """
+    search_best_k_n 의 벡터화 버전. (계산 방식은 search_top_arrays 참고)
+    """
+    best_diff, best_k, best_n = search_top_arrays(
+        target_x, k_min, k_max, k_step, days, top_k, chunk_size, should_stop
+    )
+    results = []
+    for diff, k, n in zip(best_diff.tolist(), best_k.tolist(), best_n.tolist()):
+        x_hat, P, a, m = model_total_score(k, n, days=days)
+        results.append((diff, k, n, x_hat, P, a, m))
+    return results
+
+
+def search_best_k_n_many(
+    targets,
+    k_min: int,
+    k_max: int,
+    k_step: int,
+    days: int,
+    top_k: int = 5,
+):
+    """
+    같은 격자(k 범위, days)에서 목표 점수 여러 개를 한꺼번에 탐색.
+    x_hat 격자는 한 번만 계산하고 목표마다 diff 와 상위 top_k 선택만 다시 함.
+    결과는 targets 순서대로 search_best_k_n_vec 과 같은 목록. (격자 전체를 메모리에 올리므로 작은 격자용)
+    """
+    if k_step <= 0:
+        raise ValueError("k_step은 1 이상이어야 합니다.")
+    if top_k <= 0 or k_max < k_min:
+        return [[] for _ in targets]
+
+    ks = np.arange(k_min, k_max + 1, k_step, dtype=np.int64)
+    perf.count("search.grid_points", ks.size * N_VALUES.size)
+    P = days * ks[:, None] * N_VALUES[None, :]
+    x_hat = (BASE_SCORE + compute_m_vec(ks)[:, None] + compute_a_vec(P)).ravel()
+
+    results = []
+    for target_x in targets:
+        diff = np.abs(x_hat - target_x)
+        idx = _select_top(diff, top_k)
+        rows = []
+        for d, k, n in zip(diff[idx].tolist(), ks[idx // N_VALUES.size].tolist(), N_VALUES[idx % N_VALUES.size].tolist()):
+            total, P_kn, a, m = model_total_score(k, n, days=days)
+            rows.append((d, k, n, total, P_kn, a, m))
+        results.append(rows)
+    return results
@@ -0,0 +1,113 @@
+"""
+무기 / 인형 포지션 옵션과 무기 장착 시 최종 데미지 계산.
+
+여러 무기 × 포지션 × 적 조건(방어력, 방어 무시)을 한 번에 브로드캐스팅해서 비교할 수 있음.
+"""
+
+import numpy as np
+
+from .damage import damage_batch, weak_multiplier
+
+# 인형 포지션별 (공격 보너스 %, 치명 피해 %)
+DOLL_POSITIONS = {
+    "센티널": (22.0, 0.0),
+    "뱅가드": (17.0, 10.0),
+    "서포트": (17.0, 0.0),
+    "불워크": (0.0, 0.0),
+}
+
+# 무기 옵션별 (공격 보너스 %, 치명 피해 %)
+WEAPON_OPTIONS = {
+    "공격 보너스 15%": (15.0, 0.0),
+    "치명타 피해 25%": (0.0, 25.0),
+}
+
+
+def final_atk(atk_origin, wep_atk, atk_bonus, atk_per, wep_ak):
+    """
+    관리실 공격력 = (기초 공격력 + 무기 공격력) × (1 + (기초 공격 보너스 + 포지션 + 무기 옵션) %)
+    """
+    return (atk_origin + wep_atk) * (1 + (atk_bonus + atk_per + wep_ak) * 0.01)
+
+
+def weapon_damage(
+    common: dict,
+    wep_atk,
+    wep_ak,
+    wep_ct,
+    def_ignore,
+    dmg_buff,
+    atk_per,
+    ct_per,
+    E_def=None,
+    def_coef=None,
+):
+    """
+    무기를 장착했을 때의 최종 데미지 (배열이면 브로드캐스팅).
+    common 은 사이드바 공통 변수이며, E_def / def_coef 를 주면 common 값 대신 사용.
+    """
+    E_def = common["E_def"] if E_def is None else E_def
+    def_coef = common["def_coef"] if def_coef is None else def_coef
+
+    atk = final_atk(common["atk_origin"], wep_atk, common["atk_bonus"], atk_per, wep_ak)
+    total_def = np.minimum(np.add(def_ignore, def_coef), 100.0)
+    return damage_batch(
+        atk,
+        E_def,
+        total_def,
+        common["buff_x"] + np.asarray(dmg_buff, dtype=np.float64),
+        common["buff_y"] + np.asarray(wep_ct, dtype=np.float64) + ct_per,
+        common["sk_coef"],
+        weak_multiplier(common["Weak_coef"]),
+    )
+
+
+def comparison_matrix(common: dict, weapons: dict, positions, E_def_values, def_coef_values):
+    """
+    무기 N개 × 포지션 P개 × 적 방어력 M1개 × 방어 무시 M2개 데미지 텐서 (N, P, M1, M2) 를 한 번에 계산.
+
+    weapons: 같은 길이의 배열 묶음
+      {"wep_atk", "option"(WEAPON_OPTIONS 키), "def_ignore", "dmg_buff"}
+    """
+    wep_ak, wep_ct = np.array([WEAPON_OPTIONS[o] for o in weapons["option"]], dtype=np.float64).reshape(-1, 2).T
+    atk_per, ct_per = np.array([DOLL_POSITIONS[p] for p in positions], dtype=np.float64).reshape(-1, 2).T
+
+    def weapon_axis(values):
+        return np.asarray(values, dtype=np.float64)[:, None, None, None]
+
+    return weapon_damage(
+        common,
+        wep_atk=weapon_axis(weapons["wep_atk"]),
+        wep_ak=weapon_axis(wep_ak),
+        wep_ct=weapon_axis(wep_ct),
+        def_ignore=weapon_axis(weapons["def_ignore"]),
+        dmg_buff=weapon_axis(weapons["dmg_buff"]),
+        atk_per=atk_per[None, :, None, None],
+        ct_per=ct_per[None, :, None, None],
+        E_def=np.asarray(E_def_values, dtype=np.float64)[None, None, :, None],
+        def_coef=np.asarray(def_coef_values, dtype=np.float64)[None, None, None, :],
+    )
+
+
+def rank_weapons(matrix):
+    """
+    comparison_matrix 결과로 포지션별 무기 순위 지표 계산.
+
+    반환 (모두 (N, P) 배열):
+    - mean_damage: 적 조건 전체 평균 데미지
+    - relative: 조건마다 그 포지션 최고 무기 대비 데미지(%)의 평균
+    - wins: 그 포지션에서 1위인 조건 수
+    - rank: 포지션별 순위 (relative 높은 순, 1부터)
+    """
+    n = matrix.shape[0]
+    flat = matrix.reshape(n, matrix.shape[1], -1)
+    best = flat.max(axis=0, keepdims=True)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        relative = np.where(best > 0, flat / best * 100, 0.0).mean(axis=2)
+    wins = np.zeros(flat.shape[:2], dtype=np.int64)
+    np.add.at(wins, (flat.argmax(axis=0), np.arange(flat.shape[1])[:, None]), 1)
+
+    order = np.argsort(-relative, axis=0, kind="stable")
+    rank = np.empty_like(order)
+    np.put_along_axis(rank, order, np.arange(1, n + 1)[:, None], axis=0)
+    return flat.mean(axis=2), relative, wins, rank